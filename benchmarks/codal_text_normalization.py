@@ -0,0 +1,73 @@
+"""
+Compares normalizing Codal tables cell by cell with the vectorized table
+normalizer.
+
+Usage: python benchmarks/codal_text_normalization.py [n_tables]
+"""
+import sys
+import timeit
+import numpy as np
+import pandas as pd
+from finops.config import BALANCE_SHEET_FIX_MISTAKE_MAP
+from finops.utils.preprocessor import Preprocessor
+
+
+def make_tables(n_tables, n_rows=60, n_columns=8):
+    rng = np.random.default_rng(0)
+    titles = list(BALANCE_SHEET_FIX_MISTAKE_MAP)
+    tables = []
+    for _ in range(n_tables):
+        rows = []
+        for _ in range(n_rows):
+            row = [f"  {titles[rng.integers(len(titles))]}\n"]
+            for _ in range(n_columns - 1):
+                value = int(rng.integers(-(10**9), 10**9))
+                text = f"{abs(value):,}".translate(
+                    str.maketrans("0123456789", "۰۱۲۳۴۵۶۷۸۹")
+                )
+                row.append(f"({text})" if value < 0 else text)
+            if rng.random() < 0.1:
+                row[-1] = None
+            rows.append(row)
+        tables.append(pd.DataFrame(rows, dtype=object))
+    return tables
+
+
+def normalize_cells(preprocessor, tables):
+    return [
+        table.map(
+            lambda text: (
+                preprocessor._preprocess_codal_text(text)
+                if isinstance(text, str)
+                else None
+            )
+        )
+        for table in tables
+    ]
+
+
+def normalize_tables(preprocessor, tables):
+    return [preprocessor._preprocess_codal_df(table) for table in tables]
+
+
+if __name__ == "__main__":
+    n_tables = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    preprocessor = Preprocessor()
+    tables = make_tables(n_tables)
+    for cells, vectorized in zip(
+        normalize_cells(preprocessor, tables), normalize_tables(preprocessor, tables)
+    ):
+        cells = cells.astype(object).where(cells.notna(), None)
+        assert cells.to_numpy().tolist() == vectorized.to_numpy().tolist()
+    cells_time = min(
+        timeit.repeat(lambda: normalize_cells(preprocessor, tables), number=1, repeat=3)
+    )
+    tables_time = min(
+        timeit.repeat(
+            lambda: normalize_tables(preprocessor, tables), number=1, repeat=3
+        )
+    )
+    n_cells = sum(table.size for table in tables)
+    print(f"tables: {n_tables}, cells: {n_cells}")
+    print(f"per cell:   {cells_time:.3f} s")
+    print(f"vectorized: {tables_time:.3f} s ({cells_time / tables_time:.1f}x)")
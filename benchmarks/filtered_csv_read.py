@@ -0,0 +1,68 @@
+"""
+Compares reading a whole price history CSV file and filtering it with the
+chunked read of finops.store.read_price_history.
+
+Usage: python benchmarks/filtered_csv_read.py [n_tickers]
+"""
+import os
+import sys
+import tempfile
+import timeit
+import tracemalloc
+import numpy as np
+import pandas as pd
+from finops.config import PRICE_HISTORY_DATA_COLUMNS
+from finops.store import read_price_history
+
+
+def make_csv(path, n_tickers, n_days=2500):
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range("2014-01-01", periods=n_days)
+    for i in range(n_tickers):
+        data = pd.DataFrame(
+            rng.uniform(
+                1000, 10000, size=(n_days, len(PRICE_HISTORY_DATA_COLUMNS))
+            ).round(2),
+            columns=PRICE_HISTORY_DATA_COLUMNS,
+        )
+        data["en_ticker"] = f"TICK{i}"
+        data["date"] = dates
+        data["ticker_index"] = str(i)
+        data.to_csv(path, index=False, mode="a", header=i == 0)
+
+
+def read_whole(path):
+    data = pd.read_csv(path, dtype={"ticker_index": str}, parse_dates=["date"])
+    return data[
+        (data.ticker_index == "7")
+        & (data.date >= "2020-01-01")
+        & (data.date <= "2020-12-31")
+    ][["date", "close"]]
+
+
+def read_chunked(path):
+    return read_price_history(
+        path, ["7"], "2020-01-01", "2020-12-31", ["date", "close"]
+    )
+
+
+def measure(read_func, path, n_repeats=3):
+    tracemalloc.start()
+    df = read_func(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    elapsed = min(timeit.repeat(lambda: read_func(path), number=1, repeat=n_repeats))
+    return df, elapsed, peak
+
+
+if __name__ == "__main__":
+    n_tickers = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "price_history.csv")
+        make_csv(path, n_tickers)
+        whole, whole_time, whole_peak = measure(read_whole, path)
+        chunked, chunked_time, chunked_peak = measure(read_chunked, path)
+        assert len(whole) == len(chunked)
+        print(f"tickers: {n_tickers}, file: {os.path.getsize(path) / 2**20:.1f} MiB")
+        print(f"whole:   {whole_time:.3f} s, peak {whole_peak / 2**20:.1f} MiB")
+        print(f"chunked: {chunked_time:.3f} s, peak {chunked_peak / 2**20:.1f} MiB")
@@ -0,0 +1,126 @@
+"""
+Compares preprocessing Codal search pages letter by letter with the
+memoized, column-wise letters list preprocessor.
+
+Usage: python benchmarks/letters_list_preprocessing.py [n_pages]
+"""
+import re
+import sys
+import timeit
+import jdatetime
+import numpy as np
+import pandas as pd
+from finops.config import CODAL_LETTERS_LIST_DTYPES
+from finops.utils.preprocessor import Preprocessor
+
+TITLES = [
+    "صورت‌های مالی سال مالی منتهی به {date} (حسابرسی شده)",
+    "اطلاعات و صورت‌های مالی میاندوره‌ای دوره {length} ماهه منتهی به {date} (تلفیقی)",
+    "اصلاحیه صورت‌های مالی میاندوره ای {length} ماهه منتهی به {date}",
+    "گزارش فعالیت ماهانه دوره ۱ ماهه منتهی به {date}",
+    "آگهی دعوت به مجمع عمومی عادی سالیانه",
+]
+
+
+def make_pages(n_pages, n_letters=20):
+    rng = np.random.default_rng(0)
+    pages = []
+    for page in range(n_pages):
+        letters = []
+        for i in range(n_letters):
+            date = f"{rng.integers(1390, 1403)}/{rng.integers(1, 13):02d}/29"
+            title = TITLES[rng.integers(len(TITLES))].format(
+                date=date, length=rng.choice([3, 6, 9, 12])
+            )
+            letters.append(
+                {
+                    "TracingNo": page * n_letters + i,
+                    "Symbol": f"نماد{rng.integers(300)}",
+                    "Title": title,
+                    "Url": f"/Reports/Decision.aspx?LetterSerial={page}-{i}",
+                    "PublishDateTime": "1402/07/01 10:00:00",
+                    "HasPdf": True,
+                }
+            )
+        pages.append({"Letters": letters})
+    return pages
+
+
+def extract_period_end_date(letter_title):
+    period_end_date = re.search(r"\d{4}/\d{2}/\d{2}", letter_title)
+    if period_end_date is None:
+        return None
+    return (
+        jdatetime.datetime.strptime(period_end_date.group(), "%Y/%m/%d")
+        .date()
+        .togregorian()
+    )
+
+
+def preprocess_loop(preprocessor, parsed_response):
+    letters_list = []
+    for letter in parsed_response["Letters"]:
+        title = letter["Title"]
+        period_type = re.search(r"(سال مالی|میاندوره‌ای|میاندوره ای)", title)
+        period_length = re.search(r"\d+(?= ماهه)", title)
+        letters_list.append(
+            {
+                "tracing_id": letter["TracingNo"],
+                "symbol": letter["Symbol"],
+                "letter_title": title,
+                "is_audited": "حسابرسی شده" in title,
+                "is_correction": "اصلاحیه" in title,
+                "is_consolidated": "تلفیقی" in title,
+                "period_type": (
+                    None
+                    if period_type is None
+                    else "annual" if period_type.group() == "سال مالی" else "interim"
+                ),
+                "period_length": (
+                    None
+                    if period_length is None
+                    else int(
+                        preprocessor._preprocess_persian_text(period_length.group())
+                    )
+                ),
+                "period_end_date": extract_period_end_date(title),
+                "url": "https://www.codal.ir" + letter["Url"],
+            }
+        )
+    return preprocessor._apply_dtypes(
+        pd.DataFrame(letters_list), CODAL_LETTERS_LIST_DTYPES
+    )
+
+
+def preprocess_pages(preprocess_func, pages):
+    return [preprocess_func(page) for page in pages]
+
+
+if __name__ == "__main__":
+    n_pages = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    preprocessor = Preprocessor()
+    pages = make_pages(n_pages)
+    for page in pages[:100]:
+        pd.testing.assert_frame_equal(
+            preprocess_loop(preprocessor, page),
+            preprocessor._preprocess_letters_list(page),
+        )
+    loop_time = min(
+        timeit.repeat(
+            lambda: preprocess_pages(
+                lambda page: preprocess_loop(preprocessor, page), pages
+            ),
+            number=1,
+            repeat=3,
+        )
+    )
+    column_time = min(
+        timeit.repeat(
+            lambda: preprocess_pages(preprocessor._preprocess_letters_list, pages),
+            number=1,
+            repeat=3,
+        )
+    )
+    print(f"pages: {n_pages}, letters: {sum(len(page['Letters']) for page in pages)}")
+    print(f"per letter: {loop_time:.3f} s")
+    print(f"columns:    {column_time:.3f} s ({loop_time / column_time:.1f}x)")
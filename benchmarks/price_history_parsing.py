@@ -0,0 +1,59 @@
+"""
+Compares the generic and the typed price history CSV parsing paths.
+
+Usage: python benchmarks/price_history_parsing.py [n_rows]
+"""
+import sys
+import timeit
+import tracemalloc
+from unittest.mock import Mock
+import numpy as np
+import pandas as pd
+from finops.utils.downloader import Downloader, pyarrow
+from finops.utils.preprocessor import Preprocessor
+
+
+def make_response(n_rows):
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("1990-01-01", periods=n_rows).strftime("%Y%m%d")
+    prices = rng.uniform(1000, 10000, size=(n_rows, 6)).round(2)
+    volumes = rng.integers(1, 10**9, size=(n_rows, 3))
+    lines = ["<TICKER>,<DTYYYYMMDD>,<FIRST>,<HIGH>,<LOW>,<CLOSE>,<VALUE>,<VOL>,<OPENINT>,<PER>,<OPEN>,<LAST>"]
+    for date, price, volume in zip(dates, prices, volumes):
+        lines.append(
+            f"Iran Tamin Inv.,{date},{price[0]:.2f},{price[1]:.2f},{price[2]:.2f},{price[3]:.2f},"
+            f"{volume[0]},{volume[1]},{volume[2]},D,{price[4]:.2f},{price[5]:.2f}"
+        )
+    response = Mock()
+    response.content = ("\n".join(lines) + "\n").encode("utf8")
+    return response
+
+
+def parse(parse_func, response):
+    return Preprocessor._preprocess_price_history_data(parse_func(response), "1")
+
+
+def measure(parse_func, response, n_repeats=3):
+    arrow_pool = pyarrow.default_memory_pool() if pyarrow is not None else None
+    arrow_peak = (arrow_pool.max_memory() or 0) if arrow_pool is not None else 0
+    tracemalloc.start()
+    df = parse(parse_func, response)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    if arrow_pool is not None:
+        peak += max(0, (arrow_pool.max_memory() or 0) - arrow_peak)
+    elapsed = min(
+        timeit.repeat(lambda: parse(parse_func, response), number=1, repeat=n_repeats)
+    )
+    return df, elapsed, peak
+
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    response = make_response(n_rows)
+    generic, generic_time, generic_peak = measure(Downloader._parse_csv_response, response)
+    typed, typed_time, typed_peak = measure(Downloader._parse_price_history_response, response)
+    pd.testing.assert_frame_equal(generic, typed)
+    print(f"rows: {n_rows}, body: {len(response.content) / 2**20:.1f} MiB")
+    print(f"generic: {generic_time:.3f} s, peak {generic_peak / 2**20:.1f} MiB")
+    print(f"typed:   {typed_time:.3f} s, peak {typed_peak / 2**20:.1f} MiB")
@@ -0,0 +1,101 @@
+"""
+Compares matching Codal balance sheet titles by exact lookup in
+BALANCE_SHEET_FIX_MISTAKE_MAP with the folded title index of
+finops.utils.statement_schema, on titles with spacing, joiner, letter
+and typing variants.
+
+Usage: python benchmarks/statement_title_matching.py [n_tables]
+"""
+import sys
+import timeit
+import numpy as np
+import pandas as pd
+from finops.config import (
+    BALANCE_SHEET_COLUMNS,
+    BALANCE_SHEET_FIX_MISTAKE_MAP,
+    BALANCE_SHEET_DTYPES,
+)
+from finops.utils.preprocessor import Preprocessor
+
+
+def make_variant(rng, title):
+    variant = rng.integers(6)
+    if variant == 1:
+        return title.replace(" ", "  ")
+    if variant == 2:
+        return title.replace("‌", " ").replace("ی", "ي")
+    if variant == 3:
+        return title.replace("ها", "‌ها").replace("غیر ", "غیر")
+    if variant == 4:
+        return title.replace("جمع ", "جمع‌")
+    if variant == 5:
+        position = rng.integers(len(title))
+        return title[:position] + title[position] + title[position:]
+    return title
+
+
+def make_tables(n_tables, n_rows=40):
+    rng = np.random.default_rng(0)
+    titles = list(BALANCE_SHEET_FIX_MISTAKE_MAP)
+    filler = [
+        "موجودی نقد",
+        "سرمایه‌گذاری‌های کوتاه‌مدت",
+        "پیش‌پرداخت‌ها",
+        "سود انباشته",
+    ]
+    tables = []
+    for _ in range(n_tables):
+        rows = []
+        for _ in range(n_rows):
+            if rng.random() < 0.3:
+                title = make_variant(rng, titles[rng.integers(len(titles))])
+            else:
+                title = filler[rng.integers(len(filler))]
+            rows.append([title, f"{rng.integers(10**6, 10**9):,}"])
+        tables.append(pd.DataFrame(rows))
+    return tables
+
+
+def preprocess_exact(preprocessor, df):
+    df = preprocessor._preprocess_codal_df(df).dropna(how="any")
+    df.columns = ["title", "value"]
+    df["title"] = df["title"].map(BALANCE_SHEET_FIX_MISTAKE_MAP).fillna(df["title"])
+    df = df.drop_duplicates(subset=["title"], keep="first")
+    df = df[df["title"].isin(BALANCE_SHEET_COLUMNS)]
+    df = df.set_index("title").T.reset_index(drop=True)
+    df = preprocessor.safe_select_columns(df, BALANCE_SHEET_COLUMNS)
+    return preprocessor._apply_dtypes(df, BALANCE_SHEET_DTYPES)
+
+
+def count_matched(frames):
+    return sum(
+        int(frame.drop(columns="tracing_id").notna().sum().sum()) for frame in frames
+    )
+
+
+if __name__ == "__main__":
+    n_tables = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    preprocessor = Preprocessor()
+    tables = make_tables(n_tables)
+    exact = [preprocess_exact(preprocessor, table) for table in tables]
+    indexed = [preprocessor._preprocess_balance_sheet_df(table) for table in tables]
+    exact_time = min(
+        timeit.repeat(
+            lambda: [preprocess_exact(preprocessor, table) for table in tables],
+            number=1,
+            repeat=3,
+        )
+    )
+    indexed_time = min(
+        timeit.repeat(
+            lambda: [
+                preprocessor._preprocess_balance_sheet_df(table) for table in tables
+            ],
+            number=1,
+            repeat=3,
+        )
+    )
+    n_cells = n_tables * (len(BALANCE_SHEET_COLUMNS) - 1)
+    print(f"tables: {n_tables}, sheet cells: {n_cells}")
+    print(f"exact map:   {count_matched(exact)} filled, {exact_time:.3f} s")
+    print(f"title index: {count_matched(indexed)} filled, {indexed_time:.3f} s")
@@ -0,0 +1,91 @@
+"""
+Compares parsing the TSETMC tickers page with BeautifulSoup's html.parser
+with the table row extractor of finops.utils.html_table.
+
+Usage: python benchmarks/tickers_page_parsing.py [n_tickers]
+"""
+import re
+import sys
+import timeit
+from unittest.mock import patch
+import pandas as pd
+from bs4 import BeautifulSoup
+from finops.utils.html_table import extract_table_rows
+from finops.utils.preprocessor import Preprocessor
+
+
+def make_page(n_tickers):
+    rows = []
+    for i in range(n_tickers):
+        rows.append(
+            f'<tr><td><a href="/instInfo/{10**15 + i}">شركت نمونه {i} (نماد{i})</a></td>'
+            f"<td>IRO1NMD{i:05d}0001</td><td>Sample {i}</td><td>NMD{i}</td>"
+            f"<td>IRO1NMD{i:05d}0000</td><td>بازار اول</td><td>فلزات اساسي</td></tr>"
+        )
+    menu = "".join(f'<li><a href="/page/{i}">صفحه {i}</a></li>' for i in range(2000))
+    return (
+        f"<html><head><title>TSETMC</title></head><body><ul>{menu}</ul>"
+        f'<table class="table1"><tr><th>نماد</th></tr>{"".join(rows)}</table>'
+        "</body></html>"
+    )
+
+
+def parse_soup(preprocessor, page):
+    parsed_response = BeautifulSoup(page, "html.parser")
+    tickers_table = parsed_response.find("table", {"class": "table1"})
+    tickers_data = []
+    for ticker in tickers_table.find_all("tr"):
+        cells = ticker.find_all("td")
+        if cells:
+            ticker_url = cells[0].find("a")["href"]
+            tickers_data.append(
+                {
+                    "name": preprocessor._preprocess_ticker_name(
+                        re.findall(r"\(([^()]+)\)", cells[0].text.strip())[0]
+                    ),
+                    "full_name": cells[0].text.strip().split("(")[0],
+                    "ticker_index": re.findall(r"(\d+)", ticker_url)[-1],
+                    "instrument_isin": cells[1].text.strip(),
+                    "en_name": cells[2].text.strip(),
+                    "code": cells[3].text.strip(),
+                    "company_isin": cells[4].text.strip(),
+                    "market": cells[5].text.strip(),
+                    "section": cells[6].text.strip(),
+                    "type": preprocessor._convert_isin_to_type(cells[1].text.strip()),
+                }
+            )
+    return pd.DataFrame(tickers_data)
+
+
+def parse_rows(preprocessor, page):
+    rows = extract_table_rows(page, table_class="table1", links=True)
+    return preprocessor._preprocess_tickers_page(rows)
+
+
+def parse_rows_fallback(preprocessor, page):
+    with patch("finops.utils.html_table.lxml", None):
+        return parse_rows(preprocessor, page)
+
+
+if __name__ == "__main__":
+    n_tickers = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    preprocessor = Preprocessor()
+    page = make_page(n_tickers)
+    soup = parse_soup(preprocessor, page)
+    pd.testing.assert_frame_equal(soup, parse_rows(preprocessor, page))
+    pd.testing.assert_frame_equal(soup, parse_rows_fallback(preprocessor, page))
+    times = {
+        name: min(
+            timeit.repeat(lambda: parse_func(preprocessor, page), number=1, repeat=3)
+        )
+        for name, parse_func in [
+            ("html.parser", parse_soup),
+            ("fallback", parse_rows_fallback),
+            ("lxml", parse_rows),
+        ]
+    }
+    print(f"tickers: {n_tickers}, page: {len(page.encode()) / 2**20:.1f} MiB")
+    for name, elapsed in times.items():
+        print(
+            f"{name + ':':<12} {elapsed:.3f} s ({times['html.parser'] / elapsed:.1f}x)"
+        )
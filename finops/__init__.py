@@ -1,2 +1,2 @@
 from .ticker import Ticker
-from .tehran_stock_exchange import TehranStockExchange
\ No newline at end of file
+from .tehran_stock_exchange import TehranStockExchange, AsyncTehranStockExchange
\ No newline at end of file
@@ -1,47 +1,77 @@
 import os
 import json
-import time
 import queue
+import functools
 import jdatetime
 import concurrent
+import numpy as np
 import pandas as pd
-from bs4 import BeautifulSoup
 from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from finops.utils.scraper import Scraper
 from finops.utils.preprocessor import Preprocessor
-from finops.utils.wrappers import sleep, retry
+from finops.utils.html_table import extract_table_rows, rows_to_frame
+from finops.utils.codal_statement import extract_statement_rows
+from finops.utils.wrappers import retry
+from finops.utils.writer import BatchWriter
+from finops.utils.driver_pool import DriverPool
+from finops.store import CsvStore
 from finops.config import (
     CODAL_SEARCH_BASE_URL,
-    CODAL_LETTERS_LIST_COLUMNS,
     BALANCE_SHEET_ID,
     PNL_SHEET_ID,
     CASH_FLOW_SHEET_ID,
-    BALANCE_SHEET_COLUMNS,
-    PNL_SHEET_COLUMNS,
-    CASH_FLOW_SHEET_COLUMNS,
+    LETTERS_LIST_DATASET,
+    BALANCE_SHEET_DATASET,
+    PNL_SHEET_DATASET,
+    CASH_FLOW_SHEET_DATASET,
+    CODAL_WORK_QUEUE_SIZE,
 )
 from finops.logger import logger
 
+# Fetches a page from within the loaded letter, with the cookies of the browser
+FETCH_PAGE_SCRIPT = """
+const callback = arguments[arguments.length - 1];
+fetch(arguments[0], {credentials: "same-origin"})
+    .then((response) => (response.ok ? response.text() : null))
+    .then(callback)
+    .catch(() => callback(null));
+"""
+
+# Columns of the letters list read to plan the sheets to scrape
+PLAN_COLUMNS = [
+    "tracing_id",
+    "is_audited",
+    "is_correction",
+    "period_end_date",
+    "url",
+]
+
 
 class Codal(Scraper, Preprocessor):
-    def __init__(self, store_path, driver_path="selenium/chromedriver"):
+    def __init__(self, store_path, driver_path="selenium/chromedriver", use_http=True):
         """
         Initialize a Codal object.
 
-        :param store_path: The path to store the files.
-        :type store_path: str
+        :param store_path: The directory to store the CSV files, or a store.
+        :type store_path: str or finops.store.Store
         :param driver_path: The path to the ChromeDriver executable.
         :type driver_path: str
+        :param use_http: Whether to read statements from the letter pages over
+            HTTP, loading a letter in Chrome only when its page holds no
+            statement data.
+        :type use_http: bool
         """
         self.driver_path = driver_path
-        self.balance_sheets_path = os.path.join(store_path, "balance_sheet.csv")
-        self.pnl_path = os.path.join(store_path, "pnl.csv")
-        self.cash_flow_path = os.path.join(store_path, "cash_flow.csv")
-        self.letters_list_path = os.path.join(store_path, "letters_list.csv")
+        self.use_http = use_http
+        if isinstance(store_path, (str, os.PathLike)):
+            self.store = CsvStore(store_path)
+        else:
+            self.store = store_path
 
     def _create_driver(self, driver_path):
         """
@@ -86,13 +116,12 @@ class Codal(Scraper, Preprocessor):
         :rtype: int
         """
         search_url = self._create_search_url(**search_params)
-        response = self._download(search_url)
-        parsed_response = self._parse_json_response(response)
+        parsed_response = self._download_and_parse(
+            search_url, self._parse_json_response
+        )
         n_pages = parsed_response["Page"]
         return n_pages
 
-    @sleep
-    @retry(max_retries=3, wait_time=1)
     def _scrap_letters_list_one_page(self, search_params, page_number):
         """
         Scrape the letters list for a specific page.
@@ -106,8 +135,9 @@ class Codal(Scraper, Preprocessor):
         """
         search_params["PageNumber"] = page_number
         search_url = self._create_search_url(**search_params)
-        response = self._download(search_url)
-        parsed_response = self._parse_json_response(response)
+        parsed_response = self._download_and_parse(
+            search_url, self._parse_json_response
+        )
         letters_list_df = self._preprocess_letters_list(parsed_response)
         return letters_list_df
 
@@ -133,11 +163,10 @@ class Codal(Scraper, Preprocessor):
         :param verbose: Flag to enable verbose logging.
         :type verbose: bool
         """
-        letters_list = self._load_or_create_csv(
-            self.letters_list_path, CODAL_LETTERS_LIST_COLUMNS
-        )
+        letters_list = self.store.read(LETTERS_LIST_DATASET, columns=["tracing_id"])
         scraped_letters = self._get_scraped_ids(letters_list, "tracing_id")
         n_pages = self._get_letters_list_pages_number(search_params)
+        self.session_pool.ensure_pool_size(n_threads)
 
         def scrap_page(page_number):
             letters_list_one_page = self._scrap_letters_list_one_page(
@@ -150,140 +179,279 @@ class Codal(Scraper, Preprocessor):
             letters_list_one_page = letters_list_one_page[
                 ~letters_list_one_page.tracing_id.isin(scraped_letters)
             ]
-            self._save_csv(letters_list_one_page, self.letters_list_path)
-            time.sleep(1)
+            self.store.append(LETTERS_LIST_DATASET, letters_list_one_page)
             if verbose:
                 logger.info(f"Page {page_number} of {n_pages} is scrapped.")
 
         with concurrent.futures.ThreadPoolExecutor(max_workers=n_threads) as executor:
             executor.map(scrap_page, range(start_page_number or 1, n_pages + 1))
 
-    @retry(max_retries=3, wait_time=1)
+    @retry(max_retries=3, wait_time=1, retry_on=(WebDriverException, ConnectionError))
     def _scrap_letter(self, driver, letter_url):
         """
         Scrape a letter from its URL.
 
+        Failed page loads are retried; a page that loads without a statement
+        table is not.
+
         :param driver: The ChromeDriver instance.
         :type driver: webdriver.Chrome
         :param letter_url: The URL of the letter.
         :type letter_url: str
-        :return: The scraped letter data.
+        :return: The scraped letter data, None if the page has no statement
+            table.
         :rtype: pd.DataFrame
+        :raises WebDriverException: If every attempt to load the page failed.
         """
+        self.rate_limiter.acquire(letter_url)
         driver.get(letter_url)
-        response = WebDriverWait(driver, 10, 1).until(
-            EC.presence_of_element_located(
-                (By.CSS_SELECTOR, ".table_wrapper, .rayanDynamicStatement")
+        try:
+            response = WebDriverWait(driver, 10, 1).until(
+                EC.presence_of_element_located(
+                    (By.CSS_SELECTOR, ".table_wrapper, .rayanDynamicStatement")
+                )
             )
+        except TimeoutException:
+            logger.warning(f"no statement table found in {letter_url}")
+            return None
+        return rows_to_frame(extract_table_rows(response.get_attribute("innerHTML")))
+
+    def _fetch_letter(self, letter_url):
+        """
+        Fetch a letter over HTTP and read its statement from the page.
+
+        :param letter_url: The URL of the letter.
+        :type letter_url: str
+        :return: The letter data, None if the page holds no statement data.
+        :rtype: pd.DataFrame
+        """
+        return self._download_and_parse(
+            letter_url, self._parse_codal_statement_response
         )
-        parsed_response = BeautifulSoup(
-            response.get_attribute("innerHTML"), "html.parser"
-        )
-        letter = []
-        for row in parsed_response.find_all("tr"):
-            letter.append([cell.text for cell in row.find_all("td")])
-        return pd.DataFrame(letter)
 
-    def _scrap_sheet(
-        self, driver, url, sheet_id, tracing_id, sheet_df, preprocess_func, path
-    ):
+    def _scrap_letter_sheets(self, drivers, sheet_urls):
         """
-        Scrape a specific sheet from a letter.
+        Scrape several sheets of a letter, loading the letter in Chrome once.
 
-        :param driver: The ChromeDriver instance.
-        :type driver: webdriver.Chrome
+        The first sheet is read from the rendered page. The pages of the other
+        sheets are fetched from within the loaded page, with the cookies of
+        the browser, and read like pages fetched over HTTP. A sheet whose page
+        could not be fetched or holds no statement data is loaded with its
+        own navigation, and a sheet that fails to load is left out. A driver
+        is leased from the pool for the sheets and given back with the number
+        of pages it loaded, fetches included.
+
+        :param drivers: The pool of ChromeDriver instances.
+        :type drivers: finops.utils.driver_pool.DriverPool
+        :param sheet_urls: The URLs of the sheets of the letter.
+        :type sheet_urls: list
+        :return: Mapping of sheet URL to the scraped sheet data.
+        :rtype: dict
+        """
+        first_url, *other_urls = sheet_urls
+        driver = drivers.acquire()
+        n_pages = 1
+        try:
+            letters = {first_url: self._scrap_letter(driver, first_url)}
+            for sheet_url in other_urls:
+                self.rate_limiter.acquire(sheet_url)
+                n_pages += 1
+                try:
+                    page = driver.execute_async_script(FETCH_PAGE_SCRIPT, sheet_url)
+                except Exception as e:
+                    logger.warning(
+                        f"fetching {sheet_url} in Chrome failed, loading it: {e}"
+                    )
+                    page = None
+                rows = None if page is None else extract_statement_rows(page)
+                if rows is not None:
+                    letters[sheet_url] = rows_to_frame(rows)
+                    continue
+                n_pages += 1
+                try:
+                    letters[sheet_url] = self._scrap_letter(driver, sheet_url)
+                except Exception as e:
+                    logger.error(f"failed to scrape {sheet_url}: {e}")
+        finally:
+            drivers.release(driver, n_pages)
+        return letters
+
+    @staticmethod
+    def _preprocess_letter_sheet(preprocess_func, letter, tracing_id, sheet_url):
+        """
+        Preprocess a scraped sheet of a letter.
+
+        :param preprocess_func: The preprocessing function of the sheet.
+        :type preprocess_func: function
+        :param letter: The scraped sheet data.
+        :type letter: pd.DataFrame
+        :param tracing_id: The tracing ID of the letter.
+        :type tracing_id: str
+        :param sheet_url: The URL of the sheet.
+        :type sheet_url: str
+        :return: The preprocessed sheet data, None if preprocessing failed.
+        :rtype: pd.DataFrame
+        """
+        try:
+            letter_df = preprocess_func(letter)
+        except Exception as e:
+            logger.error(f"failed to preprocess {sheet_url}: {e}")
+            return None
+        letter_df["tracing_id"] = tracing_id
+        return letter_df
+
+    def _get_letter_sheets(self, drivers, url, tracing_id, sheets):
+        """
+        Get several sheets of a letter with at most one page load in Chrome.
+
+        The sheets are first fetched over HTTP in one round of requests. The
+        sheets whose requests failed, whose pages hold no statement data, or
+        whose statement matched no sheet column are then scraped together in
+        Chrome, with a driver leased from the pool only for them.
+
+        :param drivers: The pool of ChromeDriver instances.
+        :type drivers: finops.utils.driver_pool.DriverPool
         :param url: The URL of the letter.
         :type url: str
-        :param sheet_id: The ID of the sheet to scrape.
-        :type sheet_id: str
-        :param tracing_id:The tracing ID of the letter.
+        :param tracing_id: The tracing ID of the letter.
         :type tracing_id: str
-        :param sheet_df: The DataFrame to store the sheet data.
-        :type sheet_df: pd.DataFrame
-        :param preprocess_func: The preprocessing function for the sheet data.
-        :type preprocess_func: function
-        :param path: The path to store the sheet data.
-        :type path: str
+        :param sheets: The sheets to get, as (sheet ID, preprocessing function,
+            dataset) tuples.
+        :type sheets: list
+        :return: Mapping of dataset to the preprocessed sheet data.
+        :rtype: dict
         """
-        if tracing_id not in sheet_df.tracing_id.values:
+        sheet_urls = [url + f"&sheetId={sheet_id}" for sheet_id, _, _ in sheets]
+        letter_sheets = {}
+        if self.use_http:
+            for (_, preprocess_func, dataset), sheet_url in zip(sheets, sheet_urls):
+                try:
+                    letter = self._fetch_letter(sheet_url)
+                except Exception as e:
+                    logger.warning(
+                        f"fetching {sheet_url} failed, loading it in Chrome: {e}"
+                    )
+                    continue
+                if letter is None:
+                    continue
+                letter_df = self._preprocess_letter_sheet(
+                    preprocess_func, letter, tracing_id, sheet_url
+                )
+                if letter_df is not None and not letter_df.empty:
+                    letter_sheets[dataset] = letter_df
+        missing_sheets = [
+            (sheet, sheet_url)
+            for sheet, sheet_url in zip(sheets, sheet_urls)
+            if sheet[2] not in letter_sheets
+        ]
+        if missing_sheets:
+            missing_urls = [sheet_url for _, sheet_url in missing_sheets]
+            letters = {}
             try:
-                sheet_url = url + f"&sheetId={sheet_id}"
-                letter_df = preprocess_func(self._scrap_letter(driver, sheet_url))
-                letter_df["tracing_id"] = tracing_id
-                self._save_csv(letter_df, path)
+                letters = self._scrap_letter_sheets(drivers, missing_urls)
             except Exception as e:
-                print(e)
-                print(sheet_url)
+                logger.error(f"failed to scrape {missing_urls}: {e}")
+            for (_, preprocess_func, dataset), sheet_url in missing_sheets:
+                if letters.get(sheet_url) is None:
+                    continue
+                letter_df = self._preprocess_letter_sheet(
+                    preprocess_func, letters[sheet_url], tracing_id, sheet_url
+                )
+                if letter_df is not None:
+                    letter_sheets[dataset] = letter_df
+        return {
+            dataset: letter_sheets[dataset]
+            for _, _, dataset in sheets
+            if dataset in letter_sheets
+        }
 
-    def _scrap_letter_wrapper(
-        self,
-        drivers,
-        row,
-        is_scrap_balance_sheets,
-        is_scrap_pnl_sheets,
-        is_scrap_cash_flow,
-        balance_sheets,
-        pnl_sheets,
-        cash_flow_sheets,
-    ):
+    def _plan_letters(self, letters_list, sheets):
         """
-        Wrapper method to scrape a letter.
+        Plan the sheets to scrape for each letter of the letters list.
 
-        :param drivers: The queue of ChromeDriver instances.
-        :type drivers: queue.Queue
-        :param row: The row of the letters list.
-        :type row: pd.Series
-        :param is_scrap_balance_sheets: Flag to scrape balance sheets.
-        :type is_scrap_balance_sheets: bool
-        :param is_scrap_pnl_sheets: Flag to scrape P&L sheets.
-        :type is_scrap_pnl_sheets: bool
-        :param is_scrap_cash_flow: Flag to scrape cash flow statements.
-        :type is_scrap_cash_flow: bool
-        :param balance_sheets: The balance sheets DataFrame.
-        :type balance_sheets: pd.DataFrame
-        :param pnl_sheets: The P&L sheets DataFrame.
-        :type pnl_sheets: pd.DataFrame
-        :param cash_flow_sheets: The cash flow statements DataFrame.
-        :type cash_flow_sheets: pd.DataFrame
+        The scraped tracing IDs of every sheet are looked up once, so letters
+        missing none of the sheets are skipped before any work is queued. The
+        other letters come newest period first, audited letters before
+        unaudited ones and original letters before corrections.
+
+        :param letters_list: The letters list.
+        :type letters_list: pd.DataFrame
+        :param sheets: The sheets to scrape, as (sheet ID, preprocessing
+            function, dataset, scraped tracing IDs) tuples.
+        :type sheets: list
+        :return: The URL, tracing ID and missing sheets of each letter.
+        :rtype: generator
         """
-        url = row["url"]
-        tracing_id = row["tracing_id"]
-        driver = drivers.get()
-
-        if is_scrap_balance_sheets:
-            self._scrap_sheet(
-                driver,
-                url,
-                BALANCE_SHEET_ID,
-                tracing_id,
-                balance_sheets,
-                self._preprocess_balance_sheet_df,
-                self.balance_sheets_path,
+        letters_list = letters_list.drop_duplicates("tracing_id")
+        if not sheets or letters_list.empty:
+            return
+        missing = np.column_stack(
+            [
+                ~letters_list["tracing_id"].isin(scraped_ids).to_numpy()
+                for _, _, _, scraped_ids in sheets
+            ]
+        )
+        letters_list = letters_list.assign(
+            period_end_date=pd.to_datetime(
+                letters_list["period_end_date"], errors="coerce"
             )
+        )[missing.any(axis=1)].reset_index(drop=True)
+        missing = missing[missing.any(axis=1)]
+        order = letters_list.sort_values(
+            ["period_end_date", "is_audited", "is_correction", "tracing_id"],
+            ascending=[False, False, True, False],
+            na_position="last",
+            kind="stable",
+        ).index
+        logger.info(f"{len(order)} letters have sheets to scrape.")
+        sheets = [sheet[:3] for sheet in sheets]
+        urls = letters_list["url"].to_numpy()
+        tracing_ids = letters_list["tracing_id"].to_numpy()
+        for i in order:
+            yield urls[i], tracing_ids[i], [
+                sheet for sheet, is_missing in zip(sheets, missing[i]) if is_missing
+            ]
 
-        if is_scrap_pnl_sheets:
-            self._scrap_sheet(
-                driver,
-                url,
-                PNL_SHEET_ID,
-                tracing_id,
-                pnl_sheets,
-                self._preprocess_pnl_df,
-                self.pnl_path,
-            )
+    def _scrap_letter_wrapper(self, drivers, url, tracing_id, sheets, writer):
+        """
+        Wrapper method to scrape the missing sheets of a letter together.
 
-        if is_scrap_cash_flow:
-            self._scrap_sheet(
-                driver,
-                url,
-                CASH_FLOW_SHEET_ID,
-                tracing_id,
-                cash_flow_sheets,
-                self._preprocess_cash_flow_df,
-                self.cash_flow_path,
-            )
+        :param drivers: The pool of ChromeDriver instances.
+        :type drivers: finops.utils.driver_pool.DriverPool
+        :param url: The URL of the letter.
+        :type url: str
+        :param tracing_id: The tracing ID of the letter.
+        :type tracing_id: int
+        :param sheets: The sheets to scrape, as (sheet ID, preprocessing
+            function, dataset) tuples.
+        :type sheets: list
+        :param writer: Writer saving the sheet data.
+        :type writer: finops.utils.writer.BatchWriter
+        """
+        letter_sheets = self._get_letter_sheets(drivers, url, tracing_id, sheets)
+        for dataset, letter_df in letter_sheets.items():
+            writer.write(letter_df, self.store, dataset)
 
-        drivers.put(driver)
+    def _scrap_letters_worker(self, work, drivers, writer):
+        """
+        Scrape the letters of the work queue until a None item is taken.
+
+        :param work: The queue of (URL, tracing ID, sheets) items.
+        :type work: queue.Queue
+        :param drivers: The pool of ChromeDriver instances.
+        :type drivers: finops.utils.driver_pool.DriverPool
+        :param writer: Writer saving the sheet data.
+        :type writer: finops.utils.writer.BatchWriter
+        """
+        while True:
+            item = work.get()
+            if item is None:
+                return
+            url, tracing_id, sheets = item
+            try:
+                self._scrap_letter_wrapper(drivers, url, tracing_id, sheets, writer)
+            except Exception as e:
+                logger.error(f"failed to scrape letter {tracing_id}: {e}")
 
     def scrap_letters(
         self,
@@ -304,32 +472,55 @@ class Codal(Scraper, Preprocessor):
         :param n_threads: The number of threads to use for concurrent execution.
         :type n_threads: int
         """
-        balance_sheets = self._load_or_create_csv(
-            self.balance_sheets_path, BALANCE_SHEET_COLUMNS
-        )
-        pnl_sheets = self._load_or_create_csv(self.pnl_path, PNL_SHEET_COLUMNS)
-        cash_flow_sheets = self._load_or_create_csv(
-            self.cash_flow_path, CASH_FLOW_SHEET_COLUMNS
-        )
-        letters_list = self._load_csv(self.letters_list_path)
-
-        drivers = queue.Queue()
-        for _ in range(n_threads):
-            drivers.put(self._create_driver(self.driver_path))
-
-        with concurrent.futures.ThreadPoolExecutor(max_workers=n_threads) as executor:
-            futures = [
-                executor.submit(
-                    self._scrap_letter_wrapper,
-                    drivers,
-                    row,
+        sheets = [
+            (
+                sheet_id,
+                preprocess_func,
+                dataset,
+                self._get_scraped_ids(
+                    self.store.read(dataset, columns=["tracing_id"]), "tracing_id"
+                ),
+            )
+            for sheet_id, preprocess_func, dataset, is_scrap in (
+                (
+                    BALANCE_SHEET_ID,
+                    self._preprocess_balance_sheet_df,
+                    BALANCE_SHEET_DATASET,
                     is_scrap_balance_sheets,
+                ),
+                (
+                    PNL_SHEET_ID,
+                    self._preprocess_pnl_df,
+                    PNL_SHEET_DATASET,
                     is_scrap_pnl_sheets,
+                ),
+                (
+                    CASH_FLOW_SHEET_ID,
+                    self._preprocess_cash_flow_df,
+                    CASH_FLOW_SHEET_DATASET,
                     is_scrap_cash_flow,
-                    balance_sheets,
-                    pnl_sheets,
-                    cash_flow_sheets,
-                )
-                for _, row in letters_list.iterrows()
+                ),
+            )
+            if is_scrap
+        ]
+        letters_list = self.store.read(LETTERS_LIST_DATASET, columns=PLAN_COLUMNS)
+        drivers = DriverPool(
+            functools.partial(self._create_driver, self.driver_path), n_threads
+        )
+        work = queue.Queue(maxsize=CODAL_WORK_QUEUE_SIZE)
+
+        with BatchWriter() as writer, drivers, concurrent.futures.ThreadPoolExecutor(
+            max_workers=n_threads
+        ) as executor:
+            workers = [
+                executor.submit(self._scrap_letters_worker, work, drivers, writer)
+                for _ in range(n_threads)
             ]
-            concurrent.futures.wait(futures)
+            try:
+                for item in self._plan_letters(letters_list, sheets):
+                    work.put(item)
+            finally:
+                for _ in workers:
+                    work.put(None)
+            concurrent.futures.wait(workers)
+        logger.info(f"driver pool: {drivers.stats()}")
@@ -8,6 +8,71 @@ PRICE_HISTORY_URL = (
 SHAREHOLDER_URL = "http://cdn.tsetmc.com/api/Shareholder/{ticker_index}/{date}"
 CODAL_SEARCH_BASE_URL = "https://search.codal.ir/api/search/v2/q?"
 
+# Http
+HTTP_POOL_SIZE = 10
+
+# Rate limits as (requests per second, burst) per host
+RATE_LIMITS = {
+    "old.tsetmc.com": (5, 5),
+    "cdn.tsetmc.com": (10, 10),
+    "search.codal.ir": (1, 2),
+    "www.codal.ir": (2, 2),
+}
+
+# Cache time-to-live in seconds per url, urls not listed are never cached
+CACHE_FOREVER = float("inf")
+CACHE_TTLS = {
+    TICKERS_URL: 24 * 60 * 60,
+    PRICE_HISTORY_URL: 60 * 60,
+    SHAREHOLDER_URL: CACHE_FOREVER,
+    CODAL_SEARCH_BASE_URL: 10 * 60,
+}
+RECENT_SHAREHOLDER_CACHE_TTL = 60 * 60
+CACHE_MAX_SIZE = 2 * 1024**3
+
+# Parsed price histories are kept in memory for this many seconds
+PRICE_HISTORY_MEMO_TTL = 10 * 60
+PRICE_HISTORY_MEMO_SIZE = 256
+
+# Incremental price history syncs compare the stored rows of this many days
+# before the last stored date of a ticker with the downloaded ones, a ticker
+# whose rows differ is rewritten
+PRICE_HISTORY_REVISION_WINDOW = 30
+
+# Retry
+RETRY_MAX_RETRIES = 3
+RETRY_BACKOFF_BASE = 1
+RETRY_BACKOFF_FACTOR = 2
+RETRY_MAX_WAIT = 60
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+CIRCUIT_BREAKER_FAILURE_RATE = 0.5
+CIRCUIT_BREAKER_WINDOW_SIZE = 20
+CIRCUIT_BREAKER_MIN_REQUESTS = 10
+CIRCUIT_BREAKER_COOLDOWN = 30
+
+# Writer
+WRITER_MAX_QUEUE_SIZE = 1024
+WRITER_MAX_BATCH_ROWS = 10000
+WRITER_FLUSH_INTERVAL = 5
+WRITER_FSYNC = True
+
+# WebDriver pool; a driver is quit after this many page loads, or once its
+# browser processes grew by this many bytes (measured only when psutil is installed)
+DRIVER_MAX_PAGES = 200
+DRIVER_MAX_MEMORY_GROWTH = 512 * 1024**2
+
+# Rows per chunk when CSV files are read with filters
+CSV_CHUNK_SIZE = 100000
+
+# Normalized texts are memoized in an LRU cache of this many entries; longer
+# texts, such as whole Codal tables, are not cached
+NORMALIZER_CACHE_SIZE = 65536
+NORMALIZER_CACHE_MAX_LENGTH = 256
+
+# Parsed Codal letter titles and their Jalali dates are memoized in LRU caches
+# of this many entries
+LETTER_TITLE_CACHE_SIZE = 8192
+
 # Columns
 PRICE_HISTORY_DATA_COLUMNS = [
     "en_ticker",
@@ -35,6 +100,13 @@ SHAREHOLDER_DATA_COLUMNS = [
     "req_date",
 ]
 
+# The daily change fields of the shareholder API are kept only in the
+# snapshot and delta datasets of a DeltaStore, shareholder CSV files and the
+# shareholder dataset keep the columns above
+SHAREHOLDER_CHANGE_COLUMNS = ["change", "change_amount"]
+SHAREHOLDER_SNAPSHOT_COLUMNS = SHAREHOLDER_DATA_COLUMNS + SHAREHOLDER_CHANGE_COLUMNS
+SHAREHOLDER_DELTA_COLUMNS = SHAREHOLDER_SNAPSHOT_COLUMNS + ["action"]
+
 CODAL_LETTERS_LIST_COLUMNS = [
     "tracing_id",
     "symbol",
@@ -88,6 +160,147 @@ LOG_COLUMNS = [
     "date",
 ]
 
+SHAREHOLDER_DIMENSION_COLUMNS = [
+    "shareholder_key",
+    "shareholder_id",
+    "shareholder_name",
+    "isin",
+]
+
+# Datasets
+PRICE_HISTORY_DATASET = "price_history"
+SHAREHOLDER_DATASET = "shareholder"
+LETTERS_LIST_DATASET = "letters_list"
+BALANCE_SHEET_DATASET = "balance_sheet"
+PNL_SHEET_DATASET = "pnl"
+CASH_FLOW_SHEET_DATASET = "cash_flow"
+LOG_DATASET = "log"
+SHAREHOLDER_DIMENSION_DATASET = "shareholders"
+SHAREHOLDER_SNAPSHOT_DATASET = "shareholder_snapshot"
+SHAREHOLDER_DELTA_DATASET = "shareholder_delta"
+
+DATASET_COLUMNS = {
+    PRICE_HISTORY_DATASET: PRICE_HISTORY_DATA_COLUMNS,
+    SHAREHOLDER_DATASET: SHAREHOLDER_DATA_COLUMNS,
+    LETTERS_LIST_DATASET: CODAL_LETTERS_LIST_COLUMNS,
+    BALANCE_SHEET_DATASET: BALANCE_SHEET_COLUMNS,
+    PNL_SHEET_DATASET: PNL_SHEET_COLUMNS,
+    CASH_FLOW_SHEET_DATASET: CASH_FLOW_SHEET_COLUMNS,
+    LOG_DATASET: LOG_COLUMNS,
+    SHAREHOLDER_DIMENSION_DATASET: SHAREHOLDER_DIMENSION_COLUMNS,
+    SHAREHOLDER_SNAPSHOT_DATASET: SHAREHOLDER_SNAPSHOT_COLUMNS,
+    SHAREHOLDER_DELTA_DATASET: SHAREHOLDER_DELTA_COLUMNS,
+}
+
+# Datasets whose repeated text columns are interned into a dimension dataset.
+# Each distinct combination of "columns" gets an integer "key"; the fact rows
+# keep the key instead of the "attributes", which are joined back on read.
+SHAREHOLDER_DIMENSION = {
+    "dataset": SHAREHOLDER_DIMENSION_DATASET,
+    "key": "shareholder_key",
+    "columns": ["shareholder_id", "shareholder_name", "isin"],
+    "attributes": ["shareholder_name", "isin"],
+}
+
+DATASET_DIMENSIONS = {
+    SHAREHOLDER_DATASET: SHAREHOLDER_DIMENSION,
+    SHAREHOLDER_SNAPSHOT_DATASET: SHAREHOLDER_DIMENSION,
+    SHAREHOLDER_DELTA_DATASET: SHAREHOLDER_DIMENSION,
+}
+
+DATASET_PRIMARY_KEYS = {
+    PRICE_HISTORY_DATASET: ["ticker_index", "date"],
+    SHAREHOLDER_DATASET: ["ticker_index", "date", "shareholder_id"],
+    LETTERS_LIST_DATASET: ["tracing_id"],
+    BALANCE_SHEET_DATASET: ["tracing_id"],
+    PNL_SHEET_DATASET: ["tracing_id"],
+    CASH_FLOW_SHEET_DATASET: ["tracing_id"],
+    LOG_DATASET: ["id", "date"],
+    SHAREHOLDER_DIMENSION_DATASET: ["shareholder_key"],
+    SHAREHOLDER_SNAPSHOT_DATASET: ["ticker_index", "date", "shareholder_id"],
+    SHAREHOLDER_DELTA_DATASET: ["ticker_index", "date", "shareholder_id"],
+}
+
+# Compact in-memory dtypes; dates stay datetime64 so they compare with
+# pd.Timestamp, integer columns with missing values become nullable
+PRICE_HISTORY_DATA_DTYPES = {
+    "en_ticker": "category",
+    "first": "float64",
+    "high": "float64",
+    "low": "float64",
+    "close": "float64",
+    "value": "int64",
+    "volume": "int64",
+    "open_int": "int32",
+    "open": "float64",
+    "last": "float64",
+    "ticker_index": "category",
+}
+
+SHAREHOLDER_DATA_DTYPES = {
+    "shareholder_id": "int32",
+    "shareholder_name": "category",
+    "isin": "category",
+    "n_shares": "int64",
+    "per_shares": "float32",
+    "ticker_index": "category",
+    "shareholder_key": "int32",
+}
+
+SHAREHOLDER_SNAPSHOT_DTYPES = dict(
+    SHAREHOLDER_DATA_DTYPES, change="float32", change_amount="float64"
+)
+SHAREHOLDER_DELTA_DTYPES = dict(SHAREHOLDER_SNAPSHOT_DTYPES, action="category")
+
+SHAREHOLDER_DIMENSION_DTYPES = {
+    "shareholder_key": "int32",
+    "shareholder_id": "int32",
+    "shareholder_name": "category",
+    "isin": "category",
+}
+
+CODAL_LETTERS_LIST_DTYPES = {
+    "tracing_id": "int64",
+    "symbol": "category",
+    "is_audited": "bool",
+    "is_correction": "bool",
+    "is_consolidated": "bool",
+    "period_type": "category",
+    "period_length": "Int16",
+}
+
+BALANCE_SHEET_DTYPES = dict.fromkeys(BALANCE_SHEET_COLUMNS, "float64")
+BALANCE_SHEET_DTYPES["tracing_id"] = "int64"
+PNL_SHEET_DTYPES = dict.fromkeys(PNL_SHEET_COLUMNS, "float64")
+PNL_SHEET_DTYPES["tracing_id"] = "int64"
+CASH_FLOW_SHEET_DTYPES = dict.fromkeys(CASH_FLOW_SHEET_COLUMNS, "float64")
+CASH_FLOW_SHEET_DTYPES["tracing_id"] = "int64"
+
+DATASET_DTYPES = {
+    PRICE_HISTORY_DATASET: PRICE_HISTORY_DATA_DTYPES,
+    SHAREHOLDER_DATASET: SHAREHOLDER_DATA_DTYPES,
+    LETTERS_LIST_DATASET: CODAL_LETTERS_LIST_DTYPES,
+    BALANCE_SHEET_DATASET: BALANCE_SHEET_DTYPES,
+    PNL_SHEET_DATASET: PNL_SHEET_DTYPES,
+    CASH_FLOW_SHEET_DATASET: CASH_FLOW_SHEET_DTYPES,
+    LOG_DATASET: {"id": "str"},
+    SHAREHOLDER_DIMENSION_DATASET: SHAREHOLDER_DIMENSION_DTYPES,
+    SHAREHOLDER_SNAPSHOT_DATASET: SHAREHOLDER_SNAPSHOT_DTYPES,
+    SHAREHOLDER_DELTA_DATASET: SHAREHOLDER_DELTA_DTYPES,
+}
+
+# Partition columns per dataset, "year" is derived from the "date" column
+DATASET_PARTITIONS = {
+    PRICE_HISTORY_DATASET: ["ticker_index", "year"],
+    SHAREHOLDER_DATASET: ["ticker_index", "year"],
+    SHAREHOLDER_SNAPSHOT_DATASET: ["ticker_index", "year"],
+    SHAREHOLDER_DELTA_DATASET: ["ticker_index", "year"],
+}
+
+# Days between the full shareholder snapshots of a DeltaStore; a reader
+# applies at most this many days of deltas to a snapshot
+SHAREHOLDER_SNAPSHOT_INTERVAL = 30
+
 # Field maps
 PRICE_HISTORY_FIELD_MAP = {
     "<TICKER>": "en_ticker",
@@ -104,6 +317,20 @@ PRICE_HISTORY_FIELD_MAP = {
     "<LAST>": "last",
 }
 
+PRICE_HISTORY_DTYPES = {
+    "<TICKER>": "str",
+    "<DTYYYYMMDD>": "int32",
+    "<FIRST>": "float64",
+    "<HIGH>": "float64",
+    "<LOW>": "float64",
+    "<CLOSE>": "float64",
+    "<VALUE>": "int64",
+    "<VOL>": "int64",
+    "<OPENINT>": "int64",
+    "<OPEN>": "float64",
+    "<LAST>": "float64",
+}
+
 SHAREHOLDER_FIELD_MAP = {
     "shareHolderID": "shareholder_id",
     "shareHolderName": "shareholder_name",
@@ -179,6 +406,38 @@ CASH_FLOW_FIX_MISTAKE_MAP = {
     "معاملات غیرنقدی": "non_cash_transactions",
 }
 
+# Layouts of Codal statement tables: the (title, value) column pairs read from a
+# table with the given number of columns, "default" for any other width.
+# Pairs that do not fit in a table are skipped
+BALANCE_SHEET_LAYOUTS = {
+    56: ((6, 7),),
+    24: ((3, 4),),
+    18: ((2, 3),),
+    16: ((1, 2), (9, 10)),
+    12: ((1, 2),),
+    10: ((1, 2), (6, 7)),
+    "default": ((0, 1), (4, 5)),
+}
+PNL_SHEET_LAYOUTS = {
+    24: ((3, 4),),
+    18: ((2, 3),),
+    12: ((1, 2),),
+    5: ((1, 2),),
+    "default": ((0, 1),),
+}
+CASH_FLOW_SHEET_LAYOUTS = {
+    12: ((1, 2),),
+    "default": ((0, 1),),
+}
+
+# Codal statement titles that match no known title after folding are matched
+# to the closest known title at least this similar
+CODAL_TITLE_FUZZY_CUTOFF = 0.95
+CODAL_TITLE_CACHE_SIZE = 4096
+
+# Planned Codal letters waiting for a scraper thread; planning blocks beyond it
+CODAL_WORK_QUEUE_SIZE = 256
+
 # CODAL CODES
 BALANCE_SHEET_ID = 0
 PNL_SHEET_ID = 1
@@ -0,0 +1,13 @@
+from .base import Store
+from .csv_store import CsvStore
+from .parquet_store import ParquetStore
+from .sqlite_store import SqliteStore
+from .delta_store import DeltaStore
+from .query import (
+    iter_dataset,
+    read_dataset,
+    read_price_history,
+    read_shareholder_data,
+    read_letters_list,
+    read_codal_sheet,
+)
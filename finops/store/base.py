@@ -0,0 +1,313 @@
+import operator
+import threading
+import pandas as pd
+from finops.config import (
+    CSV_CHUNK_SIZE,
+    DATASET_COLUMNS,
+    DATASET_DTYPES,
+    DATASET_DIMENSIONS,
+)
+from finops.utils.preprocessor import Preprocessor
+
+FILTER_OPERATORS = {
+    "=": operator.eq,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda column, values: column.isin(values),
+    "not in": lambda column, values: ~column.isin(values),
+}
+
+
+class Store:
+    """
+    Base class of dataset storage backends.
+
+    A store keeps one table per dataset name (see ``finops.config.DATASET_COLUMNS``).
+    Filters are lists of ``(column, operator, value)`` tuples combined with
+    AND, where the operator is one of ``=``, ``!=``, ``<``, ``<=``, ``>``,
+    ``>=``, ``in`` and ``not in``.
+
+    Datasets listed in ``finops.config.DATASET_DIMENSIONS`` keep integer keys
+    instead of their repeated text columns; the distinct values live in a
+    dimension dataset that is extended as new values appear. Keys are
+    assigned by the store object, so a dataset should be written by one
+    process at a time.
+    """
+
+    STR_COLUMNS = ["ticker_index", "id"]
+    DATE_COLUMNS = ["date", "req_date"]
+
+    def __init__(self, dimensions: dict = None):
+        """
+        Initialize a Store object.
+
+        :param dimensions: Mapping of dataset to its dimension, see
+            ``finops.config.DATASET_DIMENSIONS``.
+        :type dimensions: dict, optional
+        """
+        self.dimensions = DATASET_DIMENSIONS if dimensions is None else dimensions
+        self._dimension_tables = {}
+        self._dimension_keys = {}
+        self._dimension_lock = threading.RLock()
+
+    def append(self, dataset: str, data: pd.DataFrame):
+        """
+        Appends rows to a dataset.
+
+        :param dataset: The dataset name.
+        :type dataset: str
+        :param data: The rows to append.
+        :type data: pd.DataFrame
+        """
+        self._append(dataset, self._encode_dimension(dataset, data))
+
+    def read(self, dataset: str, filters: list = None, columns: list = None) -> pd.DataFrame:
+        """
+        Reads the rows of a dataset matching ``filters``.
+
+        Dimension attributes are joined only when they are requested, and
+        filters on them are resolved to keys before the rows are read.
+
+        :param dataset: The dataset name.
+        :type dataset: str
+        :param filters: The row filters.
+        :type filters: list, optional
+        :param columns: The columns to return, all dataset columns by default.
+        :type columns: list, optional
+        :return: The matching rows.
+        :rtype: pd.DataFrame
+        """
+        dimension = self.dimensions.get(dataset)
+        if dimension is None:
+            return self._read(dataset, filters, self._get_columns(dataset, columns))
+        fact_filters, fact_columns, columns = self._get_fact_query(
+            dataset, filters, columns
+        )
+        data = self._read(dataset, fact_filters, fact_columns)
+        return self._join_dimension(dataset, data, columns)
+
+    def iter_read(
+        self,
+        dataset: str,
+        filters: list = None,
+        columns: list = None,
+        chunksize: int = CSV_CHUNK_SIZE,
+    ):
+        """
+        Reads the rows of a dataset matching ``filters`` in chunks of at most
+        ``chunksize`` rows, see :meth:`read`. Backends that cannot stream
+        their rows yield a single chunk.
+
+        :param dataset: The dataset name.
+        :type dataset: str
+        :param filters: The row filters.
+        :type filters: list, optional
+        :param columns: The columns to return, all dataset columns by default.
+        :type columns: list, optional
+        :param chunksize: The maximum number of rows of a chunk.
+        :type chunksize: int
+        :return: The matching rows.
+        :rtype: Iterator[pd.DataFrame]
+        """
+        if dataset not in self.dimensions:
+            yield from self._iter_read(
+                dataset, filters, self._get_columns(dataset, columns), chunksize
+            )
+            return
+        fact_filters, fact_columns, columns = self._get_fact_query(
+            dataset, filters, columns
+        )
+        for chunk in self._iter_read(dataset, fact_filters, fact_columns, chunksize):
+            yield self._join_dimension(dataset, chunk, columns)
+
+    def overwrite(self, dataset: str, data: pd.DataFrame, filters: list):
+        """
+        Replaces the rows of a dataset matching ``filters`` with ``data``.
+
+        :param dataset: The dataset name.
+        :type dataset: str
+        :param data: The new rows.
+        :type data: pd.DataFrame
+        :param filters: The filters selecting the replaced rows.
+        :type filters: list
+        """
+        self._overwrite(dataset, self._encode_dimension(dataset, data), filters)
+
+    def contains(self, dataset: str, filters: list) -> bool:
+        """
+        Checks whether a dataset has any row matching ``filters``.
+
+        :param dataset: The dataset name.
+        :type dataset: str
+        :param filters: The row filters.
+        :type filters: list
+        :return: True if a matching row exists.
+        :rtype: bool
+        """
+        columns = self._get_dataset_columns(dataset)[:1]
+        return not self.read(dataset, filters, columns).empty
+
+    def _append(self, dataset, data):
+        raise NotImplementedError
+
+    def _read(self, dataset, filters, columns):
+        raise NotImplementedError
+
+    def _iter_read(self, dataset, filters, columns, chunksize):
+        yield self._read(dataset, filters, columns)
+
+    def _overwrite(self, dataset, data, filters):
+        raise NotImplementedError
+
+    def _get_fact_query(self, dataset, filters, columns):
+        """
+        Returns the filters and columns to read from a dataset with a
+        dimension, with the filters on dimension attributes resolved to keys,
+        and the requested columns.
+        """
+        columns = self._get_dataset_columns(dataset, columns)
+        dimension = self.dimensions[dataset]
+        key, attributes = dimension["key"], dimension["attributes"]
+        fact_filters = [item for item in filters or [] if item[0] not in attributes]
+        dimension_filters = [item for item in filters or [] if item[0] in attributes]
+        if dimension_filters:
+            dimension_table = self._apply_filters(
+                self._get_dimension_table(dataset), dimension_filters
+            )
+            fact_filters.append((key, "in", dimension_table[key].tolist()))
+        fact_columns = [column for column in columns if column not in attributes]
+        joined = len(fact_columns) < len(columns)
+        if joined and key not in fact_columns:
+            fact_columns.append(key)
+        return fact_filters, fact_columns, columns
+
+    def _join_dimension(self, dataset, data, columns):
+        dimension = self.dimensions[dataset]
+        key = dimension["key"]
+        joined_columns = [
+            column for column in columns if column in dimension["attributes"]
+        ]
+        if joined_columns:
+            dimension_table = self._get_dimension_table(dataset).set_index(key)
+            for column in joined_columns:
+                data[column] = data[key].map(dimension_table[column])
+        return self._apply_dtypes(data[columns], dataset)
+
+    def _get_dimension_table(self, dataset):
+        """
+        Returns the dimension table of a dataset, loading it on first use.
+        """
+        dimension = self.dimensions[dataset]
+        name = dimension["dataset"]
+        with self._dimension_lock:
+            if name not in self._dimension_tables:
+                table = self._read(name, None, self._get_columns(name))
+                self._dimension_tables[name] = table
+                self._dimension_keys[name] = dict(
+                    zip(
+                        self._get_natural_keys(table, dimension["columns"]),
+                        table[dimension["key"]].tolist(),
+                    )
+                )
+            return self._dimension_tables[name]
+
+    @staticmethod
+    def _get_natural_keys(data, columns):
+        values = [data[column].astype(object) for column in columns]
+        values = [column.where(column.notna(), None) for column in values]
+        return list(zip(*values))
+
+    def _encode_dimension(self, dataset, data):
+        """
+        Replaces the dimension attributes of ``data`` with their keys, adding
+        the combinations not seen before to the dimension dataset.
+        """
+        dimension = self.dimensions.get(dataset)
+        if dimension is None:
+            return data
+        key = dimension["key"]
+        missing_columns = set(dimension["columns"]) - set(data.columns)
+        if missing_columns:
+            raise ValueError(
+                f"Columns {sorted(missing_columns)} are missing from the {dataset} data."
+            )
+        natural_keys = self._get_natural_keys(data, dimension["columns"])
+        with self._dimension_lock:
+            table = self._get_dimension_table(dataset)
+            keys = self._dimension_keys[dimension["dataset"]]
+            new_keys = [
+                natural_key
+                for natural_key in dict.fromkeys(natural_keys)
+                if natural_key not in keys
+            ]
+            if new_keys:
+                next_key = int(table[key].max()) + 1 if len(table) else 0
+                new_rows = pd.DataFrame(new_keys, columns=dimension["columns"])
+                new_rows.insert(0, key, range(next_key, next_key + len(new_keys)))
+                new_rows = self._apply_dtypes(new_rows, dimension["dataset"])
+                self._append(dimension["dataset"], new_rows)
+                keys.update(zip(new_keys, new_rows[key].tolist()))
+                self._dimension_tables[dimension["dataset"]] = pd.concat(
+                    [table, new_rows], ignore_index=True
+                )
+            codes = [keys[natural_key] for natural_key in natural_keys]
+        data = data.drop(columns=dimension["attributes"])
+        data[key] = pd.Series(codes, index=data.index, dtype="int64")
+        return data
+
+    def _get_dataset_columns(self, dataset, columns=None):
+        if columns is not None:
+            return list(columns)
+        try:
+            return list(DATASET_COLUMNS[dataset])
+        except KeyError:
+            raise ValueError(f"Unknown dataset {dataset}.")
+
+    def _get_columns(self, dataset, columns=None):
+        """
+        Returns the stored columns of a dataset: the dataset columns with the
+        dimension attributes replaced by the dimension key.
+        """
+        if columns is not None:
+            return list(columns)
+        columns = self._get_dataset_columns(dataset)
+        dimension = self.dimensions.get(dataset)
+        if dimension is not None:
+            attributes = dimension["attributes"]
+            position = min(columns.index(column) for column in attributes)
+            columns = [column for column in columns if column not in attributes]
+            columns.insert(position, dimension["key"])
+        return columns
+
+    @staticmethod
+    def _apply_dtypes(data, dataset):
+        return Preprocessor._apply_dtypes(data, DATASET_DTYPES.get(dataset, {}))
+
+    def _select_columns(self, data, dataset):
+        columns = self._get_columns(dataset)
+        missing_columns = set(columns) - set(data.columns)
+        if missing_columns:
+            raise ValueError(
+                f"Columns {sorted(missing_columns)} are missing from the {dataset} data."
+            )
+        return data[columns]
+
+    @staticmethod
+    def _get_mask(data, filters):
+        mask = pd.Series(True, index=data.index)
+        for column, op, value in filters or []:
+            try:
+                mask &= FILTER_OPERATORS[op](data[column], value)
+            except KeyError:
+                raise ValueError(f"Unsupported filter ({column}, {op}, {value}).")
+        return mask
+
+    @staticmethod
+    def _apply_filters(data, filters):
+        if not filters:
+            return data
+        return data[Store._get_mask(data, filters)]
@@ -0,0 +1,115 @@
+import os
+import threading
+import pandas as pd
+from finops.config import CSV_CHUNK_SIZE
+from finops.store.base import Store
+from finops.utils.downloader import Downloader
+
+
+class CsvStore(Store):
+    """
+    Stores every dataset as ``<root>/<dataset>.csv``, the layout used by
+    ``Codal`` since its first release.
+    """
+
+    def __init__(self, root: str, dimensions: dict = None):
+        """
+        Initialize a CsvStore object.
+
+        :param root: The directory holding the CSV files.
+        :type root: str
+        :param dimensions: Mapping of dataset to its dimension.
+        :type dimensions: dict, optional
+        """
+        super().__init__(dimensions)
+        self.root = root
+        self._lock = threading.Lock()
+
+    def get_path(self, dataset: str) -> str:
+        """
+        Returns the CSV path of a dataset.
+
+        :param dataset: The dataset name.
+        :type dataset: str
+        :return: The CSV path.
+        :rtype: str
+        """
+        return os.path.join(self.root, f"{dataset}.csv")
+
+    def _append(self, dataset, data):
+        path = self.get_path(dataset)
+        data = self._select_columns(data, dataset)
+        with self._lock:
+            Downloader._create_csv_file(path, self._get_columns(dataset))
+            Downloader._save_csv(data, path)
+
+    @classmethod
+    def iter_csv(
+        cls,
+        path: str,
+        columns: list,
+        filters: list = None,
+        chunksize: int = CSV_CHUNK_SIZE,
+    ):
+        """
+        Reads a CSV file in chunks, yielding the rows of each chunk matching
+        ``filters``.
+
+        Only ``columns`` and the filtered columns are parsed, and rows are
+        dropped chunk by chunk, so memory is bounded by the chunk size and
+        the matching rows rather than the file size.
+
+        :param path: The path of the CSV file.
+        :type path: str
+        :param columns: The columns to return.
+        :type columns: list
+        :param filters: The row filters.
+        :type filters: list, optional
+        :param chunksize: The number of rows parsed at a time.
+        :type chunksize: int
+        :return: The matching rows of every chunk.
+        :rtype: Iterator[pd.DataFrame]
+        """
+        filter_columns = [column for column, _, _ in filters or []]
+        usecols = list(dict.fromkeys(list(columns) + filter_columns))
+        with pd.read_csv(
+            path,
+            usecols=usecols,
+            dtype={column: str for column in cls.STR_COLUMNS if column in usecols},
+            parse_dates=[column for column in cls.DATE_COLUMNS if column in usecols],
+            chunksize=chunksize,
+        ) as reader:
+            for chunk in reader:
+                yield cls._apply_filters(chunk, filters)[list(columns)]
+
+    def _read_csv(self, path, usecols, filters=None):
+        chunks = list(self.iter_csv(path, usecols, filters))
+        if not chunks:
+            return pd.DataFrame(columns=usecols)
+        return pd.concat(chunks, ignore_index=True)
+
+    def _read(self, dataset, filters, columns):
+        path = self.get_path(dataset)
+        if not os.path.isfile(path):
+            return self._apply_dtypes(pd.DataFrame(columns=columns), dataset)
+        data = self._read_csv(path, columns, filters)
+        return self._apply_dtypes(data, dataset)
+
+    def _iter_read(self, dataset, filters, columns, chunksize):
+        path = self.get_path(dataset)
+        if not os.path.isfile(path):
+            return
+        for chunk in self.iter_csv(path, columns, filters, chunksize):
+            yield self._apply_dtypes(chunk.reset_index(drop=True), dataset)
+
+    def _overwrite(self, dataset, data, filters):
+        path = self.get_path(dataset)
+        data = self._select_columns(data, dataset)
+        columns = self._get_columns(dataset)
+        with self._lock:
+            Downloader._create_csv_file(path, columns)
+            stored = self._read_csv(path, columns)
+            stored = stored[~self._get_mask(stored, filters)]
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            pd.concat([stored, data], ignore_index=True).to_csv(tmp_path, index=False)
+            os.replace(tmp_path, path)
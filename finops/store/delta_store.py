@@ -0,0 +1,523 @@
+import threading
+import pandas as pd
+from finops.config import (
+    CSV_CHUNK_SIZE,
+    SHAREHOLDER_DATASET,
+    SHAREHOLDER_SNAPSHOT_DATASET,
+    SHAREHOLDER_DELTA_DATASET,
+    SHAREHOLDER_DATA_COLUMNS,
+    SHAREHOLDER_SNAPSHOT_COLUMNS,
+    SHAREHOLDER_DELTA_COLUMNS,
+    SHAREHOLDER_SNAPSHOT_INTERVAL,
+)
+from finops.store.base import Store
+
+
+class DeltaStore(Store):
+    """
+    Stores the shareholder dataset in another store as periodic full
+    snapshots plus daily deltas.
+
+    The shareholder list of a ticker barely changes from one day to the
+    next, so only its first list and then one list every
+    ``snapshot_interval`` days are written in full to
+    ``shareholder_snapshot``. The other days write to ``shareholder_delta``
+    only the holders that entered, exited or changed, with ``action`` set to
+    ``entry``, ``exit`` or ``change``. Holdings are rebuilt from the latest
+    snapshot and the deltas after it, see :meth:`get_holdings`.
+
+    Other datasets are passed to the wrapped store unchanged, so a DeltaStore
+    can be used wherever a store is accepted. The days of a ticker are
+    expected in date order; a changed day older than the last stored one
+    re-encodes the ticker's history.
+    """
+
+    ENTRY = "entry"
+    EXIT = "exit"
+    CHANGE = "change"
+    SNAPSHOT = "snapshot"
+    KEY_COLUMNS = ["ticker_index", "shareholder_id"]
+    VALUE_COLUMNS = [
+        "shareholder_name",
+        "isin",
+        "n_shares",
+        "per_shares",
+        "change",
+        "change_amount",
+    ]
+
+    def __init__(
+        self, store: Store, snapshot_interval: int = SHAREHOLDER_SNAPSHOT_INTERVAL
+    ):
+        """
+        Initialize a DeltaStore object.
+
+        :param store: The store holding the snapshots and deltas.
+        :type store: finops.store.Store
+        :param snapshot_interval: The number of days between full snapshots.
+        :type snapshot_interval: int
+        """
+        super().__init__(dimensions={})
+        self.store = store
+        self.snapshot_interval = snapshot_interval
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def append(self, dataset: str, data: pd.DataFrame):
+        """
+        Appends rows to a dataset, encoding shareholder rows as snapshots and
+        deltas.
+
+        :param dataset: The dataset name.
+        :type dataset: str
+        :param data: The rows to append.
+        :type data: pd.DataFrame
+        """
+        if dataset != SHAREHOLDER_DATASET:
+            self.store.append(dataset, data)
+            return
+        if data.empty:
+            return
+        data = Store._apply_dtypes(
+            data.reindex(columns=SHAREHOLDER_SNAPSHOT_COLUMNS),
+            SHAREHOLDER_SNAPSHOT_DATASET,
+        )
+        snapshots = []
+        deltas = []
+        with self._lock:
+            for ticker_index, ticker_data in data.groupby(
+                data["ticker_index"].astype(str), sort=False
+            ):
+                self._encode_ticker(ticker_index, ticker_data, snapshots, deltas)
+            if snapshots:
+                self.store.append(
+                    SHAREHOLDER_SNAPSHOT_DATASET,
+                    pd.concat(snapshots, ignore_index=True),
+                )
+            if deltas:
+                self.store.append(
+                    SHAREHOLDER_DELTA_DATASET, pd.concat(deltas, ignore_index=True)
+                )
+
+    def read(
+        self, dataset: str, filters: list = None, columns: list = None
+    ) -> pd.DataFrame:
+        """
+        Reads the rows of a dataset matching ``filters``.
+
+        Shareholder rows are rebuilt for the first stored date and every date
+        a ticker's holdings changed, see :meth:`get_holdings_history`. Only
+        the tickers selected by ``ticker_index`` filters are rebuilt, up to
+        the last date allowed by the ``date`` filters.
+
+        :param dataset: The dataset name.
+        :type dataset: str
+        :param filters: The row filters.
+        :type filters: list, optional
+        :param columns: The columns to return, all dataset columns by default.
+        :type columns: list, optional
+        :return: The matching rows.
+        :rtype: pd.DataFrame
+        """
+        if dataset != SHAREHOLDER_DATASET:
+            return self.store.read(dataset, filters, columns)
+        filters = self._parse_date_filters(filters)
+        tickers_index_list, end_date = self._get_history_range(filters)
+        history_filters = self._get_filters(tickers_index_list)
+        if end_date is not None:
+            history_filters.append(("date", "<=", end_date))
+        dates = pd.concat(
+            [
+                self.store.read(
+                    SHAREHOLDER_SNAPSHOT_DATASET, history_filters, ["date"]
+                ),
+                self.store.read(SHAREHOLDER_DELTA_DATASET, history_filters, ["date"]),
+            ]
+        )["date"]
+        if dates.empty:
+            data = self._get_empty_holdings()
+        else:
+            data = self.get_holdings_history(
+                dates.min(), dates.max(), tickers_index_list
+            )
+        data = Store._apply_filters(data, filters).reset_index(drop=True)
+        return data[list(columns or SHAREHOLDER_DATA_COLUMNS)]
+
+    def iter_read(
+        self,
+        dataset: str,
+        filters: list = None,
+        columns: list = None,
+        chunksize: int = CSV_CHUNK_SIZE,
+    ):
+        """
+        Reads the rows of a dataset matching ``filters`` in chunks of at most
+        ``chunksize`` rows. Shareholder rows are rebuilt as a whole, see
+        :meth:`read`, and yielded as a single chunk.
+
+        :param dataset: The dataset name.
+        :type dataset: str
+        :param filters: The row filters.
+        :type filters: list, optional
+        :param columns: The columns to return, all dataset columns by default.
+        :type columns: list, optional
+        :param chunksize: The maximum number of rows of a chunk.
+        :type chunksize: int
+        :return: The matching rows.
+        :rtype: Iterator[pd.DataFrame]
+        """
+        if dataset != SHAREHOLDER_DATASET:
+            yield from self.store.iter_read(dataset, filters, columns, chunksize)
+            return
+        yield self.read(dataset, filters, columns)
+
+    def overwrite(self, dataset: str, data: pd.DataFrame, filters: list):
+        """
+        Replaces the rows of a dataset matching ``filters`` with ``data``.
+        The shareholder dataset can only be appended to.
+
+        :param dataset: The dataset name.
+        :type dataset: str
+        :param data: The new rows.
+        :type data: pd.DataFrame
+        :param filters: The filters selecting the replaced rows.
+        :type filters: list
+        """
+        if dataset == SHAREHOLDER_DATASET:
+            raise ValueError(
+                f"The {dataset} dataset of a DeltaStore can only be appended to."
+            )
+        self.store.overwrite(dataset, data, filters)
+
+    def contains(self, dataset: str, filters: list) -> bool:
+        """
+        Checks whether a dataset has any row matching ``filters``.
+
+        :param dataset: The dataset name.
+        :type dataset: str
+        :param filters: The row filters.
+        :type filters: list
+        :return: True if a matching row exists.
+        :rtype: bool
+        """
+        if dataset != SHAREHOLDER_DATASET:
+            return self.store.contains(dataset, filters)
+        filters = self._parse_date_filters(filters)
+        if self.store.contains(SHAREHOLDER_SNAPSHOT_DATASET, filters):
+            return True
+        if self.store.contains(
+            SHAREHOLDER_DELTA_DATASET, filters + [("action", "!=", self.EXIT)]
+        ):
+            return True
+        # Stored rows differ from the rebuilt ones only by their date: a
+        # holder left unchanged on a delta date is stored on an earlier date
+        if not any(column == "date" for column, _, _ in filters):
+            return False
+        return not self.read(dataset, filters).empty
+
+    def get_holdings(self, date, tickers_index_list: list = None) -> pd.DataFrame:
+        """
+        Returns the shareholders of every ticker as of a date.
+
+        Only the latest snapshot of each ticker up to ``date`` and the deltas
+        after it are read.
+
+        :param date: The date.
+        :type date: pd.Timestamp
+        :param tickers_index_list: List of ticker indices, all tickers by default.
+        :type tickers_index_list: list, optional
+        :return: The holdings with ``date`` set to the requested date.
+        :rtype: pd.DataFrame
+        """
+        date = pd.Timestamp(date)
+        filters = self._get_filters(tickers_index_list) + [("date", "<=", date)]
+        snapshot_dates = self._get_snapshot_dates(filters)
+        if snapshot_dates.empty:
+            return self._get_empty_holdings()
+        snapshots = self.store.read(
+            SHAREHOLDER_SNAPSHOT_DATASET,
+            filters + [("date", "in", snapshot_dates.unique().tolist())],
+        )
+        snapshots = snapshots[
+            snapshots["date"]
+            == snapshots["ticker_index"].astype(str).map(snapshot_dates)
+        ]
+        deltas = self.store.read(
+            SHAREHOLDER_DELTA_DATASET, filters + [("date", ">", snapshot_dates.min())]
+        )
+        deltas = deltas[
+            deltas["date"] > deltas["ticker_index"].astype(str).map(snapshot_dates)
+        ]
+        holdings = self._apply_deltas(snapshots, deltas).assign(date=date)
+        return self._sort_holdings(holdings)
+
+    def get_holdings_history(
+        self, start_date, end_date, tickers_index_list: list = None
+    ) -> pd.DataFrame:
+        """
+        Returns the shareholders of every ticker on ``start_date`` and on
+        every later date up to ``end_date`` their holdings changed.
+
+        The holdings of a ticker on any other date of the range are those of
+        the latest earlier date returned for it.
+
+        :param start_date: The start date of the date range.
+        :type start_date: pd.Timestamp
+        :param end_date: The end date of the date range.
+        :type end_date: pd.Timestamp
+        :param tickers_index_list: List of ticker indices, all tickers by default.
+        :type tickers_index_list: list, optional
+        :return: The holdings, one full list per ticker and date.
+        :rtype: pd.DataFrame
+        """
+        start_date, end_date = pd.Timestamp(start_date), pd.Timestamp(end_date)
+        holdings = self.get_holdings(start_date, tickers_index_list)
+        filters = self._get_filters(tickers_index_list) + [
+            ("date", ">", start_date),
+            ("date", "<=", end_date),
+        ]
+        changes = pd.concat(
+            [
+                self.store.read(SHAREHOLDER_SNAPSHOT_DATASET, filters).assign(
+                    action=self.SNAPSHOT
+                ),
+                self.store.read(SHAREHOLDER_DELTA_DATASET, filters),
+            ],
+            ignore_index=True,
+        )
+        if changes.empty:
+            return holdings
+        states = {
+            ticker_index: state
+            for ticker_index, state in holdings.groupby(
+                holdings["ticker_index"].astype(str), sort=False
+            )
+        }
+        frames = [holdings]
+        changes = changes.sort_values("date", kind="stable")
+        for (ticker_index, date), rows in changes.groupby(
+            [changes["ticker_index"].astype(str), "date"], sort=True
+        ):
+            if (rows["action"] == self.SNAPSHOT).all():
+                state = rows.drop(columns="action")
+            else:
+                state = self._apply_deltas(states.get(ticker_index), rows)
+            states[ticker_index] = state.assign(date=date)
+            frames.append(states[ticker_index])
+        return self._sort_holdings(pd.concat(frames, ignore_index=True))
+
+    @staticmethod
+    def _get_filters(tickers_index_list):
+        if tickers_index_list is None:
+            return []
+        return [("ticker_index", "in", [str(ticker) for ticker in tickers_index_list])]
+
+    @staticmethod
+    def _parse_date_filters(filters):
+        """
+        Parses the values of the ``date`` filters, so they can be pushed down
+        to stores comparing them with typed dates.
+        """
+        parsed_filters = []
+        for column, op, value in filters or []:
+            if column == "date" and op in ("in", "not in"):
+                value = [pd.Timestamp(date) for date in value]
+            elif column == "date":
+                value = pd.Timestamp(value)
+            parsed_filters.append((column, op, value))
+        return parsed_filters
+
+    @staticmethod
+    def _get_history_range(filters):
+        """
+        Returns the tickers selected by the ``ticker_index`` filters, None for
+        all tickers, and the last date allowed by the ``date`` filters.
+        """
+        tickers_index_list = None
+        end_date = None
+        for column, op, value in filters or []:
+            if column == "ticker_index" and op in ("=", "==", "in"):
+                values = [value] if op != "in" else value
+                tickers = [str(ticker) for ticker in values]
+                if tickers_index_list is not None:
+                    tickers = [
+                        ticker for ticker in tickers_index_list if ticker in tickers
+                    ]
+                tickers_index_list = tickers
+            elif column == "date" and op in ("=", "==", "<", "<="):
+                date = pd.Timestamp(value)
+                end_date = date if end_date is None else min(end_date, date)
+        return tickers_index_list, end_date
+
+    def _get_snapshot_dates(self, filters):
+        """
+        Returns the latest snapshot date of every ticker matching ``filters``.
+        """
+        dates = self.store.read(
+            SHAREHOLDER_SNAPSHOT_DATASET, filters, ["ticker_index", "date"]
+        )
+        return dates.groupby(dates["ticker_index"].astype(str))["date"].max()
+
+    @staticmethod
+    def _get_empty_holdings():
+        return Store._apply_dtypes(
+            pd.DataFrame(columns=SHAREHOLDER_SNAPSHOT_COLUMNS),
+            SHAREHOLDER_SNAPSHOT_DATASET,
+        )
+
+    @staticmethod
+    def _sort_holdings(holdings):
+        holdings = holdings.sort_values(
+            ["date", "ticker_index", "shareholder_id"], ignore_index=True
+        )
+        return Store._apply_dtypes(
+            holdings[SHAREHOLDER_SNAPSHOT_COLUMNS], SHAREHOLDER_SNAPSHOT_DATASET
+        )
+
+    def _apply_deltas(self, holdings, deltas):
+        """
+        Applies delta rows to holdings: the latest row of a holder replaces
+        it, and holders whose latest row is an exit are removed.
+        """
+        frames = [deltas]
+        if holdings is not None:
+            frames.insert(0, holdings.assign(action=self.ENTRY))
+        rows = pd.concat(frames, ignore_index=True)
+        for column in self.KEY_COLUMNS:
+            rows[column] = rows[column].astype(str)
+        rows = rows.sort_values("date", kind="stable").drop_duplicates(
+            self.KEY_COLUMNS, keep="last"
+        )
+        rows = rows[rows["action"] != self.EXIT]
+        return Store._apply_dtypes(
+            rows[SHAREHOLDER_SNAPSHOT_COLUMNS].reset_index(drop=True),
+            SHAREHOLDER_SNAPSHOT_DATASET,
+        )
+
+    def _get_state(self, ticker_index):
+        """
+        Returns the last stored date, snapshot date and holdings of a ticker,
+        loading them from the store on first use.
+        """
+        if ticker_index not in self._states:
+            filters = [("ticker_index", "=", ticker_index)]
+            snapshot_dates = self._get_snapshot_dates(filters)
+            if snapshot_dates.empty:
+                self._states[ticker_index] = None
+            else:
+                snapshot_date = snapshot_dates.iloc[0]
+                delta_dates = self.store.read(
+                    SHAREHOLDER_DELTA_DATASET,
+                    filters + [("date", ">", snapshot_date)],
+                    ["date"],
+                )["date"]
+                date = (
+                    max(snapshot_date, delta_dates.max())
+                    if len(delta_dates)
+                    else snapshot_date
+                )
+                self._states[ticker_index] = {
+                    "date": date,
+                    "snapshot_date": snapshot_date,
+                    "holdings": self.get_holdings(date, [ticker_index]),
+                }
+        return self._states[ticker_index]
+
+    def _get_delta(self, holdings, day):
+        """
+        Returns the delta rows turning ``holdings`` into the holdings of ``day``.
+        """
+        old = holdings.set_index("shareholder_id", drop=False)
+        new = day.set_index("shareholder_id", drop=False)
+        common = new.index.intersection(old.index)
+        old_values = old.loc[common, self.VALUE_COLUMNS].astype(object)
+        new_values = new.loc[common, self.VALUE_COLUMNS].astype(object)
+        equal = (old_values == new_values) | (old_values.isna() & new_values.isna())
+        changed = common[~equal.all(axis=1).to_numpy()]
+        exits = old.loc[old.index.difference(new.index)].assign(
+            date=day["date"].iloc[0],
+            req_date=day["req_date"].iloc[0],
+            n_shares=0,
+            per_shares=0.0,
+            change=float("nan"),
+            change_amount=float("nan"),
+            action=self.EXIT,
+        )
+        return pd.concat(
+            [
+                new.loc[new.index.difference(old.index)].assign(action=self.ENTRY),
+                new.loc[changed].assign(action=self.CHANGE),
+                exits,
+            ],
+            ignore_index=True,
+        )[SHAREHOLDER_DELTA_COLUMNS]
+
+    def _encode_day(self, state, day, snapshots, deltas):
+        date = day["date"].iloc[0]
+        if (
+            state is None
+            or (date - state["snapshot_date"]).days >= self.snapshot_interval
+        ):
+            snapshots.append(day)
+            snapshot_date = date
+        else:
+            delta = self._get_delta(state["holdings"], day)
+            if not delta.empty:
+                deltas.append(delta)
+            snapshot_date = state["snapshot_date"]
+        return {"date": date, "snapshot_date": snapshot_date, "holdings": day}
+
+    def _encode_ticker(self, ticker_index, data, snapshots, deltas):
+        """
+        Encodes the days of a ticker after its last stored date, re-encoding
+        its history when an older day differs from the stored holdings.
+        """
+        state = self._get_state(ticker_index)
+        days = [
+            day.drop_duplicates("shareholder_id", keep="last").reset_index(drop=True)
+            for _, day in data.groupby("date", sort=True)
+        ]
+        if state is not None:
+            old_days = [day for day in days if day["date"].iloc[0] <= state["date"]]
+            changed_days = [
+                day
+                for day in old_days
+                if not self._get_delta(
+                    self.get_holdings(day["date"].iloc[0], [ticker_index]), day
+                ).empty
+            ]
+            if changed_days:
+                self._reencode_ticker(ticker_index, state, days)
+                return
+            days = [day for day in days if day["date"].iloc[0] > state["date"]]
+        for day in days:
+            state = self._encode_day(state, day, snapshots, deltas)
+        self._states[ticker_index] = state
+
+    def _reencode_ticker(self, ticker_index, state, days):
+        filters = [("ticker_index", "=", ticker_index)]
+        first_date = self.store.read(SHAREHOLDER_SNAPSHOT_DATASET, filters, ["date"])[
+            "date"
+        ].min()
+        history = self.get_holdings_history(first_date, state["date"], [ticker_index])
+        all_days = {date: day for date, day in history.groupby("date")}
+        all_days.update({day["date"].iloc[0]: day for day in days})
+        snapshots = []
+        deltas = []
+        state = None
+        for date in sorted(all_days):
+            state = self._encode_day(state, all_days[date], snapshots, deltas)
+        self.store.overwrite(
+            SHAREHOLDER_SNAPSHOT_DATASET,
+            pd.concat(snapshots, ignore_index=True),
+            filters,
+        )
+        self.store.overwrite(
+            SHAREHOLDER_DELTA_DATASET,
+            pd.concat(
+                [pd.DataFrame(columns=SHAREHOLDER_DELTA_COLUMNS)] + deltas,
+                ignore_index=True,
+            ),
+            filters,
+        )
+        self._states[ticker_index] = state
@@ -0,0 +1,283 @@
+import os
+import uuid
+import shutil
+import threading
+import pandas as pd
+from finops.config import DATASET_PARTITIONS
+from finops.store.base import Store
+
+try:
+    import pyarrow
+    import pyarrow.dataset
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+class ParquetStore(Store):
+    """
+    Stores every dataset as a hive-partitioned Parquet dataset under
+    ``<root>/<dataset>``, e.g. ``price_history/ticker_index=.../year=.../``.
+
+    Each append writes new part files to a hidden temporary name and renames
+    them into place, so readers never see a partially written file. Filters
+    and columns are pushed down to the Parquet reader; filters on ``date`` are
+    also turned into ``year`` partition filters to skip whole directories.
+    """
+
+    def __init__(self, root: str, partitions: dict = None, dimensions: dict = None):
+        """
+        Initialize a ParquetStore object.
+
+        :param root: The directory holding the datasets.
+        :type root: str
+        :param partitions: Mapping of dataset to partition columns.
+        :type partitions: dict, optional
+        :param dimensions: Mapping of dataset to its dimension.
+        :type dimensions: dict, optional
+        """
+        if pyarrow is None:
+            raise ImportError("ParquetStore requires pyarrow, install finops[arrow].")
+        super().__init__(dimensions)
+        self.root = root
+        self.partitions = DATASET_PARTITIONS if partitions is None else partitions
+        self._lock = threading.Lock()
+
+    def get_path(self, dataset: str) -> str:
+        """
+        Returns the directory of a dataset.
+
+        :param dataset: The dataset name.
+        :type dataset: str
+        :return: The dataset directory.
+        :rtype: str
+        """
+        return os.path.join(self.root, dataset)
+
+    def _get_partitioning(self, dataset):
+        partitions = self.partitions.get(dataset, [])
+        if not partitions:
+            return None
+        return pyarrow.dataset.partitioning(
+            pyarrow.schema(
+                [
+                    (column, pyarrow.int16() if column == "year" else pyarrow.string())
+                    for column in partitions
+                ]
+            ),
+            flavor="hive",
+        )
+
+    @staticmethod
+    def _write_table(table, directory):
+        os.makedirs(directory, exist_ok=True)
+        name = f"part-{uuid.uuid4().hex}.parquet"
+        tmp_path = os.path.join(directory, f".{name}.tmp")
+        pyarrow.parquet.write_table(table, tmp_path)
+        os.replace(tmp_path, os.path.join(directory, name))
+
+    def _get_schema_path(self, dataset):
+        return os.path.join(self.get_path(dataset), "_common_metadata")
+
+    def _read_schema(self, dataset):
+        schema_path = self._get_schema_path(dataset)
+        if not os.path.isfile(schema_path):
+            return None
+        return pyarrow.parquet.read_schema(schema_path)
+
+    def _update_schema(self, dataset, table):
+        """
+        Returns the dataset schema, storing the schema of ``table`` on the first
+        write and filling columns that were all null so far with their type.
+        """
+        schema = self._read_schema(dataset)
+        if schema is not None:
+            fields = [
+                table.schema.field(field.name)
+                if pyarrow.types.is_null(field.type)
+                and not pyarrow.types.is_null(table.schema.field(field.name).type)
+                else field
+                for field in schema
+            ]
+            if fields == list(schema):
+                return schema
+            schema = pyarrow.schema(fields)
+        else:
+            schema = table.schema.remove_metadata()
+        os.makedirs(self.get_path(dataset), exist_ok=True)
+        schema_path = self._get_schema_path(dataset)
+        tmp_path = f"{schema_path}.{uuid.uuid4().hex}.tmp"
+        pyarrow.parquet.write_metadata(schema, tmp_path)
+        os.replace(tmp_path, schema_path)
+        return schema
+
+    def _append(self, dataset, data):
+        self._write_dataset(dataset, data, self.get_path(dataset))
+
+    def _write_dataset(self, dataset, data, path):
+        data = self._select_columns(data, dataset)
+        if data.empty:
+            return
+        partitions = self.partitions.get(dataset, [])
+        if "year" in partitions:
+            data = data.assign(year=pd.to_datetime(data["date"]).dt.year)
+        table = pyarrow.Table.from_pandas(
+            data.drop(columns=partitions), preserve_index=False
+        )
+        with self._lock:
+            schema = self._update_schema(dataset, table)
+        table = table.cast(schema)
+        if not partitions:
+            self._write_table(table, path)
+            return
+        groups = data.groupby(partitions, sort=False, observed=True).indices
+        for keys, indices in groups.items():
+            keys = keys if isinstance(keys, tuple) else (keys,)
+            directory = os.path.join(
+                path,
+                *[f"{column}={key}" for column, key in zip(partitions, keys)],
+            )
+            self._write_table(table.take(indices), directory)
+
+    def _overwrite(self, dataset, data, filters):
+        """
+        Replaces whole partitions of a dataset. ``filters`` must be equality
+        filters on the leading partition columns, e.g.
+        ``[("ticker_index", "=", "1")]``, and ``data`` must belong to the
+        selected partition. The new partition is written next to the old one
+        and swapped in with renames. A single ``in`` filter on the first
+        partition column replaces each of the listed partitions.
+        """
+        partitions = self.partitions.get(dataset, [])
+        if len(filters) == 1 and filters[0][1] == "in" and partitions:
+            column, _, values = filters[0]
+            if column == partitions[0]:
+                keys = data[column].astype(str)
+                for value in values:
+                    self._overwrite(
+                        dataset, data[keys == str(value)], [(column, "=", value)]
+                    )
+                return
+        values = {column: value for column, op, value in filters if op in ("=", "==")}
+        if (
+            len(values) != len(filters)
+            or set(values) != set(partitions[: len(values)])
+            or "year" in values
+        ):
+            raise ValueError(
+                f"Overwrite filters must select a partition of {partitions}, got {filters}."
+            )
+        data = self._select_columns(data, dataset)
+        for column, value in values.items():
+            if not (data[column].astype(str) == str(value)).all():
+                raise ValueError(f"Rows outside the {column}={value} partition.")
+        path = self.get_path(dataset)
+        keys = [f"{column}={values[column]}" for column in partitions[: len(values)]]
+        directory = os.path.join(path, *keys)
+        tmp_path = os.path.join(path, f".overwrite-{uuid.uuid4().hex}")
+        self._write_dataset(dataset, data, tmp_path)
+        new_directory = os.path.join(tmp_path, *keys)
+        old_directory = os.path.join(path, f".old-{uuid.uuid4().hex}")
+        with self._lock:
+            if os.path.isdir(directory):
+                os.rename(directory, old_directory)
+            if os.path.isdir(new_directory):
+                os.makedirs(os.path.dirname(directory), exist_ok=True)
+                os.rename(new_directory, directory)
+        shutil.rmtree(old_directory, ignore_errors=True)
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+    @staticmethod
+    def _get_partition_filters(filters):
+        partition_filters = []
+        for column, op, value in filters:
+            if column != "date" or op not in ("=", "==", "<", "<=", ">", ">="):
+                continue
+            year = pd.Timestamp(value).year
+            year_op = {"<": "<=", ">": ">="}.get(op, op)
+            partition_filters.append(("year", year_op, year))
+        return partition_filters
+
+    def _get_read_options(self, dataset, filters):
+        """
+        Returns the filters, partitioning and schema to read a dataset with,
+        adding the ``year`` partition filters implied by ``date`` filters.
+        """
+        filters = list(filters or [])
+        partitions = self.partitions.get(dataset, [])
+        if "year" in partitions:
+            filters += self._get_partition_filters(filters)
+        partitioning = self._get_partitioning(dataset)
+        schema = self._read_schema(dataset)
+        if schema is not None and partitioning is not None:
+            for field in partitioning.schema:
+                schema = schema.append(field)
+        return filters, partitioning, schema
+
+    def _read(self, dataset, filters, columns):
+        path = self.get_path(dataset)
+        if not os.path.isdir(path):
+            return pd.DataFrame(columns=columns)
+        filters, partitioning, schema = self._get_read_options(dataset, filters)
+        table = pyarrow.parquet.read_table(
+            path,
+            columns=columns,
+            filters=filters or None,
+            partitioning=partitioning,
+            schema=schema,
+        )
+        return table.to_pandas()[columns]
+
+    def _iter_read(self, dataset, filters, columns, chunksize):
+        """
+        Streams the matching rows as Parquet record batches, so only one
+        batch of at most ``chunksize`` rows is held in memory at a time.
+        """
+        path = self.get_path(dataset)
+        if not os.path.isdir(path):
+            return
+        filters, partitioning, schema = self._get_read_options(dataset, filters)
+        data = pyarrow.dataset.dataset(
+            path, schema=schema, format="parquet", partitioning=partitioning
+        )
+        batches = data.to_batches(
+            columns=columns,
+            filter=pyarrow.parquet.filters_to_expression(filters) if filters else None,
+            batch_size=chunksize,
+        )
+        for batch in batches:
+            if batch.num_rows:
+                yield batch.to_pandas()[columns]
+
+    def compact(self, dataset: str):
+        """
+        Merges the part files of every partition of a dataset into one file.
+
+        Readers running at the same time may briefly see duplicated rows, so
+        compact between scraping runs.
+
+        :param dataset: The dataset name.
+        :type dataset: str
+        """
+        path = self.get_path(dataset)
+        schema = self._read_schema(dataset)
+        with self._lock:
+            for directory, _, files in os.walk(path):
+                parts = sorted(
+                    file
+                    for file in files
+                    if file.startswith("part-") and file.endswith(".parquet")
+                )
+                if len(parts) < 2:
+                    continue
+                table = pyarrow.concat_tables(
+                    [
+                        pyarrow.parquet.read_table(
+                            os.path.join(directory, part), partitioning=None
+                        ).cast(schema)
+                        for part in parts
+                    ]
+                )
+                self._write_table(table, directory)
+                for part in parts:
+                    os.remove(os.path.join(directory, part))
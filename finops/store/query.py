@@ -0,0 +1,241 @@
+import os
+import pandas as pd
+from finops.config import (
+    CSV_CHUNK_SIZE,
+    PRICE_HISTORY_DATASET,
+    SHAREHOLDER_DATASET,
+    LETTERS_LIST_DATASET,
+    BALANCE_SHEET_DATASET,
+    PNL_SHEET_DATASET,
+    CASH_FLOW_SHEET_DATASET,
+    DATASET_COLUMNS,
+)
+from finops.store.base import Store
+from finops.store.csv_store import CsvStore
+
+CODAL_SHEET_DATASETS = [
+    BALANCE_SHEET_DATASET,
+    PNL_SHEET_DATASET,
+    CASH_FLOW_SHEET_DATASET,
+]
+
+
+def iter_dataset(
+    source,
+    dataset: str,
+    filters: list = None,
+    columns: list = None,
+    chunksize: int = CSV_CHUNK_SIZE,
+):
+    """
+    Yields the rows of a dataset matching ``filters`` in chunks.
+
+    A CSV file is streamed ``chunksize`` rows at a time and filtered while it
+    is read. A store answers the filters itself, pushing them down to its
+    partitions or indexes, and streams its rows with
+    :meth:`finops.store.Store.iter_read`.
+
+    :param source: The CSV file or store holding the dataset.
+    :type source: str or finops.store.Store
+    :param dataset: The dataset name.
+    :type dataset: str
+    :param filters: The row filters, see :class:`finops.store.Store`.
+    :type filters: list, optional
+    :param columns: The columns to return, all dataset columns by default.
+    :type columns: list, optional
+    :param chunksize: The maximum number of rows of a chunk.
+    :type chunksize: int
+    :return: The matching rows.
+    :rtype: Iterator[pd.DataFrame]
+    """
+    if not isinstance(source, (str, os.PathLike)):
+        yield from source.iter_read(dataset, filters, columns, chunksize)
+        return
+    if columns is None:
+        try:
+            columns = DATASET_COLUMNS[dataset]
+        except KeyError:
+            raise ValueError(f"Unknown dataset {dataset}.")
+    for chunk in CsvStore.iter_csv(source, columns, filters, chunksize):
+        yield Store._apply_dtypes(chunk.reset_index(drop=True), dataset)
+
+
+def read_dataset(
+    source,
+    dataset: str,
+    filters: list = None,
+    columns: list = None,
+    chunksize: int = CSV_CHUNK_SIZE,
+) -> pd.DataFrame:
+    """
+    Reads the rows of a dataset matching ``filters``, see :func:`iter_dataset`.
+
+    :param source: The CSV file or store holding the dataset.
+    :type source: str or finops.store.Store
+    :param dataset: The dataset name.
+    :type dataset: str
+    :param filters: The row filters.
+    :type filters: list, optional
+    :param columns: The columns to return, all dataset columns by default.
+    :type columns: list, optional
+    :param chunksize: The number of CSV rows parsed at a time.
+    :type chunksize: int
+    :return: The matching rows.
+    :rtype: pd.DataFrame
+    """
+    chunks = list(iter_dataset(source, dataset, filters, columns, chunksize))
+    if len(chunks) == 1:
+        return chunks[0]
+    if not chunks:
+        return Store._apply_dtypes(
+            pd.DataFrame(columns=columns or DATASET_COLUMNS[dataset]), dataset
+        )
+    return Store._apply_dtypes(pd.concat(chunks, ignore_index=True), dataset)
+
+
+def _get_filters(column, values=None, start_date=None, end_date=None):
+    filters = []
+    if values is not None:
+        filters.append((column, "in", list(values)))
+    if start_date is not None:
+        filters.append(("date", ">=", pd.Timestamp(start_date)))
+    if end_date is not None:
+        filters.append(("date", "<=", pd.Timestamp(end_date)))
+    return filters
+
+
+def read_price_history(
+    source,
+    tickers_index_list: list = None,
+    start_date=None,
+    end_date=None,
+    columns: list = None,
+    chunksize: int = CSV_CHUNK_SIZE,
+) -> pd.DataFrame:
+    """
+    Reads stored price histories.
+
+    :param source: The CSV file or store holding the price histories.
+    :type source: str or finops.store.Store
+    :param tickers_index_list: List of ticker indices, all tickers by default.
+    :type tickers_index_list: list, optional
+    :param start_date: The first date to return, inclusive.
+    :type start_date: pd.Timestamp, optional
+    :param end_date: The last date to return, inclusive.
+    :type end_date: pd.Timestamp, optional
+    :param columns: The columns to return, all columns by default.
+    :type columns: list, optional
+    :param chunksize: The number of CSV rows parsed at a time.
+    :type chunksize: int
+    :return: The price histories.
+    :rtype: pd.DataFrame
+    """
+    tickers_index_list = (
+        None
+        if tickers_index_list is None
+        else [str(ticker_index) for ticker_index in tickers_index_list]
+    )
+    filters = _get_filters("ticker_index", tickers_index_list, start_date, end_date)
+    return read_dataset(source, PRICE_HISTORY_DATASET, filters, columns, chunksize)
+
+
+def read_shareholder_data(
+    source,
+    tickers_index_list: list = None,
+    start_date=None,
+    end_date=None,
+    shareholder_ids: list = None,
+    columns: list = None,
+    chunksize: int = CSV_CHUNK_SIZE,
+) -> pd.DataFrame:
+    """
+    Reads stored shareholder data.
+
+    :param source: The CSV file or store holding the shareholder data.
+    :type source: str or finops.store.Store
+    :param tickers_index_list: List of ticker indices, all tickers by default.
+    :type tickers_index_list: list, optional
+    :param start_date: The first date to return, inclusive.
+    :type start_date: pd.Timestamp, optional
+    :param end_date: The last date to return, inclusive.
+    :type end_date: pd.Timestamp, optional
+    :param shareholder_ids: List of shareholder IDs, all shareholders by default.
+    :type shareholder_ids: list, optional
+    :param columns: The columns to return, all columns by default.
+    :type columns: list, optional
+    :param chunksize: The number of CSV rows parsed at a time.
+    :type chunksize: int
+    :return: The shareholder data.
+    :rtype: pd.DataFrame
+    """
+    tickers_index_list = (
+        None
+        if tickers_index_list is None
+        else [str(ticker_index) for ticker_index in tickers_index_list]
+    )
+    filters = _get_filters("ticker_index", tickers_index_list, start_date, end_date)
+    if shareholder_ids is not None:
+        filters.append(("shareholder_id", "in", list(shareholder_ids)))
+    return read_dataset(source, SHAREHOLDER_DATASET, filters, columns, chunksize)
+
+
+def read_letters_list(
+    source,
+    symbols: list = None,
+    tracing_ids: list = None,
+    columns: list = None,
+    chunksize: int = CSV_CHUNK_SIZE,
+) -> pd.DataFrame:
+    """
+    Reads stored Codal letters.
+
+    :param source: The CSV file or store holding the letters list.
+    :type source: str or finops.store.Store
+    :param symbols: List of symbols, all symbols by default.
+    :type symbols: list, optional
+    :param tracing_ids: List of letter tracing IDs, all letters by default.
+    :type tracing_ids: list, optional
+    :param columns: The columns to return, all columns by default.
+    :type columns: list, optional
+    :param chunksize: The number of CSV rows parsed at a time.
+    :type chunksize: int
+    :return: The letters.
+    :rtype: pd.DataFrame
+    """
+    filters = _get_filters("symbol", symbols)
+    if tracing_ids is not None:
+        filters.append(("tracing_id", "in", list(tracing_ids)))
+    return read_dataset(source, LETTERS_LIST_DATASET, filters, columns, chunksize)
+
+
+def read_codal_sheet(
+    source,
+    dataset: str,
+    tracing_ids: list = None,
+    columns: list = None,
+    chunksize: int = CSV_CHUNK_SIZE,
+) -> pd.DataFrame:
+    """
+    Reads a stored Codal sheet. Use :func:`read_letters_list` to find the
+    tracing IDs of a symbol.
+
+    :param source: The CSV file or store holding the sheet.
+    :type source: str or finops.store.Store
+    :param dataset: The sheet dataset, one of ``balance_sheet``, ``pnl`` and
+        ``cash_flow``.
+    :type dataset: str
+    :param tracing_ids: List of letter tracing IDs, all letters by default.
+    :type tracing_ids: list, optional
+    :param columns: The columns to return, all columns by default.
+    :type columns: list, optional
+    :param chunksize: The number of CSV rows parsed at a time.
+    :type chunksize: int
+    :return: The sheet rows.
+    :rtype: pd.DataFrame
+    """
+    if dataset not in CODAL_SHEET_DATASETS:
+        raise ValueError(
+            f"Unknown Codal sheet {dataset}, expected one of {CODAL_SHEET_DATASETS}."
+        )
+    filters = _get_filters("tracing_id", tracing_ids)
+    return read_dataset(source, dataset, filters, columns, chunksize)
@@ -0,0 +1,269 @@
+import sqlite3
+import threading
+import numpy as np
+import pandas as pd
+from finops.config import DATASET_PRIMARY_KEYS
+from finops.store.base import Store
+
+SQL_OPERATORS = {
+    "=": "=",
+    "==": "=",
+    "!=": "!=",
+    "<": "<",
+    "<=": "<=",
+    ">": ">",
+    ">=": ">=",
+    "in": "IN",
+    "not in": "NOT IN",
+}
+
+
+class SqliteStore(Store):
+    """
+    Stores every dataset as a table of a single SQLite database.
+
+    Each table has a primary key (see ``finops.config.DATASET_PRIMARY_KEYS``)
+    and appends are upserts, so scraping the same rows again replaces them
+    instead of duplicating them. Filters are translated to SQL and answered
+    from the primary key index. The database runs in WAL mode, letting
+    readers work while a writer commits; every thread gets its own
+    connection.
+    """
+
+    DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+    def __init__(
+        self,
+        path: str,
+        primary_keys: dict = None,
+        timeout: float = 30,
+        dimensions: dict = None,
+    ):
+        """
+        Initialize a SqliteStore object.
+
+        :param path: The path of the database file.
+        :type path: str
+        :param primary_keys: Mapping of dataset to primary key columns.
+        :type primary_keys: dict, optional
+        :param timeout: The number of seconds to wait for a locked database.
+        :type timeout: float
+        :param dimensions: Mapping of dataset to its dimension.
+        :type dimensions: dict, optional
+        """
+        super().__init__(dimensions)
+        self.path = path
+        self.primary_keys = (
+            DATASET_PRIMARY_KEYS if primary_keys is None else primary_keys
+        )
+        self.timeout = timeout
+        self._local = threading.local()
+        self._tables = set()
+        self._lock = threading.Lock()
+
+    def _get_connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def close(self):
+        """
+        Closes the connection of the calling thread.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    @staticmethod
+    def _quote(name):
+        return '"{}"'.format(name.replace('"', '""'))
+
+    def _create_table(self, dataset):
+        if dataset in self._tables:
+            return
+        columns = self._get_columns(dataset)
+        definitions = [self._quote(column) for column in columns]
+        primary_key = self.primary_keys.get(dataset)
+        if primary_key:
+            definitions.append(
+                "PRIMARY KEY ({})".format(", ".join(map(self._quote, primary_key)))
+            )
+        with self._lock, self._get_connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS {} ({})".format(
+                    self._quote(dataset), ", ".join(definitions)
+                )
+            )
+            self._tables.add(dataset)
+
+    def _table_exists(self, dataset):
+        if dataset in self._tables:
+            return True
+        row = (
+            self._get_connection()
+            .execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                (dataset,),
+            )
+            .fetchone()
+        )
+        return row is not None
+
+    @classmethod
+    def _to_sql_value(cls, value):
+        if isinstance(value, (pd.Timestamp, np.datetime64)):
+            return pd.Timestamp(value).strftime(cls.DATE_FORMAT)
+        if isinstance(value, np.generic):
+            return value.item()
+        return value
+
+    @classmethod
+    def _to_records(cls, data):
+        data = data.copy()
+        for column in data.columns:
+            if pd.api.types.is_datetime64_any_dtype(data[column]):
+                data[column] = data[column].dt.strftime(cls.DATE_FORMAT)
+        data = data.astype(object)
+        data = data.where(data.notna(), None)
+        return [
+            tuple(cls._to_sql_value(value) for value in row)
+            for row in data.itertuples(index=False, name=None)
+        ]
+
+    def _append(self, dataset, data):
+        data = self._select_columns(data, dataset)
+        if data.empty:
+            return
+        self._create_table(dataset)
+        with self._get_connection() as connection:
+            self._insert(connection, dataset, data)
+
+    def _overwrite(self, dataset, data, filters):
+        data = self._select_columns(data, dataset)
+        self._create_table(dataset)
+        where_clause, parameters = self._get_where_clause(filters)
+        with self._get_connection() as connection:
+            connection.execute(
+                "DELETE FROM {}{}".format(self._quote(dataset), where_clause),
+                parameters,
+            )
+            if not data.empty:
+                self._insert(connection, dataset, data)
+
+    def _insert(self, connection, dataset, data):
+        columns = list(data.columns)
+        statement = "INSERT INTO {} ({}) VALUES ({})".format(
+            self._quote(dataset),
+            ", ".join(map(self._quote, columns)),
+            ", ".join("?" * len(columns)),
+        )
+        primary_key = self.primary_keys.get(dataset)
+        if primary_key:
+            updates = [column for column in columns if column not in primary_key]
+            statement += " ON CONFLICT ({}) DO {}".format(
+                ", ".join(map(self._quote, primary_key)),
+                "UPDATE SET {}".format(
+                    ", ".join(
+                        f"{self._quote(column)} = excluded.{self._quote(column)}"
+                        for column in updates
+                    )
+                )
+                if updates
+                else "NOTHING",
+            )
+        connection.executemany(statement, self._to_records(data))
+
+    def _get_where_clause(self, filters):
+        conditions = []
+        parameters = []
+        for column, op, value in filters or []:
+            try:
+                sql_op = SQL_OPERATORS[op]
+            except KeyError:
+                raise ValueError(f"Unsupported filter ({column}, {op}, {value}).")
+            if op in ("in", "not in"):
+                values = [self._to_sql_value(item) for item in value]
+                conditions.append(
+                    "{} {} ({})".format(
+                        self._quote(column), sql_op, ", ".join("?" * len(values))
+                    )
+                )
+                parameters.extend(values)
+            else:
+                conditions.append(f"{self._quote(column)} {sql_op} ?")
+                parameters.append(self._to_sql_value(value))
+        if not conditions:
+            return "", parameters
+        return " WHERE " + " AND ".join(conditions), parameters
+
+    def _select(self, dataset, filters, columns):
+        where_clause, parameters = self._get_where_clause(filters)
+        return self._get_connection().execute(
+            "SELECT {} FROM {}{}".format(
+                ", ".join(map(self._quote, columns)),
+                self._quote(dataset),
+                where_clause,
+            ),
+            parameters,
+        )
+
+    def _read(self, dataset, filters, columns):
+        if not self._table_exists(dataset):
+            return self._apply_dtypes(pd.DataFrame(columns=columns), dataset)
+        cursor = self._select(dataset, filters, columns)
+        return self._to_frame(cursor.fetchall(), dataset, columns)
+
+    def _iter_read(self, dataset, filters, columns, chunksize):
+        if not self._table_exists(dataset):
+            return
+        cursor = self._select(dataset, filters, columns)
+        try:
+            while True:
+                rows = cursor.fetchmany(chunksize)
+                if not rows:
+                    break
+                yield self._to_frame(rows, dataset, columns)
+        finally:
+            cursor.close()
+
+    def _to_frame(self, rows, dataset, columns):
+        data = pd.DataFrame(rows, columns=columns)
+        for column in self.STR_COLUMNS:
+            if column in data.columns:
+                data[column] = data[column].astype(str)
+        for column in self.DATE_COLUMNS:
+            if column in data.columns:
+                data[column] = pd.to_datetime(data[column])
+        return self._apply_dtypes(data, dataset)
+
+    def contains(self, dataset: str, filters: list) -> bool:
+        """
+        Checks whether a dataset has any row matching ``filters``, using the
+        primary key index when the filters cover its leading columns.
+
+        :param dataset: The dataset name.
+        :type dataset: str
+        :param filters: The row filters.
+        :type filters: list
+        :return: True if a matching row exists.
+        :rtype: bool
+        """
+        if dataset in self.dimensions:
+            return super().contains(dataset, filters)
+        if not self._table_exists(dataset):
+            return False
+        where_clause, parameters = self._get_where_clause(filters)
+        row = (
+            self._get_connection()
+            .execute(
+                "SELECT 1 FROM {}{} LIMIT 1".format(self._quote(dataset), where_clause),
+                parameters,
+            )
+            .fetchone()
+        )
+        return row is not None
@@ -1,11 +1,31 @@
+import os
 import re
+import asyncio
 import requests
 import concurrent
+import numpy as np
 import pandas as pd
-from finops.config import TICKERS_URL, USER_AGENT, PRICE_HISTORY_DATA_COLUMNS
+from finops.config import (
+    TICKERS_URL,
+    USER_AGENT,
+    PRICE_HISTORY_DATA_COLUMNS,
+    PRICE_HISTORY_DATASET,
+    SHAREHOLDER_DATA_COLUMNS,
+    PRICE_HISTORY_REVISION_WINDOW,
+)
 from finops.utils.scraper import Scraper
+from finops.utils.writer import BatchWriter
+from finops.utils.scrape_state import ScrapeState
 from finops.utils.preprocessor import Preprocessor
 from finops.ticker import Ticker
+from finops.logger import logger
+
+
+class _PriceHistorySync:
+    def __init__(self, high_water_marks, windows):
+        self.high_water_marks = high_water_marks
+        self.windows = windows
+        self.revised = {}
 
 
 class TehranStockExchange(Scraper, Preprocessor):
@@ -16,9 +36,10 @@ class TehranStockExchange(Scraper, Preprocessor):
         :return: The tickers data.
         :rtype: pd.DataFrame
         """
-        response = self._download(TICKERS_URL, user_agent=USER_AGENT)
-        parsed_response = self._parse_html_response(response)
-        tickers_df = self._preprocess_tickers_page(parsed_response)
+        tickers_rows = self._download_and_parse(
+            TICKERS_URL, self._parse_tickers_page_response, user_agent=USER_AGENT
+        )
+        tickers_df = self._preprocess_tickers_page(tickers_rows)
         return tickers_df
 
     def get_stock_tickers(self) -> pd.DataFrame:
@@ -43,28 +64,193 @@ class TehranStockExchange(Scraper, Preprocessor):
         tickers_index_list = stock_tickers_df.ticker_index.tolist()
         return tickers_index_list
 
-    def get_price_histories(self, store_path, tickers_index_list=None):
+    @staticmethod
+    def _is_price_history_revised(price_history, stored_price_history) -> bool:
+        """
+        Checks whether the downloaded rows up to the last stored date differ
+        from the stored rows, e.g. after the history was adjusted.
+
+        :param price_history: The downloaded rows up to the last stored date.
+        :type price_history: pd.DataFrame
+        :param stored_price_history: The stored rows of the same ticker.
+        :type stored_price_history: pd.DataFrame
+        :return: True if a row was added, removed or changed.
+        :rtype: bool
+        """
+        if len(price_history) != len(stored_price_history):
+            return True
+        price_history = price_history.sort_values("date", ignore_index=True)
+        stored_price_history = stored_price_history.sort_values(
+            "date", ignore_index=True
+        )
+        for column in PRICE_HISTORY_DATA_COLUMNS:
+            values = price_history[column]
+            stored_values = stored_price_history[column]
+            is_numeric = pd.api.types.is_numeric_dtype(values)
+            if is_numeric and pd.api.types.is_numeric_dtype(stored_values):
+                is_equal = np.allclose(
+                    values.to_numpy(dtype="float64"),
+                    stored_values.to_numpy(dtype="float64"),
+                    equal_nan=True,
+                )
+            elif pd.api.types.is_datetime64_any_dtype(values):
+                is_equal = (values.to_numpy() == stored_values.to_numpy()).all()
+            else:
+                values = values.astype(str).to_numpy()
+                is_equal = (values == stored_values.astype(str).to_numpy()).all()
+            if not is_equal:
+                return True
+        return False
+
+    def _start_price_history_sync(self, store, tickers_index_list):
+        """
+        Reads the last stored date of the tickers and their stored rows of the
+        revision window before it, with two reads of the store for all
+        tickers.
+
+        :param store: The store of the price histories.
+        :type store: finops.store.Store
+        :param tickers_index_list: List of ticker indices.
+        :type tickers_index_list: list
+        :return: The state of the sync.
+        :rtype: _PriceHistorySync
+        """
+        if isinstance(store, (str, os.PathLike)):
+            raise ValueError(
+                "Incremental price history sync needs a finops.store.Store, "
+                "e.g. CsvStore or ParquetStore."
+            )
+        filters = [("ticker_index", "in", list(tickers_index_list))]
+        stored_dates = store.read(
+            PRICE_HISTORY_DATASET, filters=filters, columns=["ticker_index", "date"]
+        )
+        if stored_dates.empty:
+            return _PriceHistorySync({}, {})
+        high_water_marks = stored_dates.groupby("ticker_index", observed=True)[
+            "date"
+        ].max()
+        window = pd.Timedelta(days=PRICE_HISTORY_REVISION_WINDOW)
+        stored_rows = store.read(
+            PRICE_HISTORY_DATASET,
+            filters=[
+                ("ticker_index", "in", high_water_marks.index.tolist()),
+                ("date", ">=", high_water_marks.min() - window),
+            ],
+        )
+        windows = {
+            ticker_index: rows[rows.date >= high_water_marks[ticker_index] - window]
+            for ticker_index, rows in stored_rows.groupby("ticker_index", observed=True)
+        }
+        return _PriceHistorySync(high_water_marks.to_dict(), windows)
+
+    def _sync_price_history(self, price_history, store, ticker_index, sync) -> int:
+        """
+        Stores the rows of a price history newer than the last stored date of
+        the ticker. If the downloaded rows of the revision window before that
+        date differ from the stored ones, the ticker is kept to be rewritten
+        when the sync finishes.
+
+        :param price_history: The downloaded price history.
+        :type price_history: pd.DataFrame
+        :param store: The store of the price histories.
+        :type store: finops.store.Store
+        :param ticker_index: The ticker index.
+        :type ticker_index: str
+        :param sync: The state of the sync.
+        :type sync: _PriceHistorySync
+        :return: The number of rows written.
+        :rtype: int
+        """
+        high_water_mark = sync.high_water_marks.get(ticker_index)
+        if high_water_mark is None:
+            store.append(PRICE_HISTORY_DATASET, price_history)
+            return len(price_history)
+        is_new = price_history.date > high_water_mark
+        window_start = high_water_mark - pd.Timedelta(
+            days=PRICE_HISTORY_REVISION_WINDOW
+        )
+        in_window = ~is_new & (price_history.date >= window_start)
+        stored_window = sync.windows.get(ticker_index, price_history.iloc[:0])
+        if self._is_price_history_revised(price_history[in_window], stored_window):
+            logger.info(f"price history of {ticker_index} was revised, rewriting it.")
+            sync.revised[ticker_index] = price_history
+            return len(price_history)
+        store.append(PRICE_HISTORY_DATASET, price_history[is_new])
+        return int(is_new.sum())
+
+    @staticmethod
+    def _finish_price_history_sync(store, sync):
+        """
+        Rewrites the revised tickers with one overwrite of the store.
+
+        :param store: The store of the price histories.
+        :type store: finops.store.Store
+        :param sync: The state of the sync.
+        :type sync: _PriceHistorySync
+        """
+        if not sync.revised:
+            return
+        store.overwrite(
+            PRICE_HISTORY_DATASET,
+            pd.concat(sync.revised.values(), ignore_index=True),
+            [("ticker_index", "in", list(sync.revised))],
+        )
+
+    def _store_price_history(
+        self, price_history, store_path, ticker_index, sync
+    ) -> int:
+        if sync is None:
+            self._save(price_history, store_path, PRICE_HISTORY_DATASET)
+            return len(price_history)
+        return self._sync_price_history(price_history, store_path, ticker_index, sync)
+
+    def get_price_histories(
+        self, store_path, tickers_index_list=None, incremental: bool = False
+    ) -> dict:
         """
         Retrieves and stores the price history for multiple tickers.
 
+        In incremental mode only the rows newer than the last stored date of
+        each ticker are appended, and the tickers whose rows of the
+        ``finops.config.PRICE_HISTORY_REVISION_WINDOW`` days before that date
+        were revised are rewritten together at the end.
+
         :param tickers_index_list: List of ticker indices.
         :type tickers_index_list: list
-        :param store_path: The path to store the price history.
-        :type store_path: str
+        :param store_path: The path or store to store the price history.
+        :type store_path: str or finops.store.Store
+        :param incremental: Flag to store only new and revised rows, requires a store.
+        :type incremental: bool
+        :return: The number of rows written per ticker index.
+        :rtype: dict
         """
         if tickers_index_list is None:
             tickers_index_list = self.get_stock_tickers_index_list()
-        price_history = self._load_or_create_csv(store_path, PRICE_HISTORY_DATA_COLUMNS)
+        self._prepare_target(store_path, PRICE_HISTORY_DATA_COLUMNS)
+        sync = None
+        if incremental:
+            sync = self._start_price_history_sync(store_path, tickers_index_list)
+        n_rows = {}
         for ticker_index in tickers_index_list:
-            self._save_csv(Ticker(ticker_index).get_price_history(), store_path)
+            n_rows[ticker_index] = self._store_price_history(
+                Ticker(ticker_index).get_price_history(),
+                store_path,
+                ticker_index,
+                sync,
+            )
+        if sync is not None:
+            self._finish_price_history_sync(store_path, sync)
+        return n_rows
 
     def _get_shareholder_data_wrapper(
         self,
         ticker_index: str,
         start_date: pd.Timestamp,
         end_date: pd.Timestamp,
-        store_path: str,
-        log_path: str,
+        store_path,
+        log_path,
+        writer: BatchWriter = None,
+        scrape_state: ScrapeState = None,
     ):
         """
         Helper method to get shareholder data for a specific ticker in a separate thread.
@@ -75,21 +261,25 @@ class TehranStockExchange(Scraper, Preprocessor):
         :type start_date: pd.Timestamp
         :param end_date: The end date.
         :type end_date: pd.Timestamp
-        :param store_path: The path to store the shareholder data.
-        :type store_path: str
-        :param log_path: The path to store the log data.
-        :type log_path: str
+        :param store_path: The path or store to store the shareholder data.
+        :type store_path: str or finops.store.Store
+        :param log_path: The path or store to store the log data.
+        :type log_path: str or finops.store.Store
+        :param writer: Writer saving the data and log.
+        :type writer: finops.utils.writer.BatchWriter, optional
+        :param scrape_state: The scraped dates shared by the run.
+        :type scrape_state: finops.utils.scrape_state.ScrapeState, optional
         """
-        Ticker(ticker_index).get_shareholder_data(
-            start_date, end_date, store_path, log_path
+        Ticker(ticker_index, scrape_state=scrape_state).get_shareholder_data(
+            start_date, end_date, store_path, log_path, writer=writer
         )
 
     def get_shareholders_data(
         self,
         start_date: pd.Timestamp,
         end_date: pd.Timestamp,
-        store_path: str,
-        log_path: str,
+        store_path,
+        log_path,
         tickers_index_list: list = None,
         n_threads: int = 1,
     ):
@@ -100,10 +290,10 @@ class TehranStockExchange(Scraper, Preprocessor):
         :type start_date: pd.Timestamp
         :param end_date: The end date.
         :type end_date: pd.Timestamp
-        :param store_path: The path to store the shareholder data.
-        :type store_path: str
-        :param log_path: The path to store the log data.
-        :type log_path: str
+        :param store_path: The path or store to store the shareholder data.
+        :type store_path: str or finops.store.Store
+        :param log_path: The path or store to store the log data.
+        :type log_path: str or finops.store.Store
         :param tickers_index_list: List of ticker indices. If not provided, stock tickers will be used.
         :type tickers_index_list: list, optional
         :param n_threads: The number of threads to use for concurrent execution.
@@ -111,7 +301,12 @@ class TehranStockExchange(Scraper, Preprocessor):
         """
         if tickers_index_list is None:
             tickers_index_list = self.get_stock_tickers_index_list()
-        with concurrent.futures.ThreadPoolExecutor(max_workers=n_threads) as executor:
+        self.session_pool.ensure_pool_size(n_threads)
+        self._prepare_target(store_path, SHAREHOLDER_DATA_COLUMNS)
+        scrape_state = self._load_scrape_state(log_path)
+        with BatchWriter() as writer, concurrent.futures.ThreadPoolExecutor(
+            max_workers=n_threads
+        ) as executor:
             futures = [
                 executor.submit(
                     self._get_shareholder_data_wrapper,
@@ -120,7 +315,128 @@ class TehranStockExchange(Scraper, Preprocessor):
                     end_date,
                     store_path,
                     log_path,
+                    writer,
+                    scrape_state,
                 )
                 for ticker_index in tickers_index_list
             ]
             concurrent.futures.wait(futures)
+
+
+class AsyncTehranStockExchange(TehranStockExchange):
+    def __init__(self, max_concurrency: int = 32, *args, **kwargs):
+        """
+        Initialize an AsyncTehranStockExchange object.
+
+        Bulk downloads are scheduled on an asyncio event loop, but each one
+        still runs the blocking ``requests`` call, the rate limiter and the
+        retry waits in a thread of a pool of ``max_concurrency`` threads, so
+        concurrency is bounded by that pool. Downloads share the single-flight
+        and the price history memo of the synchronous path.
+
+        :param max_concurrency: The maximum number of concurrent requests.
+        :type max_concurrency: int
+        """
+        super().__init__(*args, **kwargs)
+        self.max_concurrency = max_concurrency
+
+    def _create_executor(self):
+        self.session_pool.ensure_pool_size(self.max_concurrency)
+        return concurrent.futures.ThreadPoolExecutor(max_workers=self.max_concurrency)
+
+    async def aget_price_histories(
+        self, store_path, tickers_index_list=None, incremental: bool = False
+    ) -> dict:
+        """
+        Asynchronous counterpart of :meth:`get_price_histories`.
+
+        :param store_path: The path or store to store the price history.
+        :type store_path: str or finops.store.Store
+        :param tickers_index_list: List of ticker indices.
+        :type tickers_index_list: list
+        :param incremental: Flag to store only new and revised rows, requires a store.
+        :type incremental: bool
+        :return: The number of rows written per ticker index.
+        :rtype: dict
+        """
+        if tickers_index_list is None:
+            tickers_index_list = self.get_stock_tickers_index_list()
+        self._prepare_target(store_path, PRICE_HISTORY_DATA_COLUMNS)
+        sync = None
+        if incremental:
+            sync = self._start_price_history_sync(store_path, tickers_index_list)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def get_price_history(ticker_index):
+            price_history = await Ticker(ticker_index).aget_price_history(
+                semaphore=semaphore, executor=executor
+            )
+            return ticker_index, price_history
+
+        n_rows = {}
+        with self._create_executor() as executor:
+            price_histories = [
+                get_price_history(ticker_index) for ticker_index in tickers_index_list
+            ]
+            for price_history in asyncio.as_completed(price_histories):
+                ticker_index, price_history = await price_history
+                n_rows[ticker_index] = self._store_price_history(
+                    price_history, store_path, ticker_index, sync
+                )
+        if sync is not None:
+            self._finish_price_history_sync(store_path, sync)
+        return n_rows
+
+    async def aget_shareholders_data(
+        self,
+        start_date: pd.Timestamp,
+        end_date: pd.Timestamp,
+        store_path,
+        log_path,
+        tickers_index_list: list = None,
+    ):
+        """
+        Asynchronous counterpart of :meth:`get_shareholders_data`.
+
+        :param start_date: The start date.
+        :type start_date: pd.Timestamp
+        :param end_date: The end date.
+        :type end_date: pd.Timestamp
+        :param store_path: The path or store to store the shareholder data.
+        :type store_path: str or finops.store.Store
+        :param log_path: The path or store to store the log data.
+        :type log_path: str or finops.store.Store
+        :param tickers_index_list: List of ticker indices. If not provided, stock tickers will be used.
+        :type tickers_index_list: list, optional
+        :raises Exception: The first failure of a ticker, once every ticker
+            finished; each failure is logged with its ticker index.
+        """
+        if tickers_index_list is None:
+            tickers_index_list = self.get_stock_tickers_index_list()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._prepare_target(store_path, SHAREHOLDER_DATA_COLUMNS)
+        scrape_state = self._load_scrape_state(log_path)
+        with self._create_executor() as executor:
+            results = await asyncio.gather(
+                *[
+                    Ticker(
+                        ticker_index, scrape_state=scrape_state
+                    ).aget_shareholder_data(
+                        start_date,
+                        end_date,
+                        store_path,
+                        log_path,
+                        semaphore=semaphore,
+                        executor=executor,
+                    )
+                    for ticker_index in tickers_index_list
+                ],
+                return_exceptions=True,
+            )
+        errors = []
+        for ticker_index, result in zip(tickers_index_list, results):
+            if isinstance(result, Exception):
+                logger.error(f"failed to get {ticker_index} shareholder data: {result}")
+                errors.append(result)
+        if errors:
+            raise errors[0]
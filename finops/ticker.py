@@ -1,48 +1,104 @@
+import os
+import asyncio
 import pandas as pd
 from finops.config import (
     PRICE_HISTORY_URL,
     SHAREHOLDER_URL,
     SHAREHOLDER_DATA_COLUMNS,
     PRICE_HISTORY_DATA_COLUMNS,
-    LOG_COLUMNS,
     USER_AGENT,
     PRICE_HISTORY_FIELD_MAP,
     SHAREHOLDER_FIELD_MAP,
+    CACHE_FOREVER,
+    RECENT_SHAREHOLDER_CACHE_TTL,
+    PRICE_HISTORY_MEMO_TTL,
+    PRICE_HISTORY_MEMO_SIZE,
+    SHAREHOLDER_DATASET,
 )
 from finops.utils.wrappers import catch
+from finops.utils.single_flight import Memo
+from finops.utils.writer import BatchWriter
+from finops.utils.scrape_state import ScrapeState
 from finops.logger import logger
 from finops.utils.scraper import Scraper
 from finops.utils.preprocessor import Preprocessor
 
 
+class _NullSemaphore:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
 class Ticker(Scraper, Preprocessor):
-    def __init__(self, ticker_index: str, *args, **kwargs):
+    price_history_memo = Memo(
+        ttl=PRICE_HISTORY_MEMO_TTL, maxsize=PRICE_HISTORY_MEMO_SIZE
+    )
+
+    def __init__(
+        self, ticker_index: str, *args, scrape_state: ScrapeState = None, **kwargs
+    ):
         """
         Initialize a Ticker object.
 
         :param ticker_index: The ticker index.
         :type ticker_index: str
+        :param scrape_state: The scraped dates shared by a run, by default the log is read.
+        :type scrape_state: finops.utils.scrape_state.ScrapeState, optional
         """
         super().__init__(*args, **kwargs)
         self.ticker_index = ticker_index
+        self.scrape_state = scrape_state
 
     def get_price_history(self, timeout: float = None) -> pd.DataFrame:
         """
         Retrieves the price history for the ticker.
 
+        :param timeout: Timeout value for the download request.
+        :type timeout: float
+        :return: The price history data.
+        :rtype: pd.DataFrame
+        """
+        return self._get_memoized_price_history(timeout).copy()
+
+    def _download_price_history(self, timeout: float = None) -> pd.DataFrame:
+        """
+        Downloads and preprocesses the price history for the ticker.
+
         :param timeout: Timeout value for the download request.
         :type timeout: float
         :return: The price history data.
         :rtype: pd.DataFrame
         """
         url = PRICE_HISTORY_URL.format(ticker_index=self.ticker_index)
-        response = self._download(url, user_agent=USER_AGENT, timeout=timeout)
-        parsed_response = self._parse_csv_response(response)
+        parsed_response = self._download_and_parse(
+            url,
+            self._parse_price_history_response,
+            user_agent=USER_AGENT,
+            timeout=timeout,
+        )
         preprocessed_price_history_data = self._preprocess_price_history_data(
             parsed_response, self.ticker_index
         )
         return preprocessed_price_history_data
 
+    def _get_memoized_price_history(self, timeout: float = None) -> pd.DataFrame:
+        """
+        Retrieves the price history shared by every caller within the memo lifetime.
+
+        The returned frame must not be modified.
+
+        :param timeout: Timeout value for the download request.
+        :type timeout: float
+        :return: The price history data.
+        :rtype: pd.DataFrame
+        """
+        return self.price_history_memo.get(
+            self.ticker_index, self._download_price_history, timeout
+        )
+
     def get_traded_dates(self) -> list:
         """
         Retrieves the traded dates for the ticker.
@@ -50,9 +106,66 @@ class Ticker(Scraper, Preprocessor):
         :return: List of traded dates.
         :rtype: list
         """
-        price_history = self.get_price_history()
+        price_history = self._get_memoized_price_history()
         return price_history.date.tolist()
 
+    async def aget_price_history(
+        self, timeout: float = None, semaphore: asyncio.Semaphore = None, executor=None
+    ) -> pd.DataFrame:
+        """
+        Asynchronous counterpart of :meth:`get_price_history`.
+
+        :param timeout: Timeout value for the download request.
+        :type timeout: float
+        :param semaphore: Semaphore bounding the number of concurrent requests.
+        :type semaphore: asyncio.Semaphore, optional
+        :param executor: Executor running the blocking download.
+        :type executor: concurrent.futures.Executor, optional
+        :return: The price history data.
+        :rtype: pd.DataFrame
+        """
+        async with semaphore or _NullSemaphore():
+            price_history = await self._run_in_executor(
+                executor, self._get_memoized_price_history, timeout
+            )
+        return price_history.copy()
+
+    async def aget_traded_dates(
+        self, semaphore: asyncio.Semaphore = None, executor=None
+    ) -> list:
+        """
+        Asynchronous counterpart of :meth:`get_traded_dates`.
+
+        :param semaphore: Semaphore bounding the number of concurrent requests.
+        :type semaphore: asyncio.Semaphore, optional
+        :param executor: Executor running the blocking download.
+        :type executor: concurrent.futures.Executor, optional
+        :return: List of traded dates.
+        :rtype: list
+        """
+        price_history = await self.aget_price_history(
+            semaphore=semaphore, executor=executor
+        )
+        return price_history.date.tolist()
+
+    @staticmethod
+    def _get_shareholder_cache_ttl(date: pd.Timestamp) -> float:
+        """
+        Returns the cache time-to-live of a shareholder snapshot.
+
+        Snapshots of past dates never change and are cached forever, while
+        the most recent ones may still be updated.
+
+        :param date: The date of the snapshot.
+        :type date: pd.Timestamp
+        :return: The time-to-live in seconds.
+        :rtype: float
+        """
+        recent_date = pd.Timestamp.now().normalize() - pd.Timedelta(days=1)
+        if pd.Timestamp(date).normalize() < recent_date:
+            return CACHE_FOREVER
+        return RECENT_SHAREHOLDER_CACHE_TTL
+
     @catch
     def _get_shareholder_data_one_day(self, date: pd.Timestamp) -> pd.DataFrame:
         """
@@ -66,20 +179,110 @@ class Ticker(Scraper, Preprocessor):
         url = SHAREHOLDER_URL.format(
             ticker_index=self.ticker_index, date=date.strftime("%Y%m%d")
         )
-        response = self._download(url, user_agent=USER_AGENT)
-        parsed_response = self._parse_json_response(response)
+        parsed_response = self._download_and_parse(
+            url,
+            self._parse_json_response,
+            user_agent=USER_AGENT,
+            cache_ttl=self._get_shareholder_cache_ttl(date),
+        )
+        preprocessed_shareholder_data = self._preprocess_shareholder_data(
+            parsed_response, date, self.ticker_index
+        )
+        return preprocessed_shareholder_data
+
+    async def _aget_shareholder_data_one_day(
+        self, date: pd.Timestamp, semaphore: asyncio.Semaphore = None, executor=None
+    ) -> pd.DataFrame:
+        """
+        Asynchronous counterpart of :meth:`_get_shareholder_data_one_day`.
+
+        :param date: The date for which to retrieve the shareholder data.
+        :type date: pd.Timestamp
+        :param semaphore: Semaphore bounding the number of concurrent requests.
+        :type semaphore: asyncio.Semaphore, optional
+        :param executor: Executor running the blocking download.
+        :type executor: concurrent.futures.Executor, optional
+        :return: The preprocessed shareholder data.
+        :rtype: pd.DataFrame
+        """
+        url = SHAREHOLDER_URL.format(
+            ticker_index=self.ticker_index, date=date.strftime("%Y%m%d")
+        )
+        async with semaphore or _NullSemaphore():
+            parsed_response = await self._adownload_and_parse(
+                url,
+                self._parse_json_response,
+                user_agent=USER_AGENT,
+                cache_ttl=self._get_shareholder_cache_ttl(date),
+                executor=executor,
+            )
         preprocessed_shareholder_data = self._preprocess_shareholder_data(
             parsed_response, date, self.ticker_index
         )
         return preprocessed_shareholder_data
 
+    def _get_not_scraped_dates(
+        self,
+        traded_dates: list,
+        start_date: pd.Timestamp,
+        end_date: pd.Timestamp,
+        store_path,
+        log_path,
+    ) -> list:
+        """
+        Selects the traded dates in range that are not in the log yet.
+
+        :param traded_dates: The traded dates of the ticker.
+        :type traded_dates: list
+        :param start_date: The start date of the date range.
+        :type start_date: pd.Timestamp
+        :param end_date: The end date of the date range.
+        :type end_date: pd.Timestamp
+        :param store_path: The path or store to store the shareholder data.
+        :type store_path: str or finops.store.Store
+        :param log_path: The path or store to store the log data.
+        :type log_path: str or finops.store.Store
+        :return: The dates to scrape.
+        :rtype: list
+        """
+        self._prepare_target(store_path, SHAREHOLDER_DATA_COLUMNS)
+        filtered_dates = self._filter_dates_range(traded_dates, start_date, end_date)
+        if self.scrape_state is not None:
+            scraped_dates = self.scrape_state.get_scraped_dates(self.ticker_index)
+        else:
+            scraped_dates = self._load_scraped_dates(log_path, self.ticker_index)
+        not_scraped_dates = self._filter_scraped_dates(filtered_dates, scraped_dates)
+        return not_scraped_dates
+
+    @staticmethod
+    def _select_stored_columns(data, store_path):
+        """
+        Selects the shareholder columns kept by a CSV file; stores select the
+        columns of their datasets themselves.
+
+        :param data: The preprocessed shareholder data.
+        :type data: pd.DataFrame
+        :param store_path: The path or store to store the shareholder data.
+        :type store_path: str or finops.store.Store
+        :return: The shareholder data to store.
+        :rtype: pd.DataFrame
+        """
+        if isinstance(store_path, (str, os.PathLike)):
+            return data[SHAREHOLDER_DATA_COLUMNS]
+        return data
+
+    def _mark_scraped(self, date):
+        if self.scrape_state is not None:
+            self.scrape_state.add(self.ticker_index, date)
+
     def get_shareholder_data(
         self,
         start_date: pd.Timestamp,
         end_date: pd.Timestamp,
-        store_path: str,
-        log_path: str,
+        store_path,
+        log_path,
         verbose: bool = False,
+        writer: BatchWriter = None,
     ):
         """
         Retrieves and stores the shareholder data for a range of dates.
@@ -88,29 +291,105 @@ class Ticker(Scraper, Preprocessor):
         :type start_date: pd.Timestamp
         :param end_date: The end date of the date range.
         :type end_date: pd.Timestamp
-        :param store_path: The path to store the shareholder data.
-        :type store_path: str
-        :param log_path: The path to store the log data.
-        :type log_path: str
+        :param store_path: The path or store to store the shareholder data.
+        :type store_path: str or finops.store.Store
+        :param log_path: The path or store to store the log data.
+        :type log_path: str or finops.store.Store
         :param verbose: Flag to enable verbose logging.
         :type verbose: bool
+        :param writer: Writer saving the data and log, by default they are saved in place.
+        :type writer: finops.utils.writer.BatchWriter, optional
         """
-        log = self._load_or_create_csv(
-            log_path, LOG_COLUMNS, parse_dates=["date"], dtype={"id": str}
-        )
-        data = self._load_or_create_csv(store_path, SHAREHOLDER_DATA_COLUMNS)
         traded_dates = self.get_traded_dates()
-        scraped_dates = self._get_scraped_dates(log, self.ticker_index)
-        not_scraped_dates = self._filter_scraped_dates(traded_dates, scraped_dates)
-        filtered_dates = self._filter_dates_range(
-            not_scraped_dates, start_date, end_date
+        filtered_dates = self._get_not_scraped_dates(
+            traded_dates, start_date, end_date, store_path, log_path
         )
         for date in filtered_dates:
             preprocessed_shareholder_data = self._get_shareholder_data_one_day(date)
-            self._save_csv(
-                preprocessed_shareholder_data,
+            if preprocessed_shareholder_data is None:
+                continue
+            preprocessed_shareholder_data = self._select_stored_columns(
+                preprocessed_shareholder_data, store_path
+            )
+            if writer is not None:
+                writer.write(
+                    preprocessed_shareholder_data,
+                    store_path,
+                    SHAREHOLDER_DATASET,
+                    log_path=log_path,
+                    id=self.ticker_index,
+                    date=date,
+                )
+            else:
+                self._save(
+                    preprocessed_shareholder_data,
+                    store_path,
+                    SHAREHOLDER_DATASET,
+                )
+                self._save_log(log_path=log_path, id=self.ticker_index, date=date)
+            self._mark_scraped(date)
+            if verbose:
+                logger.info(f"scraped {self.ticker_index} shareholder data for {date}.")
+
+    async def aget_shareholder_data(
+        self,
+        start_date: pd.Timestamp,
+        end_date: pd.Timestamp,
+        store_path,
+        log_path,
+        verbose: bool = False,
+        semaphore: asyncio.Semaphore = None,
+        executor=None,
+    ):
+        """
+        Asynchronous counterpart of :meth:`get_shareholder_data`.
+
+        Days are downloaded concurrently, bounded by ``semaphore``, and stored
+        in the same CSV layout as the synchronous path. A day whose download
+        fails is neither stored nor logged, so the next run retries it.
+
+        :param start_date: The start date of the date range.
+        :type start_date: pd.Timestamp
+        :param end_date: The end date of the date range.
+        :type end_date: pd.Timestamp
+        :param store_path: The path or store to store the shareholder data.
+        :type store_path: str or finops.store.Store
+        :param log_path: The path or store to store the log data.
+        :type log_path: str or finops.store.Store
+        :param verbose: Flag to enable verbose logging.
+        :type verbose: bool
+        :param semaphore: Semaphore bounding the number of concurrent requests.
+        :type semaphore: asyncio.Semaphore, optional
+        :param executor: Executor running the blocking downloads.
+        :type executor: concurrent.futures.Executor, optional
+        """
+        traded_dates = await self.aget_traded_dates(
+            semaphore=semaphore, executor=executor
+        )
+        filtered_dates = self._get_not_scraped_dates(
+            traded_dates, start_date, end_date, store_path, log_path
+        )
+
+        async def scrap_date(date):
+            try:
+                preprocessed_shareholder_data = (
+                    await self._aget_shareholder_data_one_day(
+                        date, semaphore=semaphore, executor=executor
+                    )
+                )
+            except Exception as e:
+                logger.error(
+                    f"failed to scrap {self.ticker_index} shareholder data for {date}: {e}"
+                )
+                return
+            self._save(
+                self._select_stored_columns(preprocessed_shareholder_data, store_path),
                 store_path,
+                SHAREHOLDER_DATASET,
             )
             self._save_log(log_path=log_path, id=self.ticker_index, date=date)
+            self._mark_scraped(date)
             if verbose:
                 logger.info(f"scraped {self.ticker_index} shareholder data for {date}.")
+
+        await asyncio.gather(*[scrap_date(date) for date in filtered_dates])
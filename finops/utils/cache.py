@@ -0,0 +1,297 @@
+import os
+import json
+import time
+import hashlib
+import threading
+import collections
+import requests
+from finops.config import CACHE_TTLS, CACHE_MAX_SIZE, CACHE_FOREVER
+
+
+class ResponseCache:
+    """
+    Persistent on-disk cache of HTTP responses.
+
+    Bodies are content-addressed: they are stored once under the SHA-256 of
+    their bytes in ``objects/`` and shared by every URL returning the same
+    payload. Each cached URL has a small JSON entry in ``entries/`` holding
+    the body key, the time it was stored, its time-to-live and the
+    ``ETag``/``Last-Modified`` validators used to revalidate stale entries.
+    Entries are evicted in least recently used order once the bodies exceed
+    ``max_size`` bytes.
+    """
+
+    def __init__(self, cache_dir: str, max_size: int = CACHE_MAX_SIZE, ttls: dict = None):
+        """
+        Initialize a ResponseCache object.
+
+        :param cache_dir: The directory holding the cache.
+        :type cache_dir: str
+        :param max_size: The maximum total size of cached bodies, in bytes.
+        :type max_size: int
+        :param ttls: Mapping of URL template to time-to-live in seconds.
+        :type ttls: dict, optional
+        """
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self._ttl_prefixes = sorted(
+            ((url.split("{")[0], ttl) for url, ttl in (ttls or CACHE_TTLS).items()),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+        self._entries_dir = os.path.join(cache_dir, "entries")
+        self._objects_dir = os.path.join(cache_dir, "objects")
+        os.makedirs(self._entries_dir, exist_ok=True)
+        os.makedirs(self._objects_dir, exist_ok=True)
+        self._entries = collections.OrderedDict()
+        self._refs = collections.Counter()
+        self._sizes = {}
+        self.size = 0
+        self._stats = collections.Counter()
+        self._lock = threading.Lock()
+        self._load_index()
+
+    @staticmethod
+    def _hash(data):
+        return hashlib.sha256(data).hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self._entries_dir, key[:2], key + ".json")
+
+    def _object_path(self, body_key):
+        return os.path.join(self._objects_dir, body_key[:2], body_key)
+
+    @staticmethod
+    def _write_atomic(path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _load_index(self):
+        entries = []
+        for directory, _, files in os.walk(self._entries_dir):
+            for file in files:
+                if not file.endswith(".json"):
+                    continue
+                path = os.path.join(directory, file)
+                try:
+                    with open(path, encoding="utf8") as f:
+                        entry = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                entries.append((os.path.getmtime(path), file[: -len(".json")], entry))
+        for _, key, entry in sorted(entries, key=lambda item: item[0]):
+            body_key = entry["body_key"]
+            if body_key not in self._sizes:
+                object_path = self._object_path(body_key)
+                if not os.path.isfile(object_path):
+                    continue
+                self._sizes[body_key] = os.path.getsize(object_path)
+                self.size += self._sizes[body_key]
+            self._refs[body_key] += 1
+            self._entries[key] = entry
+
+    def get_ttl(self, url: str):
+        """
+        Returns the configured time-to-live of a URL.
+
+        :param url: The URL.
+        :type url: str
+        :return: The time-to-live in seconds, or None if the URL is not cacheable.
+        :rtype: float
+        """
+        for prefix, ttl in self._ttl_prefixes:
+            if url.startswith(prefix):
+                return ttl
+        return None
+
+    def get(self, url: str):
+        """
+        Returns the cached entry of a URL and marks it as recently used.
+
+        :param url: The URL.
+        :type url: str
+        :return: The entry, or None on a miss.
+        :rtype: dict
+        """
+        key = self._hash(url.encode("utf8"))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is not None:
+            try:
+                os.utime(self._entry_path(key))
+            except OSError:
+                pass
+        return entry
+
+    @staticmethod
+    def is_fresh(entry: dict) -> bool:
+        """
+        Checks whether an entry can be served without revalidation.
+
+        :param entry: The cache entry.
+        :type entry: dict
+        :return: True if the entry has not expired.
+        :rtype: bool
+        """
+        if entry["ttl"] is None:
+            return True
+        return time.time() - entry["stored_at"] < entry["ttl"]
+
+    @staticmethod
+    def get_validators(entry: dict) -> dict:
+        """
+        Returns the conditional request headers revalidating an entry.
+
+        :param entry: The cache entry.
+        :type entry: dict
+        :return: The ``If-None-Match``/``If-Modified-Since`` headers.
+        :rtype: dict
+        """
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def load(self, url: str, entry: dict, stat: str = "hits"):
+        """
+        Builds a response from a cached entry.
+
+        :param url: The URL.
+        :type url: str
+        :param entry: The cache entry.
+        :type entry: dict
+        :param stat: The counter incremented by this lookup.
+        :type stat: str
+        :return: The cached response, or None if its body is missing.
+        :rtype: requests.Response
+        """
+        try:
+            with open(self._object_path(entry["body_key"]), "rb") as f:
+                content = f.read()
+        except OSError:
+            return None
+        response = requests.Response()
+        response._content = content
+        response.status_code = entry["status_code"]
+        response.headers.update(entry["headers"])
+        response.encoding = entry["encoding"]
+        response.url = url
+        with self._lock:
+            self._stats[stat] += 1
+        return response
+
+    def record_miss(self):
+        """
+        Counts a lookup that had to be downloaded.
+        """
+        with self._lock:
+            self._stats["misses"] += 1
+
+    def put(self, url: str, response: requests.Response, ttl=CACHE_FOREVER):
+        """
+        Stores a response.
+
+        :param url: The URL.
+        :type url: str
+        :param response: The response to store.
+        :type response: requests.Response
+        :param ttl: The time-to-live in seconds; ``CACHE_FOREVER`` never expires.
+        :type ttl: float
+        """
+        content = response.content
+        body_key = self._hash(content)
+        key = self._hash(url.encode("utf8"))
+        entry = {
+            "url": url,
+            "body_key": body_key,
+            "stored_at": time.time(),
+            "ttl": None if ttl == CACHE_FOREVER else ttl,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "status_code": response.status_code,
+            "headers": {
+                name: response.headers[name]
+                for name in ("Content-Type",)
+                if name in response.headers
+            },
+            "encoding": response.encoding,
+        }
+        with self._lock:
+            if body_key not in self._sizes:
+                self._write_atomic(self._object_path(body_key), content)
+                self._sizes[body_key] = len(content)
+                self.size += len(content)
+            self._write_atomic(
+                self._entry_path(key), json.dumps(entry).encode("utf8")
+            )
+            old_entry = self._entries.pop(key, None)
+            self._entries[key] = entry
+            self._refs[body_key] += 1
+            if old_entry is not None:
+                self._release(old_entry["body_key"])
+            self._stats["stores"] += 1
+            self._evict()
+
+    def touch(self, url: str, entry: dict):
+        """
+        Marks a revalidated entry as fresh again.
+
+        :param url: The URL.
+        :type url: str
+        :param entry: The cache entry.
+        :type entry: dict
+        """
+        key = self._hash(url.encode("utf8"))
+        entry = dict(entry, stored_at=time.time())
+        with self._lock:
+            self._write_atomic(
+                self._entry_path(key), json.dumps(entry).encode("utf8")
+            )
+            if key in self._entries:
+                self._entries[key] = entry
+
+    def _release(self, body_key):
+        self._refs[body_key] -= 1
+        if self._refs[body_key] > 0:
+            return
+        del self._refs[body_key]
+        self.size -= self._sizes.pop(body_key)
+        try:
+            os.remove(self._object_path(body_key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        while self.size > self.max_size and len(self._entries) > 1:
+            key, entry = self._entries.popitem(last=False)
+            try:
+                os.remove(self._entry_path(key))
+            except OSError:
+                pass
+            self._release(entry["body_key"])
+            self._stats["evictions"] += 1
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters.
+
+        :return: Hits, revalidations, misses, stores, evictions, entries and size.
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                "hits": self._stats["hits"],
+                "revalidations": self._stats["revalidations"],
+                "misses": self._stats["misses"],
+                "stores": self._stats["stores"],
+                "evictions": self._stats["evictions"],
+                "entries": len(self._entries),
+                "size": self.size,
+            }
@@ -0,0 +1,86 @@
+import re
+import json
+from finops.utils.html_table import extract_table_rows
+
+# Dynamic statements are rendered in the browser from a JSON literal assigned
+# in a script of the letter page, static statements are server-side tables
+DATASOURCE_PATTERN = re.compile(r"\bvar\s+datasource\s*=\s*")
+STATIC_STATEMENT_CLASS = "table_wrapper"
+HEADER_CELL_GROUP = "Header"
+
+
+def extract_datasource(html: str) -> dict:
+    """
+    Extracts the JSON datasource of a dynamic Codal statement from the
+    letter page.
+
+    :param html: The letter page.
+    :type html: str
+    :return: The datasource, None if the page has none.
+    :rtype: dict
+    """
+    match = DATASOURCE_PATTERN.search(html)
+    if match is None:
+        return None
+    try:
+        datasource, _ = json.JSONDecoder().raw_decode(html, match.end())
+    except json.JSONDecodeError:
+        return None
+    return datasource if isinstance(datasource, dict) else None
+
+
+def _get_cell_text(cell):
+    value = cell.get("value")
+    return None if value is None else str(value)
+
+
+def get_datasource_rows(datasource: dict) -> list:
+    """
+    Lays out the cells of the first sheet of a statement datasource as the
+    statement page renders them: one row per ``rowSequence`` of each table,
+    one cell per ``columnSequence``. Header cells are skipped, as header
+    rows hold no ``td`` cells in the rendered table.
+
+    :param datasource: The datasource, see :func:`extract_datasource`.
+    :type datasource: dict
+    :return: The cells of each row, None if the datasource has no table.
+    :rtype: list
+    """
+    sheets = datasource.get("sheets") or []
+    tables = (sheets[0].get("tables") or []) if sheets else []
+    if not tables:
+        return None
+    rows = []
+    for table in tables:
+        table_rows = {}
+        for cell in table.get("cells") or []:
+            if cell.get("cellGroupName") == HEADER_CELL_GROUP:
+                continue
+            table_rows.setdefault(cell.get("rowSequence", 0), []).append(cell)
+        for row_sequence in sorted(table_rows):
+            cells = sorted(
+                table_rows[row_sequence], key=lambda cell: cell.get("columnSequence", 0)
+            )
+            rows.append([_get_cell_text(cell) for cell in cells])
+    return rows
+
+
+def extract_statement_rows(html: str) -> list:
+    """
+    Extracts the cells of the statement of a Codal letter page without a
+    browser: from the JSON datasource of a dynamic statement, or from the
+    rows of the static statement table.
+
+    :param html: The letter page.
+    :type html: str
+    :return: The cells of each row, None if the page holds neither.
+    :rtype: list
+    """
+    datasource = extract_datasource(html)
+    if datasource is not None:
+        return get_datasource_rows(datasource)
+    try:
+        rows = extract_table_rows(html, table_class=STATIC_STATEMENT_CLASS, tag=None)
+    except ValueError:
+        return None
+    return rows or None
@@ -1,13 +1,33 @@
 import io
 import os
 import json
-import requests
+import asyncio
+import functools
 import pandas as pd
 from bs4 import BeautifulSoup
-from finops.config import USER_AGENT
+
+try:
+    import pyarrow
+    import pyarrow.csv
+except ImportError:
+    pyarrow = None
+from finops.config import USER_AGENT, CACHE_MAX_SIZE, PRICE_HISTORY_DTYPES
+from finops.utils.cache import ResponseCache
+from finops.utils.html_table import extract_table_rows, rows_to_frame
+from finops.utils.codal_statement import extract_statement_rows
+from finops.utils.session import session_pool
+from finops.utils.rate_limiter import rate_limiter
+from finops.utils.retry_policy import retry_policy
+from finops.utils.single_flight import SingleFlight
 
 
 class Downloader:
+    session_pool = session_pool
+    rate_limiter = rate_limiter
+    retry_policy = retry_policy
+    response_cache = None
+    single_flight = SingleFlight()
+
     @staticmethod
     def _create_csv_file(path, columns):
         if os.path.isfile(path):
@@ -22,16 +42,131 @@ class Downloader:
                 os.makedirs(directory, exist_ok=True)
             pd.DataFrame(columns=columns).to_csv(path, index=False)
 
-    @staticmethod
-    def _download(url, user_agent=USER_AGENT, timeout=None):
-        response = requests.get(
+    @classmethod
+    def enable_cache(cls, cache_dir, max_size=CACHE_MAX_SIZE):
+        """
+        Enables the on-disk response cache for every downloader.
+
+        :param cache_dir: The directory holding the cache.
+        :type cache_dir: str
+        :param max_size: The maximum total size of cached bodies, in bytes.
+        :type max_size: int
+        :return: The response cache.
+        :rtype: ResponseCache
+        """
+        Downloader.response_cache = ResponseCache(cache_dir, max_size=max_size)
+        return Downloader.response_cache
+
+    @classmethod
+    def disable_cache(cls):
+        """
+        Disables the on-disk response cache.
+        """
+        Downloader.response_cache = None
+
+    @classmethod
+    def _request(cls, url, user_agent=USER_AGENT, timeout=None, headers=None):
+        session = cls.session_pool.get_session(url)
+        cls.rate_limiter.acquire(url)
+        response = session.get(
             url,
-            headers={"user-agent": user_agent},
+            headers={"user-agent": user_agent, **(headers or {})},
             timeout=timeout,
         )
         response.raise_for_status()
         return response
 
+    @classmethod
+    def _download(cls, url, user_agent=USER_AGENT, timeout=None, cache_ttl=None):
+        return cls.single_flight.do(
+            url,
+            cls._download_once,
+            url,
+            user_agent=user_agent,
+            timeout=timeout,
+            cache_ttl=cache_ttl,
+        )
+
+    @classmethod
+    def _download_and_parse(
+        cls, url, parse_func, user_agent=USER_AGENT, timeout=None, cache_ttl=None
+    ):
+        def download_and_parse():
+            response = cls._download(
+                url, user_agent=user_agent, timeout=timeout, cache_ttl=cache_ttl
+            )
+            return parse_func(response)
+
+        return cls.single_flight.do((url, parse_func), download_and_parse)
+
+    @classmethod
+    def _download_once(cls, url, user_agent=USER_AGENT, timeout=None, cache_ttl=None):
+        cache = cls.response_cache
+        if cache is None:
+            return cls.retry_policy.call(
+                cls._request, url, user_agent=user_agent, timeout=timeout, key=url
+            )
+        if cache_ttl is None:
+            cache_ttl = cache.get_ttl(url)
+        entry = cache.get(url) if cache_ttl is not None else None
+        if entry is not None and cache.is_fresh(entry):
+            cached_response = cache.load(url, entry)
+            if cached_response is not None:
+                return cached_response
+            entry = None
+        response = cls.retry_policy.call(
+            cls._request,
+            url,
+            user_agent=user_agent,
+            timeout=timeout,
+            headers=cache.get_validators(entry) if entry is not None else None,
+            key=url,
+        )
+        if response.status_code == 304 and entry is not None:
+            cache.touch(url, entry)
+            cached_response = cache.load(url, entry, stat="revalidations")
+            if cached_response is not None:
+                return cached_response
+            response = cls.retry_policy.call(
+                cls._request, url, user_agent=user_agent, timeout=timeout, key=url
+            )
+        if cache_ttl is not None:
+            cache.record_miss()
+            cache.put(url, response, ttl=cache_ttl)
+        return response
+
+    @staticmethod
+    async def _run_in_executor(executor, func, *args, **kwargs):
+        """
+        Runs a blocking call in a worker thread of ``executor``, the default
+        executor of the running loop if None. The thread is held for the
+        whole call, including rate limiter and retry waits.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, functools.partial(func, *args, **kwargs)
+        )
+
+    @classmethod
+    async def _adownload_and_parse(
+        cls,
+        url,
+        parse_func,
+        user_agent=USER_AGENT,
+        timeout=None,
+        cache_ttl=None,
+        executor=None,
+    ):
+        return await cls._run_in_executor(
+            executor,
+            cls._download_and_parse,
+            url,
+            parse_func,
+            user_agent=user_agent,
+            timeout=timeout,
+            cache_ttl=cache_ttl,
+        )
+
     @staticmethod
     def _parse_json_response(response):
         return json.loads(response.content.decode("utf8"))
@@ -40,10 +175,64 @@ class Downloader:
     def _parse_csv_response(response):
         return pd.read_csv(io.StringIO(response.content.decode("utf8")))
 
+    @staticmethod
+    def _parse_price_history_response(response):
+        """
+        Parses a price history CSV straight from the response bytes.
+
+        Columns are read with the explicit ``PRICE_HISTORY_DTYPES`` schema, so
+        no type inference or intermediate str copy of the body is needed, and
+        ``<PER>`` is never materialized. The multithreaded Arrow reader is
+        used when pyarrow is installed.
+        """
+        columns = list(PRICE_HISTORY_DTYPES)
+        if pyarrow is None:
+            return pd.read_csv(
+                io.BytesIO(response.content),
+                usecols=columns,
+                dtype=PRICE_HISTORY_DTYPES,
+            )[columns]
+        table = pyarrow.csv.read_csv(
+            pyarrow.py_buffer(response.content),
+            convert_options=pyarrow.csv.ConvertOptions(
+                column_types={
+                    column: pyarrow.string()
+                    if dtype == "str"
+                    else pyarrow.from_numpy_dtype(dtype)
+                    for column, dtype in PRICE_HISTORY_DTYPES.items()
+                },
+                include_columns=columns,
+            ),
+        )
+        return table.to_pandas()
+
     @staticmethod
     def _parse_html_response(response):
         return BeautifulSoup(response.text, "html.parser")
-    
+
+    @staticmethod
+    def _parse_tickers_page_response(response):
+        """
+        Parses the rows of the tickers table of the TSETMC tickers page.
+
+        Only ``table.table1`` is read, with lxml when it is installed, and
+        the link of each row is appended to its cells, see
+        :func:`finops.utils.html_table.extract_table_rows`.
+        """
+        return extract_table_rows(response.text, table_class="table1", links=True)
+
+    @staticmethod
+    def _parse_codal_statement_response(response):
+        """
+        Parses the statement of a Codal letter page into the cells of its rows,
+        see :func:`finops.utils.codal_statement.extract_statement_rows`.
+
+        :return: The statement table, None if the page holds no statement.
+        :rtype: pd.DataFrame
+        """
+        rows = extract_statement_rows(response.text)
+        return None if rows is None else rows_to_frame(rows)
+
     @staticmethod
     def _load_csv(path, **kwargs):
         return pd.read_csv(path, **kwargs)
@@ -55,3 +244,15 @@ class Downloader:
     @staticmethod
     def _save_csv(data, path):
         data.to_csv(path, index=False, mode="a", header=False)
+
+    @classmethod
+    def _prepare_target(cls, target, columns):
+        if isinstance(target, (str, os.PathLike)):
+            cls._create_csv_file(target, columns=columns)
+
+    @classmethod
+    def _save(cls, data, target, dataset):
+        if isinstance(target, (str, os.PathLike)):
+            cls._save_csv(data, target)
+        else:
+            target.append(dataset, data)
@@ -0,0 +1,266 @@
+import time
+import threading
+import contextlib
+import collections
+from finops.config import DRIVER_MAX_PAGES, DRIVER_MAX_MEMORY_GROWTH
+from finops.logger import logger
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+class _PooledDriver:
+    def __init__(self, driver, memory):
+        self.driver = driver
+        self.base_memory = memory
+        self.n_pages = 0
+        self.leased_at = None
+
+
+class DriverPool:
+    """
+    Thread-safe pool of WebDriver instances shared by concurrent scrapers.
+
+    Drivers are started on demand, up to ``max_size``, and an idle driver is
+    health-checked before it is handed out; a driver whose browser died is
+    quit and replaced. The holder of a lease reports the pages it loaded when
+    it gives the driver back, see :meth:`release`. A driver is quit once it
+    loaded ``max_pages`` pages, or once its browser processes grew by more
+    than ``max_memory_growth`` bytes since it started, and the next lease
+    starts a fresh one. Memory is only measured when ``psutil`` is
+    installed.
+    Drivers still leased when the pool is closed are quit on release.
+    """
+
+    def __init__(
+        self,
+        create_driver,
+        max_size: int,
+        max_pages: int = DRIVER_MAX_PAGES,
+        max_memory_growth: int = DRIVER_MAX_MEMORY_GROWTH,
+    ):
+        """
+        Initialize a DriverPool object.
+
+        :param create_driver: Function starting a new driver.
+        :type create_driver: callable
+        :param max_size: The maximum number of drivers.
+        :type max_size: int
+        :param max_pages: The number of page loads after which a driver is recycled.
+        :type max_pages: int
+        :param max_memory_growth: The memory growth in bytes after which a driver is recycled.
+        :type max_memory_growth: int
+        """
+        self.create_driver = create_driver
+        self.max_size = max_size
+        self.max_pages = max_pages
+        self.max_memory_growth = max_memory_growth
+        self._idle = []
+        self._leased = {}
+        self._n_drivers = 0
+        self._closed = False
+        self._opened_at = time.monotonic()
+        self._stats = collections.Counter()
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def _get_memory(driver):
+        """
+        Measures the resident memory of the driver and its browser processes.
+
+        :param driver: The driver.
+        :return: The memory in bytes, None if it cannot be measured.
+        :rtype: int
+        """
+        process = getattr(getattr(driver, "service", None), "process", None)
+        if psutil is None or process is None:
+            return None
+        try:
+            root = psutil.Process(process.pid)
+            processes = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return None
+        memory = 0
+        for child in processes:
+            try:
+                memory += child.memory_info().rss
+            except psutil.Error:
+                continue
+        return memory
+
+    @staticmethod
+    def _is_healthy(driver):
+        try:
+            driver.current_url
+        except Exception:
+            return False
+        return True
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"failed to quit a web driver: {e}")
+
+    def _start(self):
+        driver = self.create_driver()
+        with self._lock:
+            self._stats["started"] += 1
+        return _PooledDriver(driver, self._get_memory(driver))
+
+    def _should_recycle(self, pooled):
+        if pooled.n_pages >= self.max_pages:
+            return True
+        if pooled.base_memory is None:
+            return False
+        memory = self._get_memory(pooled.driver)
+        return (
+            memory is not None and memory - pooled.base_memory > self.max_memory_growth
+        )
+
+    def _discard(self, pooled):
+        self._quit(pooled.driver)
+        with self._lock:
+            self._n_drivers -= 1
+            self._stats["quit"] += 1
+            self._available.notify()
+
+    def acquire(self, timeout: float = None):
+        """
+        Leases a healthy driver, starting one if fewer than ``max_size`` are running.
+
+        :param timeout: The maximum number of seconds to wait for a driver.
+        :type timeout: float, optional
+        :return: The driver, to be given back with :meth:`release`.
+        :raises ValueError: If the pool is closed.
+        :raises TimeoutError: If no driver became available in time.
+        """
+        started_at = time.monotonic()
+        deadline = None if timeout is None else started_at + timeout
+        while True:
+            with self._lock:
+                while True:
+                    if self._closed:
+                        raise ValueError("the driver pool is closed")
+                    if self._idle or self._n_drivers < self.max_size:
+                        break
+                    remaining = (
+                        None if deadline is None else deadline - time.monotonic()
+                    )
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError("no web driver became available")
+                    self._available.wait(remaining)
+                pooled = self._idle.pop() if self._idle else None
+                if pooled is None:
+                    self._n_drivers += 1
+            if pooled is None:
+                try:
+                    pooled = self._start()
+                except Exception:
+                    with self._lock:
+                        self._n_drivers -= 1
+                        self._available.notify()
+                    raise
+            elif not self._is_healthy(pooled.driver):
+                with self._lock:
+                    self._stats["unhealthy"] += 1
+                self._discard(pooled)
+                continue
+            with self._lock:
+                pooled.leased_at = time.monotonic()
+                self._leased[id(pooled.driver)] = pooled
+                self._stats["leases"] += 1
+                self._stats["wait_time"] += pooled.leased_at - started_at
+            return pooled.driver
+
+    def release(self, driver, n_pages: int = 1):
+        """
+        Gives back a leased driver, recycling it when it is worn out.
+
+        :param driver: The driver returned by :meth:`acquire`.
+        :param n_pages: The number of pages the driver loaded during the lease.
+        :type n_pages: int
+        """
+        with self._lock:
+            pooled = self._leased.pop(id(driver))
+            pooled.n_pages += n_pages
+            self._stats["pages"] += n_pages
+            self._stats["busy_time"] += time.monotonic() - pooled.leased_at
+        if self._should_recycle(pooled):
+            with self._lock:
+                self._stats["recycled"] += 1
+            self._discard(pooled)
+            return
+        with self._lock:
+            closed = self._closed
+            if not closed:
+                self._idle.append(pooled)
+                self._available.notify()
+        if closed:
+            self._discard(pooled)
+
+    @contextlib.contextmanager
+    def lease(self, timeout: float = None):
+        """
+        Leases a driver for the duration of a ``with`` block that loads one
+        page; the driver is given back even if the block raises.
+
+        :param timeout: The maximum number of seconds to wait for a driver.
+        :type timeout: float, optional
+        """
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self):
+        """
+        Quits the idle drivers; leased drivers are quit when they are released.
+        """
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._available.notify_all()
+        for pooled in idle:
+            self._discard(pooled)
+
+    def stats(self) -> dict:
+        """
+        Returns the pool counters.
+
+        :return: Started, quit, recycled and unhealthy drivers, leases, pages
+            loaded, running, leased and idle drivers, seconds spent waiting for
+            and using drivers, and the share of the pool capacity spent using
+            drivers.
+        :rtype: dict
+        """
+        with self._lock:
+            elapsed = time.monotonic() - self._opened_at
+            return {
+                "started": self._stats["started"],
+                "quit": self._stats["quit"],
+                "recycled": self._stats["recycled"],
+                "unhealthy": self._stats["unhealthy"],
+                "leases": self._stats["leases"],
+                "pages": self._stats["pages"],
+                "running": self._n_drivers,
+                "in_use": len(self._leased),
+                "idle": len(self._idle),
+                "wait_time": self._stats["wait_time"],
+                "busy_time": self._stats["busy_time"],
+                "utilization": (
+                    self._stats["busy_time"] / (self.max_size * elapsed)
+                    if elapsed > 0
+                    else 0.0
+                ),
+            }
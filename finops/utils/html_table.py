@@ -0,0 +1,130 @@
+import itertools
+import pandas as pd
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml.etree
+    import lxml.html
+except ImportError:
+    lxml = None
+
+
+def _has_class(element, table_class):
+    return table_class in (element.get("class") or "").split()
+
+
+def _get_missing_element_error(table_class, tag):
+    return ValueError(
+        f"No {tag or 'element'} with class {table_class} in the document."
+    )
+
+
+def _extract_rows_lxml(html, table_class, links, tag):
+    root = lxml.html.fromstring(html)
+    if table_class is None:
+        rows = root.iter("tr")
+    else:
+        table = next(
+            (
+                table
+                for table in root.iter(tag or lxml.etree.Element)
+                if _has_class(table, table_class)
+            ),
+            None,
+        )
+        if table is None:
+            raise _get_missing_element_error(table_class, tag)
+        rows = table.iter("tr")
+    extracted_rows = []
+    for row in rows:
+        cells = list(row.iter("td"))
+        extracted_row = [cell.text_content() for cell in cells]
+        if links and cells:
+            link = next(row.iter("a"), None)
+            extracted_row.append(None if link is None else link.get("href"))
+        extracted_rows.append(extracted_row)
+    return extracted_rows
+
+
+def _extract_rows_bs4(html, table_class, links, tag):
+    if table_class is None:
+        parsed_html = BeautifulSoup(html, "html.parser")
+        rows = parsed_html.find_all("tr")
+    else:
+        parsed_html = BeautifulSoup(
+            html, "html.parser", parse_only=SoupStrainer(tag, {"class": table_class})
+        )
+        table = parsed_html.find(tag, {"class": table_class})
+        if table is None:
+            raise _get_missing_element_error(table_class, tag)
+        rows = table.find_all("tr")
+    extracted_rows = []
+    for row in rows:
+        cells = row.find_all("td")
+        extracted_row = [cell.text for cell in cells]
+        if links and cells:
+            link = row.find("a")
+            extracted_row.append(None if link is None else link.get("href"))
+        extracted_rows.append(extracted_row)
+    return extracted_rows
+
+
+def extract_table_rows(
+    html: str, table_class: str = None, links: bool = False, tag: str = "table"
+) -> list:
+    """
+    Extracts the text of the ``td`` cells of every ``tr`` row of an HTML
+    document or fragment.
+
+    The document is parsed with lxml when it is installed and with the
+    pure-Python parser of BeautifulSoup otherwise. When ``table_class`` is
+    given only the rows of the first ``tag`` element with that class are
+    read, and the fallback parser builds nothing but the elements with that
+    class.
+
+    :param html: The HTML document or fragment.
+    :type html: str
+    :param table_class: The class of the table to read, all rows by default.
+    :type table_class: str, optional
+    :param links: Whether to append the ``href`` of the first link of each
+        row to its cells, None if the row has no link.
+    :type links: bool
+    :param tag: The tag of the element with the class ``table_class``, any
+        tag if None.
+    :type tag: str, optional
+    :return: The cells of each row, an empty list for rows without cells.
+    :rtype: list
+    :raises ValueError: If no ``tag`` element has the class ``table_class``.
+    """
+    if not html.strip():
+        if table_class is not None:
+            raise _get_missing_element_error(table_class, tag)
+        return []
+    if lxml is None:
+        return _extract_rows_bs4(html, table_class, links, tag)
+    return _extract_rows_lxml(html, table_class, links, tag)
+
+
+def rows_to_frame(rows: list, columns: list = None) -> pd.DataFrame:
+    """
+    Builds a DataFrame from table rows column by column.
+
+    Rows shorter than the longest row are padded with missing values, as
+    ``pd.DataFrame(rows)`` does, without building the row-wise object array
+    first.
+
+    :param rows: The cells of each row, e.g. from :func:`extract_table_rows`.
+    :type rows: list
+    :param columns: The column names, ``0, 1, ...`` by default.
+    :type columns: list, optional
+    :return: The table.
+    :rtype: pd.DataFrame
+    """
+    values = list(itertools.zip_longest(*rows))
+    if columns is None:
+        columns = range(len(values))
+    return pd.DataFrame(
+        {column: list(value) for column, value in zip(columns, values)},
+        index=pd.RangeIndex(len(rows)),
+        columns=columns,
+    )
@@ -0,0 +1,193 @@
+import re
+import functools
+import numpy as np
+import pandas as pd
+from finops.config import NORMALIZER_CACHE_SIZE, NORMALIZER_CACHE_MAX_LENGTH
+
+# Translation tables of single characters, applied with str.replace: for
+# Persian text str.translate looks every character up in a dict and is an
+# order of magnitude slower than one replace pass per mapped character
+PERSIAN_TRANSLATION = (("ي", "ی"), ("ك", "ک"), ("أ", "ا")) + tuple(
+    (chr(ord("۰") + digit), str(digit)) for digit in range(10)
+)
+TICKER_NAME_TRANSLATION = PERSIAN_TRANSLATION + (("\u200c", ""),)
+CODAL_TEXT_TRANSLATION = PERSIAN_TRANSLATION + ((",", ""),)
+# Statement titles are folded into lookup keys: letter variants are unified
+# and joiners, marks and dashes dropped, spaces are removed separately
+TITLE_KEY_TRANSLATION = PERSIAN_TRANSLATION + (
+    ("ى", "ی"),
+    ("ئ", "ی"),
+    ("إ", "ا"),
+    ("آ", "ا"),
+    ("ؤ", "و"),
+    ("ۀ", "ه"),
+    ("ة", "ه"),
+    ("\u200c", ""),
+    ("\u200d", ""),
+    ("\u200e", ""),
+    ("\u200f", ""),
+    ("ـ", ""),
+    ("-", ""),
+    ("\u2010", ""),
+    ("\u2013", ""),
+    ("\u2014", ""),
+)
+
+# Codal cells of a table are normalized at once by joining them with a
+# separator none of the steps can match across
+CODAL_TEXT_SEPARATOR = "\x00"
+CODAL_ZWNJ_PATTERN = re.compile("\u200c+")
+CODAL_CONTROL_PATTERN = re.compile("[\n\t\r]")
+CODAL_NEGATIVE_NUMBER_PATTERN = re.compile(r"\((\d+)\)")
+CODAL_SPACES_PATTERN = re.compile(" +")
+
+
+def translate(text: str, translation: tuple) -> str:
+    """
+    Applies a translation table of ``(character, replacement)`` pairs.
+
+    :param text: The text.
+    :type text: str
+    :param translation: The translation table, e.g. ``PERSIAN_TRANSLATION``.
+    :type translation: tuple
+    :return: The translated text.
+    :rtype: str
+    """
+    for character, replacement in translation:
+        text = text.replace(character, replacement)
+    return text
+
+
+def _memoize(normalize):
+    """
+    Wraps a text normalizer with a bounded LRU cache of its short inputs and
+    passes None through.
+    """
+    cached_normalize = functools.lru_cache(maxsize=NORMALIZER_CACHE_SIZE)(normalize)
+
+    @functools.wraps(normalize)
+    def wrapper(text):
+        if text is None:
+            return None
+        if len(text) > NORMALIZER_CACHE_MAX_LENGTH:
+            return normalize(text)
+        return cached_normalize(text)
+
+    wrapper.cache_info = cached_normalize.cache_info
+    wrapper.cache_clear = cached_normalize.cache_clear
+    return wrapper
+
+
+@_memoize
+def normalize_persian_text(text: str) -> str:
+    """
+    Replaces Arabic letters with their Persian forms and Persian digits with
+    ASCII digits.
+
+    :param text: The text.
+    :type text: str
+    :return: The normalized text.
+    :rtype: str
+    """
+    return translate(text, PERSIAN_TRANSLATION)
+
+
+@_memoize
+def normalize_ticker_name(text: str) -> str:
+    """
+    Normalizes a ticker name like :func:`normalize_persian_text` and removes
+    zero-width non-joiners.
+
+    :param text: The ticker name.
+    :type text: str
+    :return: The normalized ticker name.
+    :rtype: str
+    """
+    return translate(text, TICKER_NAME_TRANSLATION)
+
+
+def _negate_number(match):
+    return "-" + match[1]
+
+
+def _normalize_codal_text(text):
+    text = translate(text, CODAL_TEXT_TRANSLATION)
+    text = text.replace("--", "")
+    text = CODAL_ZWNJ_PATTERN.sub("\u200c", text)
+    text = CODAL_CONTROL_PATTERN.sub("", text)
+    text = CODAL_NEGATIVE_NUMBER_PATTERN.sub(_negate_number, text)
+    return CODAL_SPACES_PATTERN.sub(" ", text)
+
+
+@_memoize
+def normalize_codal_text(text: str) -> str:
+    """
+    Normalizes a Codal table cell like :func:`normalize_persian_text`, removes
+    thousands separators, ``--`` and line breaks, turns ``(123)`` into
+    ``-123`` and collapses repeated spaces and zero-width non-joiners.
+
+    :param text: The cell text.
+    :type text: str
+    :return: The normalized text, None if it is empty.
+    :rtype: str
+    """
+    return _normalize_codal_text(text).strip() or None
+
+
+def normalize_codal_texts(values: list) -> list:
+    """
+    Normalizes many Codal cells at once, see :func:`normalize_codal_text`.
+
+    The string cells are joined into one text, normalized with one pass of
+    each replacement and pattern, and split back. Cells that are
+    not strings are missing and become None.
+
+    :param values: The cells.
+    :type values: list
+    :return: The normalized cells.
+    :rtype: list
+    """
+    is_text = [isinstance(value, str) for value in values]
+    texts = [value for value, text in zip(values, is_text) if text]
+    text = CODAL_TEXT_SEPARATOR.join(texts)
+    if text.count(CODAL_TEXT_SEPARATOR) >= len(texts):
+        return [
+            normalize_codal_text(value) if text else None
+            for value, text in zip(values, is_text)
+        ]
+    texts = iter(_normalize_codal_text(text).split(CODAL_TEXT_SEPARATOR))
+    return [next(texts).strip() or None if text else None for text in is_text]
+
+
+@_memoize
+def normalize_title_key(text: str) -> str:
+    """
+    Folds a statement title into a lookup key, so spelling variants of a title
+    share one key: Arabic letter forms are unified, and whitespace, zero-width
+    characters and dashes are removed.
+
+    :param text: The title.
+    :type text: str
+    :return: The key.
+    :rtype: str
+    """
+    return "".join(translate(text, TITLE_KEY_TRANSLATION).split())
+
+
+def normalize_series(series: pd.Series, normalize=normalize_persian_text) -> pd.Series:
+    """
+    Normalizes every value of a Series, calling ``normalize`` once per
+    distinct value.
+
+    :param series: The Series.
+    :type series: pd.Series
+    :param normalize: The normalizer, :func:`normalize_persian_text` by default.
+    :type normalize: Callable[[str], str]
+    :return: The normalized values, with None for missing values.
+    :rtype: pd.Series
+    """
+    codes, uniques = pd.factorize(series)
+    values = np.empty(len(uniques) + 1, dtype=object)
+    values[:-1] = [normalize(value) for value in uniques]
+    values[-1] = None
+    return pd.Series(values[codes], index=series.index, name=series.name, dtype=object)
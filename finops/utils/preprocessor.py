@@ -1,23 +1,42 @@
 import re
+import functools
+import numpy as np
 import pandas as pd
 import jdatetime
 from finops.config import (
     PRICE_HISTORY_URL,
     SHAREHOLDER_URL,
-    SHAREHOLDER_DATA_COLUMNS,
+    SHAREHOLDER_SNAPSHOT_COLUMNS,
     PRICE_HISTORY_DATA_COLUMNS,
     LOG_COLUMNS,
     USER_AGENT,
     PRICE_HISTORY_FIELD_MAP,
     SHAREHOLDER_FIELD_MAP,
-    BALANCE_SHEET_COLUMNS,
-    PNL_SHEET_COLUMNS,
-    CASH_FLOW_SHEET_COLUMNS,
-    BALANCE_SHEET_FIX_MISTAKE_MAP,
-    PNL_SHEET_FIX_MISTAKE_MAP,
-    CASH_FLOW_FIX_MISTAKE_MAP,
+    PRICE_HISTORY_DATA_DTYPES,
+    SHAREHOLDER_SNAPSHOT_DTYPES,
+    CODAL_LETTERS_LIST_COLUMNS,
+    CODAL_LETTERS_LIST_DTYPES,
+    BALANCE_SHEET_DTYPES,
+    PNL_SHEET_DTYPES,
+    CASH_FLOW_SHEET_DTYPES,
+    LETTER_TITLE_CACHE_SIZE,
+)
+from finops.utils.normalizer import (
+    normalize_persian_text,
+    normalize_ticker_name,
+    normalize_codal_text,
+    normalize_codal_texts,
+)
+from finops.utils.statement_schema import (
+    BALANCE_SHEET_SCHEMA,
+    PNL_SHEET_SCHEMA,
+    CASH_FLOW_SHEET_SCHEMA,
 )
 
+PERIOD_TYPE_PATTERN = re.compile("(سال مالی|میاندوره‌ای|میاندوره ای)")
+PERIOD_LENGTH_PATTERN = re.compile(r"\d+(?= ماهه)")
+PERIOD_END_DATE_PATTERN = re.compile(r"\d{4}/\d{2}/\d{2}")
+
 
 class Preprocessor:
     @staticmethod
@@ -37,36 +56,84 @@ class Preprocessor:
         else:
             return "undefined"
 
-    def _preprocess_tickers_page(self, parsed_response):
-        tickers_table = parsed_response.find("table", {"class": "table1"})
-        tickers = tickers_table.find_all("tr")
-        tickers_data = []
-        for ticker in tickers:
-            cells = ticker.find_all("td")
-            if cells:
-                ticker_url = cells[0].find("a")["href"]
-                data = {
-                    "name": self._preprocess_ticker_name(
-                        re.findall(r"\(([^()]+)\)", cells[0].text.strip())[0]
-                    ),
-                    "full_name": cells[0].text.strip().split("(")[0],
-                    "ticker_index": re.findall(r"(\d+)", ticker_url)[-1],
-                    "instrument_isin": cells[1].text.strip(),
-                    "en_name": cells[2].text.strip(),
-                    "code": cells[3].text.strip(),
-                    "company_isin": cells[4].text.strip(),
-                    "market": cells[5].text.strip(),
-                    "section": cells[6].text.strip(),
-                    "type": self._convert_isin_to_type(cells[1].text.strip()),
-                }
-                tickers_data.append(data)
-        return pd.DataFrame(tickers_data)
+    def _preprocess_tickers_page(self, tickers_rows):
+        """
+        Builds the tickers DataFrame from the rows of the tickers table.
+
+        :param tickers_rows: The cells of each row followed by the ticker
+            link, see ``Downloader._parse_tickers_page_response``.
+        :type tickers_rows: list
+        :return: The tickers data.
+        :rtype: pd.DataFrame
+        """
+        tickers_rows = [row for row in tickers_rows if row]
+        if not tickers_rows:
+            return pd.DataFrame()
+        cells = list(zip(*[[cell.strip() for cell in row[:7]] for row in tickers_rows]))
+        return pd.DataFrame(
+            {
+                "name": [
+                    self._preprocess_ticker_name(re.findall(r"\(([^()]+)\)", text)[0])
+                    for text in cells[0]
+                ],
+                "full_name": [text.split("(")[0] for text in cells[0]],
+                "ticker_index": [
+                    re.findall(r"(\d+)", row[-1])[-1] for row in tickers_rows
+                ],
+                "instrument_isin": list(cells[1]),
+                "en_name": list(cells[2]),
+                "code": list(cells[3]),
+                "company_isin": list(cells[4]),
+                "market": list(cells[5]),
+                "section": list(cells[6]),
+                "type": [self._convert_isin_to_type(isin) for isin in cells[1]],
+            }
+        )
+
+    @staticmethod
+    def _apply_dtypes(df, dtypes):
+        """
+        Casts the columns of a DataFrame to the dtypes of a schema.
+
+        Numeric columns are coerced first, so values that do not parse become
+        missing, and integer columns holding missing values are cast to the
+        nullable integer dtype of the same size.
+
+        :param df: The DataFrame.
+        :type df: pd.DataFrame
+        :param dtypes: Mapping of column to dtype, e.g. ``finops.config.DATASET_DTYPES``.
+        :type dtypes: dict
+        :return: The DataFrame with the schema applied.
+        :rtype: pd.DataFrame
+        """
+        columns = {}
+        for column, dtype in dtypes.items():
+            if column not in df.columns or df[column].dtype == dtype:
+                continue
+            values = df[column]
+            resolved = pd.api.types.pandas_dtype(dtype)
+            kind = resolved.kind
+            if kind in "iuf" and not pd.api.types.is_numeric_dtype(values):
+                values = pd.to_numeric(values, errors="coerce")
+            if kind in "iu" and isinstance(resolved, np.dtype) and values.isna().any():
+                prefix = "UInt" if kind == "u" else "Int"
+                dtype = f"{prefix}{resolved.itemsize * 8}"
+            columns[column] = values.astype(dtype)
+        if not columns:
+            return df
+        df = df.copy()
+        for column, values in columns.items():
+            df[column] = values
+        return df
 
     @staticmethod
     def _preprocess_shareholder_data(parsed_response, req_date, ticker_index):
         preprocessed_shareholder_data = parsed_response["shareShareholder"]
         if len(preprocessed_shareholder_data) == 0:
-            return pd.DataFrame(columns=SHAREHOLDER_DATA_COLUMNS)
+            return Preprocessor._apply_dtypes(
+                pd.DataFrame(columns=SHAREHOLDER_SNAPSHOT_COLUMNS),
+                SHAREHOLDER_SNAPSHOT_DTYPES,
+            )
         else:
             preprocessed_shareholder_data = (
                 pd.DataFrame(preprocessed_shareholder_data)
@@ -74,68 +141,62 @@ class Preprocessor:
                 .assign(ticker_index=ticker_index)
                 .assign(req_date=req_date)
                 .assign(date=lambda df: pd.to_datetime(df["date"], format="%Y%m%d"))
-                .drop(["change", "change_amount"], axis=1)
+                .loc[:, SHAREHOLDER_SNAPSHOT_COLUMNS]
+                .pipe(Preprocessor._apply_dtypes, SHAREHOLDER_SNAPSHOT_DTYPES)
             )
         return preprocessed_shareholder_data
 
+    @staticmethod
+    def _convert_int_to_date(dates):
+        return pd.to_datetime(
+            pd.DataFrame(
+                {"year": dates // 10000, "month": dates // 100 % 100, "day": dates % 100}
+            )
+        )
+
     @staticmethod
     def _preprocess_price_history_data(parsed_response, ticker_index):
         preprocessed_price_history = (
             parsed_response.rename(columns=PRICE_HISTORY_FIELD_MAP)
-            .drop("per", axis=1)
+            .drop("per", axis=1, errors="ignore")
             .assign(ticker_index=ticker_index)
-            .assign(date=lambda df: pd.to_datetime(df["date"], format="%Y%m%d"))
+            .assign(date=lambda df: Preprocessor._convert_int_to_date(df["date"]))
+            .pipe(Preprocessor._apply_dtypes, PRICE_HISTORY_DATA_DTYPES)
         )
         return preprocessed_price_history
 
     @staticmethod
     def _preprocess_persian_text(text):
-        if text is None:
-            return None
+        return normalize_persian_text(text)
 
-        text = text.replace("ي", "ی")
-        text = text.replace("ك", "ک")
-        text = text.replace("أ", "ا")
-
-        digits_mapping = {
-            "۰": "0",
-            "۱": "1",
-            "۲": "2",
-            "۳": "3",
-            "۴": "4",
-            "۵": "5",
-            "۶": "6",
-            "۷": "7",
-            "۸": "8",
-            "۹": "9",
-        }
-        for digit, replacement in digits_mapping.items():
-            text = text.replace(digit, replacement)
-        return text
+    @staticmethod
+    def _preprocess_ticker_name(ticker_name):
+        return normalize_ticker_name(ticker_name)
 
-    def _preprocess_ticker_name(self, ticker_name):
-        ticker_name = self._preprocess_persian_text(ticker_name)
-        if ticker_name is None:
-            return None
-        ticker_name = ticker_name.replace("\u200c", "")
-        return ticker_name
+    @staticmethod
+    def _preprocess_codal_text(text):
+        return normalize_codal_text(text)
 
-    def _preprocess_codal_text(self, text):
-        text = self._preprocess_persian_text(text)
-        if text is None:
-            return None
-        text = text.replace(",", "")
-        text = text.replace("--", "")
-        text = re.sub("\u200c+", "\u200c", text)
-        text = re.sub("[\n\t\r]", "", text)
-        text = re.sub(r"\((\d+)\)", r"-\1", text)
-        text = re.sub(" +", " ", text)
-        text = text.strip()
+    @staticmethod
+    def _preprocess_codal_texts(values):
+        return normalize_codal_texts(values)
 
-        if text == "":
-            return None
+    def _preprocess_codal_df(self, df):
+        """
+        Normalizes every cell of a Codal table, see :meth:`_preprocess_codal_text`.
 
-        return text
+        :param df: The table.
+        :type df: pd.DataFrame
+        :return: The normalized table, with None for empty cells.
+        :rtype: pd.DataFrame
+        """
+        values = self._preprocess_codal_texts(df.to_numpy(dtype=object).ravel().tolist())
+        return pd.DataFrame(
+            np.array(values, dtype=object).reshape(df.shape),
+            index=df.index,
+            columns=df.columns,
+            dtype=object,
+        )
 
     @staticmethod
     def safe_select_columns(df, columns):
@@ -147,122 +208,97 @@ class Preprocessor:
                 selected_columns.append(pd.Series(dtype="object", name=column))
         return pd.concat(selected_columns, axis=1)
 
+    def _preprocess_statement_df(self, df, schema, dtypes):
+        """
+        Reads the sheet columns of a Codal statement table into one row.
+
+        :param df: The statement table.
+        :type df: pd.DataFrame
+        :param schema: The layouts and titles of the sheet.
+        :type schema: finops.utils.statement_schema.StatementSchema
+        :param dtypes: The dtypes of the sheet dataset.
+        :type dtypes: dict
+        :return: The sheet row, no rows if no title matches.
+        :rtype: pd.DataFrame
+        """
+        row = schema.match_rows(self._preprocess_codal_df(df).to_numpy())
+        df = pd.DataFrame([row] if row else [], columns=schema.columns, dtype=object)
+        return self._apply_dtypes(df, dtypes)
+
     def _preprocess_balance_sheet_df(self, df):
-        df = df.applymap(self._preprocess_codal_text)
-        if len(df.columns) == 56:
-            df = df.iloc[:, 6:8]
-        if len(df.columns) == 24:
-            df = df.iloc[:, 3:5]
-        if len(df.columns) == 18:
-            df = df.iloc[:, 2:4]
-        if len(df.columns) == 12:
-            df = df.iloc[:, 1:3]
-        if len(df.columns) == 10:
-            df = df.drop(columns=[0, 5])
-        if len(df.columns) == 16:
-            section1 = df.iloc[:, 1:3]
-            section2 = df.iloc[:, 9:11]
-            section2.columns = section1.columns
-            df = pd.concat([section1, section2], axis=0, ignore_index=True)
-        if len(df.columns) < 5:
-            df = df.iloc[:, :2]
-        else:
-            section1 = df.iloc[:, 0:2]
-            section2 = df.iloc[:, 4:6]
-            section2.columns = section1.columns
-            df = pd.concat([section1, section2], axis=0, ignore_index=True)
-        df = df.dropna(how="any")
-        df.columns = ["title", "value"]
-        df["title"] = df["title"].map(BALANCE_SHEET_FIX_MISTAKE_MAP).fillna(df["title"])
-        df = df.drop_duplicates(subset=["title"], keep="first")
-        df = df[df["title"].isin(BALANCE_SHEET_COLUMNS)]
-        df = df.set_index("title").T.reset_index(drop=True)
-        df = self.safe_select_columns(df, BALANCE_SHEET_COLUMNS)
-        return df
+        return self._preprocess_statement_df(
+            df, BALANCE_SHEET_SCHEMA, BALANCE_SHEET_DTYPES
+        )
 
     def _preprocess_pnl_df(self, df):
-        df = df.applymap(self._preprocess_codal_text)
-        if len(df.columns) == 24:
-            df = df.iloc[:, 3:5]
-        if len(df.columns) == 18:
-            df = df.iloc[:, 2:4]
-        if len(df.columns) == 12:
-            df = df.iloc[:, 1:3]
-        if len(df.columns) == 5:
-            df = df.drop(columns=[0])
-        df = df.iloc[:, :2]
-        df = df.dropna(how="any")
-        df.columns = ["title", "value"]
-        df["title"] = df["title"].map(PNL_SHEET_FIX_MISTAKE_MAP).fillna(df["title"])
-        df = df.drop_duplicates(subset=["title"], keep="first")
-        df = df[df["title"].isin(PNL_SHEET_COLUMNS)]
-        df = df.set_index("title").T.reset_index(drop=True)
-        df = self.safe_select_columns(df, PNL_SHEET_COLUMNS)
-        return df
+        return self._preprocess_statement_df(df, PNL_SHEET_SCHEMA, PNL_SHEET_DTYPES)
 
     def _preprocess_cash_flow_df(self, df):
-        df = df.applymap(self._preprocess_codal_text)
-        if len(df.columns) == 12:
-            df = df.iloc[:, 1:3]
-        df = df.iloc[:, :2]
-        df = df.dropna(how="any")
-        df.columns = ["title", "value"]
-        df["title"] = df["title"].map(CASH_FLOW_FIX_MISTAKE_MAP).fillna(df["title"])
-        df = df.drop_duplicates(subset=["title"], keep="first")
-        df = df[df["title"].isin(CASH_FLOW_SHEET_COLUMNS)]
-        df = df.set_index("title").T.reset_index(drop=True)
-        df = self.safe_select_columns(df, CASH_FLOW_SHEET_COLUMNS)
-        return df
+        return self._preprocess_statement_df(
+            df, CASH_FLOW_SHEET_SCHEMA, CASH_FLOW_SHEET_DTYPES
+        )
 
     @staticmethod
-    def _extract_period_type(letter_title):
-        period_type = re.search(r"(سال مالی|میاندوره‌ای|میاندوره ای)", letter_title)
-        if period_type is None:
-            return None
-        else:
-            period_type = "annual" if period_type.group() == "سال مالی" else "interim"
-        return period_type
+    @functools.lru_cache(maxsize=LETTER_TITLE_CACHE_SIZE)
+    def _convert_jalali_date(jalali_date):
+        """
+        Converts a Jalali date to the Gregorian calendar, memoized.
 
-    def _extract_period_length(self, letter_title):
-        period_length = re.search(r"\d+(?= ماهه)", letter_title)
-        if period_length is None:
-            return None
-        else:
-            period_length = int(self._preprocess_persian_text(period_length.group()))
-        return period_length
+        :param jalali_date: The Jalali date, e.g. ``1402/12/29``.
+        :type jalali_date: str
+        :return: The Gregorian date.
+        :rtype: datetime.date
+        """
+        return jdatetime.datetime.strptime(jalali_date, "%Y/%m/%d").date().togregorian()
 
     @staticmethod
-    def _extract_period_end_date(letter_title):
-        period_end_date = re.search(r"\d{4}/\d{2}/\d{2}", letter_title)
-        if period_end_date is None:
-            return None
-        else:
-            period_end_date = (
-                jdatetime.datetime.strptime(
-                    period_end_date.group(),
-                    "%Y/%m/%d",
-                )
-                .date()
-                .togregorian()
-            )
-        return period_end_date
+    @functools.lru_cache(maxsize=LETTER_TITLE_CACHE_SIZE)
+    def _parse_letter_title(letter_title):
+        """
+        Extracts the letter info of a Codal letter title, memoized since the
+        titles of the statements of a fiscal period repeat across symbols.
+
+        :param letter_title: The letter title.
+        :type letter_title: str
+        :return: Whether the letter is audited, a correction and consolidated,
+            and its period type, length and end date.
+        :rtype: tuple
+        """
+        period_type = PERIOD_TYPE_PATTERN.search(letter_title)
+        if period_type is not None:
+            period_type = "annual" if period_type.group() == "سال مالی" else "interim"
+        period_length = PERIOD_LENGTH_PATTERN.search(letter_title)
+        if period_length is not None:
+            period_length = int(period_length.group())
+        period_end_date = PERIOD_END_DATE_PATTERN.search(letter_title)
+        if period_end_date is not None:
+            period_end_date = Preprocessor._convert_jalali_date(period_end_date.group())
+        return (
+            "حسابرسی شده" in letter_title,
+            "اصلاحیه" in letter_title,
+            "تلفیقی" in letter_title,
+            period_type,
+            period_length,
+            period_end_date,
+        )
 
     def _preprocess_letters_list(self, parsed_response):
         letters = parsed_response["Letters"]
-        letters_list = []
-        for letter in letters:
-            preprocessed_letter_info = {
-                "tracing_id": letter["TracingNo"],
-                "symbol": letter["Symbol"],
-                "letter_title": letter["Title"],
-                "is_audited": "حسابرسی شده" in letter["Title"],
-                "is_correction": "اصلاحیه" in letter["Title"],
-                "is_consolidated": "تلفیقی" in letter["Title"],
-                "period_type": self._extract_period_type(letter["Title"]),
-                "period_length": self._extract_period_length(letter["Title"]),
-                "period_end_date": self._extract_period_end_date(letter["Title"]),
-                "url": "https://www.codal.ir" + letter["Url"],
-            }
-            letters_list.append(preprocessed_letter_info)
-        letters_list_df = pd.DataFrame(letters_list)
-        return letters_list_df
+        titles = [letter["Title"] for letter in letters]
+        letter_info = list(zip(*map(self._parse_letter_title, titles))) or [[]] * 6
+        letters_list_df = pd.DataFrame(
+            {
+                "tracing_id": [letter["TracingNo"] for letter in letters],
+                "symbol": pd.Categorical([letter["Symbol"] for letter in letters]),
+                "letter_title": titles,
+                "is_audited": letter_info[0],
+                "is_correction": letter_info[1],
+                "is_consolidated": letter_info[2],
+                "period_type": pd.Categorical(letter_info[3]),
+                "period_length": pd.array(letter_info[4], dtype="Int16"),
+                "period_end_date": letter_info[5],
+                "url": ["https://www.codal.ir" + letter["Url"] for letter in letters],
+            },
+            columns=CODAL_LETTERS_LIST_COLUMNS,
+        )
+        return self._apply_dtypes(letters_list_df, CODAL_LETTERS_LIST_DTYPES)
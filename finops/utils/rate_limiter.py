@@ -0,0 +1,115 @@
+import time
+import threading
+from urllib.parse import urlsplit
+from finops.config import RATE_LIMITS
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket allowing ``rate`` requests per second on average
+    and up to ``burst`` requests back to back.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Initialize a TokenBucket object.
+
+        :param rate: The number of tokens added per second.
+        :type rate: float
+        :param burst: The capacity of the bucket.
+        :type burst: int
+        """
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1.")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated_at) * self.rate
+            )
+            self._updated_at = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens: int = 1):
+        """
+        Blocks until ``tokens`` tokens are available and takes them.
+
+        Tokens are reserved before sleeping, so concurrent callers are served
+        in arrival order and never exceed the configured rate together.
+
+        :param tokens: The number of tokens to take.
+        :type tokens: int
+        """
+        wait_time = self._reserve(tokens)
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+
+class RateLimiter:
+    """
+    Registry of token buckets keyed by host. Hosts without a configured limit
+    are not throttled.
+    """
+
+    def __init__(self, rate_limits: dict = None):
+        """
+        Initialize a RateLimiter object.
+
+        :param rate_limits: Mapping of host to a ``(rate, burst)`` tuple.
+        :type rate_limits: dict, optional
+        """
+        self._buckets = {}
+        self._lock = threading.Lock()
+        for host, (rate, burst) in (rate_limits or {}).items():
+            self.set_rate(host, rate, burst)
+
+    @staticmethod
+    def _get_host(url):
+        return urlsplit(url).netloc or url
+
+    def set_rate(self, host: str, rate: float, burst: int = 1):
+        """
+        Sets the allowed request rate for a host.
+
+        :param host: The host name, e.g. ``cdn.tsetmc.com``.
+        :type host: str
+        :param rate: The allowed number of requests per second.
+        :type rate: float
+        :param burst: The number of requests allowed back to back.
+        :type burst: int
+        """
+        with self._lock:
+            self._buckets[host] = TokenBucket(rate, burst)
+
+    def remove_rate(self, host: str):
+        """
+        Stops throttling a host.
+
+        :param host: The host name.
+        :type host: str
+        """
+        with self._lock:
+            self._buckets.pop(host, None)
+
+    def acquire(self, url: str):
+        """
+        Blocks until a request to the host of ``url`` is allowed.
+
+        :param url: The URL to be requested.
+        :type url: str
+        """
+        bucket = self._buckets.get(self._get_host(url))
+        if bucket is not None:
+            bucket.acquire()
+
+
+rate_limiter = RateLimiter(RATE_LIMITS)
@@ -0,0 +1,305 @@
+import time
+import random
+import threading
+import collections
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+import requests
+from finops.config import (
+    RETRY_MAX_RETRIES,
+    RETRY_BACKOFF_BASE,
+    RETRY_BACKOFF_FACTOR,
+    RETRY_MAX_WAIT,
+    RETRY_STATUSES,
+    CIRCUIT_BREAKER_FAILURE_RATE,
+    CIRCUIT_BREAKER_WINDOW_SIZE,
+    CIRCUIT_BREAKER_MIN_REQUESTS,
+    CIRCUIT_BREAKER_COOLDOWN,
+)
+from finops.logger import logger
+
+
+def parse_retry_after(value):
+    """
+    Parses a ``Retry-After`` header given either as seconds or as an HTTP date.
+
+    :param value: The header value.
+    :type value: str
+    :return: The number of seconds to wait, or None if the value is invalid.
+    :rtype: float
+    """
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker shared by all workers.
+
+    The outcomes of the last ``window_size`` requests are kept for every host.
+    Once at least ``min_requests`` were seen and the share of failures reaches
+    ``failure_rate``, the circuit opens and every worker calling :meth:`wait`
+    for that host sleeps for ``cooldown`` seconds. Requests after the cooldown
+    probe the host: a failure reopens the circuit, a success closes it.
+    """
+
+    def __init__(
+        self,
+        failure_rate: float = CIRCUIT_BREAKER_FAILURE_RATE,
+        window_size: int = CIRCUIT_BREAKER_WINDOW_SIZE,
+        min_requests: int = CIRCUIT_BREAKER_MIN_REQUESTS,
+        cooldown: float = CIRCUIT_BREAKER_COOLDOWN,
+    ):
+        """
+        Initialize a CircuitBreaker object.
+
+        :param failure_rate: The share of failures that opens the circuit.
+        :type failure_rate: float
+        :param window_size: The number of recent outcomes kept per host.
+        :type window_size: int
+        :param min_requests: The number of outcomes required before opening.
+        :type min_requests: int
+        :param cooldown: The number of seconds the circuit stays open.
+        :type cooldown: float
+        """
+        self.failure_rate = failure_rate
+        self.window_size = window_size
+        self.min_requests = min_requests
+        self.cooldown = cooldown
+        self._outcomes = collections.defaultdict(
+            lambda: collections.deque(maxlen=self.window_size)
+        )
+        self._opened_until = {}
+        self._half_open = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_host(key):
+        return urlsplit(key).netloc or key
+
+    def is_open(self, key: str) -> bool:
+        """
+        Checks whether requests to the host of ``key`` are currently paused.
+
+        :param key: A URL or host name.
+        :type key: str
+        :return: True if the circuit is open.
+        :rtype: bool
+        """
+        host = self._get_host(key)
+        with self._lock:
+            return self._opened_until.get(host, 0) > time.monotonic()
+
+    def wait(self, key: str):
+        """
+        Blocks while the circuit of the host of ``key`` is open.
+
+        :param key: A URL or host name.
+        :type key: str
+        """
+        host = self._get_host(key)
+        while True:
+            with self._lock:
+                wait_time = self._opened_until.get(host, 0) - time.monotonic()
+            if wait_time <= 0:
+                return
+            time.sleep(wait_time)
+
+    def pause(self, key: str, duration: float):
+        """
+        Opens the circuit of the host of ``key`` for at least ``duration`` seconds.
+
+        :param key: A URL or host name.
+        :type key: str
+        :param duration: The number of seconds to pause.
+        :type duration: float
+        """
+        host = self._get_host(key)
+        with self._lock:
+            self._open(host, duration)
+
+    def _open(self, host, duration):
+        opened_until = time.monotonic() + duration
+        if opened_until > self._opened_until.get(host, 0):
+            self._opened_until[host] = opened_until
+        self._outcomes[host].clear()
+        self._half_open.add(host)
+
+    def record_success(self, key: str):
+        """
+        Records a successful request to the host of ``key``.
+
+        :param key: A URL or host name.
+        :type key: str
+        """
+        host = self._get_host(key)
+        with self._lock:
+            self._half_open.discard(host)
+            self._outcomes[host].append(True)
+
+    def record_failure(self, key: str):
+        """
+        Records a failed request to the host of ``key`` and opens the circuit
+        when the failure rate is exceeded.
+
+        :param key: A URL or host name.
+        :type key: str
+        """
+        host = self._get_host(key)
+        with self._lock:
+            outcomes = self._outcomes[host]
+            outcomes.append(False)
+            n_failures = outcomes.count(False)
+            if host in self._half_open or (
+                len(outcomes) >= self.min_requests
+                and n_failures / len(outcomes) >= self.failure_rate
+            ):
+                logger.warning(
+                    f"Circuit for {host} is open for {self.cooldown} seconds."
+                )
+                self._open(host, self.cooldown)
+
+
+class RetryPolicy:
+    """
+    Retries a call with exponential backoff and full jitter.
+
+    HTTP errors are retried only for ``retry_statuses``; for 429 and 503 a
+    ``Retry-After`` header overrides the backoff and pauses the whole host
+    through the circuit breaker. Once ``max_retries`` retries are exhausted the
+    last exception is raised.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = RETRY_MAX_RETRIES,
+        backoff_base: float = RETRY_BACKOFF_BASE,
+        backoff_factor: float = RETRY_BACKOFF_FACTOR,
+        max_wait: float = RETRY_MAX_WAIT,
+        jitter: bool = True,
+        retry_statuses: tuple = RETRY_STATUSES,
+        retry_on: tuple = (requests.ConnectionError, requests.Timeout),
+        circuit_breaker: CircuitBreaker = None,
+    ):
+        """
+        Initialize a RetryPolicy object.
+
+        :param max_retries: The number of retries after the first attempt.
+        :type max_retries: int
+        :param backoff_base: The wait time before the first retry, in seconds.
+        :type backoff_base: float
+        :param backoff_factor: The multiplier applied to the wait time on every retry.
+        :type backoff_factor: float
+        :param max_wait: The upper bound of a single wait, in seconds.
+        :type max_wait: float
+        :param jitter: Flag to draw each wait uniformly between zero and the backoff.
+        :type jitter: bool
+        :param retry_statuses: HTTP status codes worth retrying.
+        :type retry_statuses: tuple
+        :param retry_on: Exception types worth retrying besides HTTP errors.
+        :type retry_on: tuple
+        :param circuit_breaker: The circuit breaker consulted before every attempt.
+        :type circuit_breaker: CircuitBreaker, optional
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_factor = backoff_factor
+        self.max_wait = max_wait
+        self.jitter = jitter
+        self.retry_statuses = retry_statuses
+        self.retry_on = retry_on
+        self.circuit_breaker = circuit_breaker
+
+    def get_wait_time(self, attempt: int, retry_after: float = None) -> float:
+        """
+        Computes the wait time before the given retry.
+
+        :param attempt: The zero-based retry number.
+        :type attempt: int
+        :param retry_after: The wait time requested by the server.
+        :type retry_after: float, optional
+        :return: The number of seconds to wait.
+        :rtype: float
+        """
+        if retry_after is not None:
+            return min(retry_after, self.max_wait)
+        wait_time = min(
+            self.max_wait, self.backoff_base * self.backoff_factor**attempt
+        )
+        if self.jitter:
+            wait_time = random.uniform(0, wait_time)
+        return wait_time
+
+    def is_retryable(self, exception: Exception) -> bool:
+        """
+        Checks whether a failed call is worth retrying.
+
+        :param exception: The raised exception.
+        :type exception: Exception
+        :return: True if the call should be retried.
+        :rtype: bool
+        """
+        if isinstance(exception, requests.HTTPError):
+            response = exception.response
+            return response is not None and response.status_code in self.retry_statuses
+        return isinstance(exception, self.retry_on)
+
+    @staticmethod
+    def _get_retry_after(exception):
+        response = getattr(exception, "response", None)
+        if response is None or response.status_code not in (429, 503):
+            return None
+        return parse_retry_after(response.headers.get("Retry-After"))
+
+    def call(self, func, *args, key: str = None, **kwargs):
+        """
+        Calls ``func`` and retries it according to the policy.
+
+        :param func: The function to call.
+        :type func: function
+        :param key: A URL or host name used for the circuit breaker.
+        :type key: str, optional
+        :return: The result of ``func``.
+        """
+        circuit_breaker = self.circuit_breaker if key is not None else None
+        attempt = 0
+        while True:
+            if circuit_breaker is not None:
+                circuit_breaker.wait(key)
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                is_retryable = self.is_retryable(e)
+                if circuit_breaker is not None and is_retryable:
+                    circuit_breaker.record_failure(key)
+                if not is_retryable or attempt >= self.max_retries:
+                    raise
+                retry_after = self._get_retry_after(e)
+                if circuit_breaker is not None and retry_after is not None:
+                    circuit_breaker.pause(key, retry_after)
+                wait_time = self.get_wait_time(attempt, retry_after)
+                attempt += 1
+                logger.warning(
+                    f"Retrying in {wait_time:.1f} seconds - Attempt {attempt} of {self.max_retries}: {e}"
+                )
+                time.sleep(wait_time)
+            else:
+                if circuit_breaker is not None:
+                    circuit_breaker.record_success(key)
+                return result
+
+
+circuit_breaker = CircuitBreaker()
+retry_policy = RetryPolicy(circuit_breaker=circuit_breaker)
@@ -0,0 +1,82 @@
+import threading
+import pandas as pd
+
+
+class ScrapeState:
+    """
+    In-memory index of the scraped dates of every ID, shared by the worker
+    threads of a run.
+
+    It is built once from the scrape log and updated in place as dates are
+    scraped, so workers never reload the log.
+    """
+
+    def __init__(self, scraped_dates: dict = None):
+        """
+        Initialize a ScrapeState object.
+
+        :param scraped_dates: Mapping of ID to its scraped dates.
+        :type scraped_dates: dict, optional
+        """
+        self._scraped_dates = {
+            id: set(dates) for id, dates in (scraped_dates or {}).items()
+        }
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_log(cls, log: pd.DataFrame, id_column="id", date_column="date"):
+        """
+        Builds the index of a scrape log.
+
+        :param log: The scrape log.
+        :type log: pd.DataFrame
+        :param id_column: The ID column of the log.
+        :type id_column: str
+        :param date_column: The date column of the log.
+        :type date_column: str
+        :return: The scrape state.
+        :rtype: ScrapeState
+        """
+        return cls(
+            {
+                id: dates.tolist()
+                for id, dates in log.groupby(id_column, sort=False)[date_column]
+            }
+        )
+
+    def get_scraped_dates(self, id) -> set:
+        """
+        Returns the scraped dates of an ID.
+
+        :param id: The ID.
+        :return: A copy of the scraped dates.
+        :rtype: set
+        """
+        with self._lock:
+            return set(self._scraped_dates.get(id, ()))
+
+    def is_scraped(self, id, date) -> bool:
+        """
+        Checks whether a date of an ID is scraped.
+
+        :param id: The ID.
+        :param date: The date.
+        :return: True if the date is scraped.
+        :rtype: bool
+        """
+        with self._lock:
+            return date in self._scraped_dates.get(id, ())
+
+    def add(self, id, date):
+        """
+        Marks a date of an ID as scraped.
+
+        :param id: The ID.
+        :param date: The date.
+        """
+        with self._lock:
+            self._scraped_dates.setdefault(id, set()).add(date)
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(dates) for dates in self._scraped_dates.values())
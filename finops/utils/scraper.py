@@ -1,16 +1,25 @@
+import os
+import bisect
 import pandas as pd
+from finops.config import LOG_COLUMNS, LOG_DATASET
 from .downloader import Downloader
+from .scrape_state import ScrapeState
 
 
 class Scraper(Downloader):
     @staticmethod
     def _filter_scraped_dates(dates, scraped_dates):
-        not_scraped_dates = list(set(dates) - set(scraped_dates))
+        if not isinstance(scraped_dates, (set, frozenset)):
+            scraped_dates = set(scraped_dates)
+        not_scraped_dates = [date for date in dates if date not in scraped_dates]
         return not_scraped_dates
 
     @staticmethod
     def _filter_dates_range(dates, start_date, end_date):
-        filtered_dates = list(filter(lambda date: start_date < date < end_date, dates))
+        dates = sorted(dates)
+        filtered_dates = dates[
+            bisect.bisect_right(dates, start_date) : bisect.bisect_left(dates, end_date)
+        ]
         return filtered_dates
 
     @staticmethod
@@ -19,9 +28,27 @@ class Scraper(Downloader):
     
     @staticmethod
     def _get_scraped_ids(log, id_column="id"):
-        return log[id_column].tolist()
+        return set(log[id_column].tolist())
 
-    @staticmethod
-    def _save_log(log_path, **logargs):
+    def _load_scraped_dates(self, log_path, id):
+        if isinstance(log_path, (str, os.PathLike)):
+            log = self._load_or_create_csv(
+                log_path, LOG_COLUMNS, parse_dates=["date"], dtype={"id": str}
+            )
+            return self._get_scraped_dates(log, id)
+        log = log_path.read(LOG_DATASET, filters=[("id", "=", id)], columns=["date"])
+        return log["date"].tolist()
+
+    def _load_scrape_state(self, log_path):
+        if isinstance(log_path, (str, os.PathLike)):
+            log = self._load_or_create_csv(
+                log_path, LOG_COLUMNS, parse_dates=["date"], dtype={"id": str}
+            )
+        else:
+            log = log_path.read(LOG_DATASET)
+        return ScrapeState.from_log(log)
+
+    @classmethod
+    def _save_log(cls, log_path, **logargs):
         log = pd.DataFrame([logargs])
-        self._save_csv(log, log_path)
+        cls._save(log, log_path, LOG_DATASET)
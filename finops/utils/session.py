@@ -0,0 +1,136 @@
+import threading
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from finops.config import HTTP_POOL_SIZE
+
+
+class SessionPool:
+    """
+    Thread-safe registry of keep-alive ``requests`` sessions, one per host.
+
+    Every session mounts an ``HTTPAdapter`` whose connection pool holds up to
+    ``pool_size`` sockets, so concurrent workers hitting the same host reuse
+    open TCP/TLS connections instead of opening a new one per request.
+    """
+
+    def __init__(self, pool_size: int = HTTP_POOL_SIZE):
+        """
+        Initialize a SessionPool object.
+
+        :param pool_size: Maximum number of kept-alive connections per host.
+        :type pool_size: int
+        """
+        self.pool_size = pool_size
+        self._sessions = {}
+        self._retired_requests = 0
+        self._retired_connections = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_host(url):
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def _create_adapter(self):
+        return HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+
+    def _create_session(self, host):
+        session = requests.Session()
+        session.mount(host, self._create_adapter())
+        return session
+
+    def get_session(self, url: str) -> requests.Session:
+        """
+        Returns the shared session for the host of the given URL.
+
+        :param url: The URL to be requested.
+        :type url: str
+        :return: The session bound to the URL host.
+        :rtype: requests.Session
+        """
+        host = self._get_host(url)
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = self._create_session(host)
+                self._sessions[host] = session
+        return session
+
+    def resize(self, pool_size: int):
+        """
+        Changes the number of kept-alive connections per host.
+
+        Existing sessions get a fresh adapter; sockets of the old adapter are
+        closed once the requests using them finish.
+
+        :param pool_size: Maximum number of kept-alive connections per host.
+        :type pool_size: int
+        """
+        with self._lock:
+            if pool_size == self.pool_size:
+                return
+            self.pool_size = pool_size
+            for host, session in self._sessions.items():
+                old_adapter = session.get_adapter(host)
+                n_requests, n_connections = self._count(old_adapter)
+                self._retired_requests += n_requests
+                self._retired_connections += n_connections
+                session.mount(host, self._create_adapter())
+                old_adapter.close()
+
+    def ensure_pool_size(self, n_threads: int):
+        """
+        Grows the pool so that ``n_threads`` workers never wait for a socket.
+
+        :param n_threads: The number of concurrent workers.
+        :type n_threads: int
+        """
+        if n_threads > self.pool_size:
+            self.resize(n_threads)
+
+    @staticmethod
+    def _count(adapter):
+        n_requests, n_connections = 0, 0
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            n_requests += pool.num_requests
+            n_connections += pool.num_connections
+        return n_requests, n_connections
+
+    def stats(self) -> dict:
+        """
+        Returns connection counters accumulated over all hosts.
+
+        :return: Number of requests sent, connections opened and connections reused.
+        :rtype: dict
+        """
+        with self._lock:
+            n_requests = self._retired_requests
+            n_connections = self._retired_connections
+            for host, session in self._sessions.items():
+                host_requests, host_connections = self._count(
+                    session.get_adapter(host)
+                )
+                n_requests += host_requests
+                n_connections += host_connections
+        return {
+            "requests": n_requests,
+            "opened": n_connections,
+            "reused": n_requests - n_connections,
+        }
+
+    def close(self):
+        """
+        Closes every session and drops all kept-alive connections.
+        """
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions = {}
+
+
+session_pool = SessionPool()
@@ -0,0 +1,112 @@
+import time
+import threading
+import collections
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.exception = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls sharing a key: the first caller runs the
+    function while the others wait for it and receive the same result or
+    exception.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.n_coalesced = 0
+
+    def do(self, key, func, *args, **kwargs):
+        """
+        Calls ``func`` unless a call with the same key is already in flight.
+
+        :param key: The key identifying identical calls.
+        :type key: hashable
+        :param func: The function to call.
+        :type func: function
+        :return: The result of ``func``.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                self.n_coalesced += 1
+        if not is_leader:
+            call.event.wait()
+            if call.exception is not None:
+                raise call.exception
+            return call.result
+        try:
+            call.result = func(*args, **kwargs)
+        except BaseException as e:
+            call.exception = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
+
+
+class Memo:
+    """
+    Thread-safe, size-bounded and short-lived memo of computed values.
+
+    Concurrent misses for the same key are coalesced, so a value is computed
+    once even when many workers ask for it at the same time.
+    """
+
+    def __init__(self, ttl: float, maxsize: int):
+        """
+        Initialize a Memo object.
+
+        :param ttl: The number of seconds a value is kept.
+        :type ttl: float
+        :param maxsize: The maximum number of values kept.
+        :type maxsize: int
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._values = collections.OrderedDict()
+        self._single_flight = SingleFlight()
+        self._lock = threading.Lock()
+
+    def get(self, key, func, *args, **kwargs):
+        """
+        Returns the memoized value of ``key``, computing it with ``func`` on a miss.
+
+        :param key: The key of the value.
+        :type key: hashable
+        :param func: The function computing the value.
+        :type func: function
+        :return: The value.
+        """
+        now = time.monotonic()
+        with self._lock:
+            item = self._values.get(key)
+            if item is not None and now - item[0] < self.ttl:
+                self._values.move_to_end(key)
+                return item[1]
+        value = self._single_flight.do(key, func, *args, **kwargs)
+        with self._lock:
+            self._values[key] = (time.monotonic(), value)
+            self._values.move_to_end(key)
+            while len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+        return value
+
+    def clear(self):
+        """
+        Drops every memoized value.
+        """
+        with self._lock:
+            self._values.clear()
@@ -0,0 +1,164 @@
+import difflib
+import functools
+import numpy as np
+from finops.config import (
+    BALANCE_SHEET_COLUMNS,
+    PNL_SHEET_COLUMNS,
+    CASH_FLOW_SHEET_COLUMNS,
+    BALANCE_SHEET_FIX_MISTAKE_MAP,
+    PNL_SHEET_FIX_MISTAKE_MAP,
+    CASH_FLOW_FIX_MISTAKE_MAP,
+    BALANCE_SHEET_LAYOUTS,
+    PNL_SHEET_LAYOUTS,
+    CASH_FLOW_SHEET_LAYOUTS,
+    CODAL_TITLE_FUZZY_CUTOFF,
+    CODAL_TITLE_CACHE_SIZE,
+)
+from finops.utils.normalizer import normalize_title_key
+
+# How a title was matched to a column, a row matched more exactly wins
+EXACT_MATCH = 0
+KEY_MATCH = 1
+FUZZY_MATCH = 2
+
+
+class StatementSchema:
+    """
+    Layouts and title index of a Codal statement sheet.
+
+    A statement table is read as (title, value) column pairs chosen by the
+    number of columns of the table, see ``finops.config.BALANCE_SHEET_LAYOUTS``.
+    The pairs of a width are resolved once and reused for every table of
+    that width.
+
+    Titles are matched to the sheet columns by an exact lookup of the known
+    titles, then by a lookup of their folded key, see
+    :func:`finops.utils.normalizer.normalize_title_key`, and last by the
+    closest folded key, memoized per title. When several rows match a column
+    the most exact match wins, then the first row.
+    """
+
+    def __init__(
+        self,
+        columns: list,
+        title_map: dict,
+        layouts: dict,
+        fuzzy_cutoff: float = CODAL_TITLE_FUZZY_CUTOFF,
+    ):
+        """
+        Initialize a StatementSchema object.
+
+        :param columns: The columns of the sheet dataset.
+        :type columns: list
+        :param title_map: Mapping of known statement titles to columns.
+        :type title_map: dict
+        :param layouts: Mapping of table width to (title, value) column pairs,
+            with a ``"default"`` entry for other widths.
+        :type layouts: dict
+        :param fuzzy_cutoff: The minimum similarity of a fuzzy title match,
+            between 0 and 1.
+        :type fuzzy_cutoff: float
+        """
+        self.columns = list(columns)
+        self.titles = dict(title_map)
+        self.titles.update(
+            (column, column) for column in self.columns if column != "tracing_id"
+        )
+        self.title_keys = {}
+        ambiguous_keys = set()
+        for title, column in self.titles.items():
+            key = normalize_title_key(title)
+            if self.title_keys.setdefault(key, column) != column:
+                ambiguous_keys.add(key)
+        for key in ambiguous_keys:
+            del self.title_keys[key]
+        self.layouts = layouts
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self._sections = {}
+        self._match_key = functools.lru_cache(maxsize=CODAL_TITLE_CACHE_SIZE)(
+            self._match_key
+        )
+
+    def get_sections(self, n_columns: int) -> tuple:
+        """
+        Resolves the (title, value) column pairs of a table width.
+
+        :param n_columns: The number of columns of the table.
+        :type n_columns: int
+        :return: The title column indices and the value column indices.
+        :rtype: tuple
+        """
+        try:
+            return self._sections[n_columns]
+        except KeyError:
+            pass
+        sections = [
+            section
+            for section in self.layouts.get(n_columns, self.layouts["default"])
+            if max(section) < n_columns
+        ]
+        self._sections[n_columns] = (
+            np.array([title for title, _ in sections], dtype=int),
+            np.array([value for _, value in sections], dtype=int),
+        )
+        return self._sections[n_columns]
+
+    def _match_key(self, key):
+        column = self.title_keys.get(key)
+        if column is not None:
+            return column, KEY_MATCH
+        matches = difflib.get_close_matches(
+            key, self.title_keys, n=1, cutoff=self.fuzzy_cutoff
+        )
+        if not matches:
+            return None, FUZZY_MATCH
+        return self.title_keys[matches[0]], FUZZY_MATCH
+
+    def match_title(self, title: str) -> tuple:
+        """
+        Matches a statement title to a sheet column.
+
+        :param title: The normalized title.
+        :type title: str
+        :return: The column, None if no column matches, and how it matched.
+        :rtype: tuple
+        """
+        column = self.titles.get(title)
+        if column is not None:
+            return column, EXACT_MATCH
+        return self._match_key(normalize_title_key(title))
+
+    def match_rows(self, values: np.ndarray) -> dict:
+        """
+        Reads the values of the sheet columns from a statement table.
+
+        :param values: The normalized cells of the table, None for empty cells.
+        :type values: np.ndarray
+        :return: Mapping of column to value of the matched columns.
+        :rtype: dict
+        """
+        title_columns, value_columns = self.get_sections(values.shape[1])
+        titles = values[:, title_columns].T.ravel()
+        cells = values[:, value_columns].T.ravel()
+        matched = {}
+        for title, cell in zip(titles, cells):
+            if title is None or cell is None:
+                continue
+            column, match = self.match_title(title)
+            if (
+                column is not None
+                and match < matched.get(column, (FUZZY_MATCH + 1,))[0]
+            ):
+                matched[column] = (match, cell)
+        return {column: cell for column, (_, cell) in matched.items()}
+
+
+BALANCE_SHEET_SCHEMA = StatementSchema(
+    BALANCE_SHEET_COLUMNS, BALANCE_SHEET_FIX_MISTAKE_MAP, BALANCE_SHEET_LAYOUTS
+)
+PNL_SHEET_SCHEMA = StatementSchema(
+    PNL_SHEET_COLUMNS, PNL_SHEET_FIX_MISTAKE_MAP, PNL_SHEET_LAYOUTS
+)
+CASH_FLOW_SHEET_SCHEMA = StatementSchema(
+    CASH_FLOW_SHEET_COLUMNS, CASH_FLOW_FIX_MISTAKE_MAP, CASH_FLOW_SHEET_LAYOUTS
+)
@@ -1,4 +1,6 @@
-import time
+import functools
+from finops.utils.retry_policy import RetryPolicy
+
 
 def catch(func):
     def wrapper(*args, **kwargs):
@@ -11,24 +13,40 @@ def catch(func):
 
     return wrapper
 
-def sleep(func):
-    def wrapper(*args, **kwargs):
-        time.sleep(1)
-        result = func(*args, **kwargs)
-        return result
 
-    return wrapper
+def retry(max_retries=3, wait_time=10, retry_on=(Exception,), key=None, policy=None):
+    """
+    Retries the decorated function with exponential backoff and jitter, and
+    raises the last exception once every attempt failed.
+
+    The HTTP circuit breaker is not consulted unless ``policy`` has one, so
+    failures of other clients, e.g. Selenium, never pause the downloads.
+
+    :param max_retries: The number of attempts.
+    :type max_retries: int
+    :param wait_time: The wait time before the first retry, in seconds.
+    :type wait_time: float
+    :param retry_on: Exception types worth retrying; other exceptions fail
+        the call at once.
+    :type retry_on: tuple
+    :param key: Function of the call arguments returning the URL or host used
+        for the circuit breaker of ``policy``.
+    :type key: function, optional
+    :param policy: The retry policy to use instead of one built from the
+        other arguments.
+    :type policy: RetryPolicy, optional
+    """
+    if policy is None:
+        policy = RetryPolicy(
+            max_retries=max_retries - 1, backoff_base=wait_time, retry_on=retry_on
+        )
 
-def retry(max_retries=3, wait_time=10):
     def decorator(func):
+        @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            retry_count = 0
-            while retry_count < max_retries:
-                try:
-                    result = func(*args, **kwargs)
-                    return result
-                except Exception as e:
-                    retry_count += 1
-                    print(f"Retrying - Attempt {retry_count} of {max_retries}")
+            circuit_key = key(*args, **kwargs) if key is not None else None
+            return policy.call(func, *args, key=circuit_key, **kwargs)
+
         return wrapper
-    return decorator
\ No newline at end of file
+
+    return decorator
@@ -0,0 +1,210 @@
+import os
+import time
+import queue
+import threading
+import collections
+import pandas as pd
+from finops.config import (
+    LOG_DATASET,
+    WRITER_MAX_QUEUE_SIZE,
+    WRITER_MAX_BATCH_ROWS,
+    WRITER_FLUSH_INTERVAL,
+    WRITER_FSYNC,
+)
+from finops.logger import logger
+
+_STOP = object()
+
+
+class _Batch:
+    def __init__(self, target, dataset):
+        self.target = target
+        self.dataset = dataset
+        self.frames = []
+        self.logs = []
+        self.n_rows = 0
+
+    def add(self, data, log_path, logargs):
+        self.frames.append(data)
+        self.n_rows += len(data)
+        if log_path is not None:
+            self.logs.append((log_path, logargs))
+
+
+class BatchWriter:
+    """
+    Single writer thread appending the frames of concurrent scrapers.
+
+    Producers put frames on a bounded queue and the writer groups them per
+    target and dataset. A group is written as one append once it holds
+    ``max_batch_rows`` rows or ``flush_interval`` seconds after its first
+    frame, so CSV rows are never interleaved and each file is opened once
+    per batch. The scrape-log entries attached to the frames are written
+    only after their batch was written (and fsynced when ``fsync`` is set),
+    so a resumed run never skips data that was not saved.
+    """
+
+    def __init__(
+        self,
+        max_batch_rows: int = WRITER_MAX_BATCH_ROWS,
+        flush_interval: float = WRITER_FLUSH_INTERVAL,
+        fsync: bool = WRITER_FSYNC,
+        max_queue_size: int = WRITER_MAX_QUEUE_SIZE,
+    ):
+        """
+        Initialize a BatchWriter object.
+
+        :param max_batch_rows: The number of rows triggering a write.
+        :type max_batch_rows: int
+        :param flush_interval: The maximum number of seconds a frame waits to be written.
+        :type flush_interval: float
+        :param fsync: Flag to fsync CSV files after every batch.
+        :type fsync: bool
+        :param max_queue_size: The maximum number of queued frames; producers block beyond it.
+        :type max_queue_size: int
+        """
+        self.max_batch_rows = max_batch_rows
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._thread = None
+        self._stats = collections.Counter()
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def start(self):
+        """
+        Starts the writer thread if it is not running.
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def write(self, data: pd.DataFrame, target, dataset: str, log_path=None, **logargs):
+        """
+        Queues rows to append to a target.
+
+        :param data: The rows to append.
+        :type data: pd.DataFrame
+        :param target: The CSV path or store to append to.
+        :type target: str or finops.store.Store
+        :param dataset: The dataset name.
+        :type dataset: str
+        :param log_path: The path or store of the log written once the rows are saved.
+        :type log_path: str or finops.store.Store, optional
+        :param logargs: The log entry.
+        """
+        self.start()
+        self._queue.put((data, target, dataset, log_path, logargs))
+
+    def flush(self):
+        """
+        Blocks until every queued frame has been written.
+        """
+        self.start()
+        event = threading.Event()
+        self._queue.put(event)
+        event.wait()
+
+    def close(self):
+        """
+        Writes the queued frames and stops the writer thread.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+
+    def stats(self) -> dict:
+        """
+        Returns the writer counters.
+
+        :return: Written frames, rows and batches, and failed batches.
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                "frames": self._stats["frames"],
+                "rows": self._stats["rows"],
+                "batches": self._stats["batches"],
+                "failed_batches": self._stats["failed_batches"],
+            }
+
+    @staticmethod
+    def _get_key(target):
+        if isinstance(target, (str, os.PathLike)):
+            return os.path.abspath(target)
+        return id(target)
+
+    def _run(self):
+        batches = {}
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if item is None or item is _STOP or isinstance(item, threading.Event):
+                for batch in batches.values():
+                    self._flush(batch)
+                batches.clear()
+                deadline = None
+                if isinstance(item, threading.Event):
+                    item.set()
+                if item is _STOP:
+                    return
+                continue
+            data, target, dataset, log_path, logargs = item
+            key = (self._get_key(target), dataset)
+            batch = batches.get(key)
+            if batch is None:
+                batch = batches[key] = _Batch(target, dataset)
+            batch.add(data, log_path, logargs)
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+            if batch.n_rows >= self.max_batch_rows:
+                self._flush(batches.pop(key))
+                if not batches:
+                    deadline = None
+
+    def _append(self, data, target, dataset):
+        if not isinstance(target, (str, os.PathLike)):
+            target.append(dataset, data)
+            return
+        with open(target, "a", newline="") as f:
+            data.to_csv(f, index=False, header=False)
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _flush(self, batch):
+        try:
+            self._append(
+                pd.concat(batch.frames, ignore_index=True), batch.target, batch.dataset
+            )
+        except Exception as e:
+            logger.error(f"failed to write {batch.n_rows} rows to {batch.target}: {e}")
+            with self._lock:
+                self._stats["failed_batches"] += 1
+            return
+        with self._lock:
+            self._stats["frames"] += len(batch.frames)
+            self._stats["rows"] += batch.n_rows
+            self._stats["batches"] += 1
+        logs = {}
+        for log_path, logargs in batch.logs:
+            logs.setdefault(self._get_key(log_path), (log_path, []))[1].append(logargs)
+        for log_path, entries in logs.values():
+            try:
+                self._append(pd.DataFrame(entries), log_path, LOG_DATASET)
+            except Exception as e:
+                logger.error(f"failed to write {len(entries)} log entries to {log_path}: {e}")
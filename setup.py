@@ -30,4 +30,9 @@ setup(
         'jdatetime',
         'selenium',
     ],
+    extras_require={
+        'arrow': ['pyarrow'],
+        'html': ['lxml'],
+        'memory': ['psutil'],
+    },
 )
\ No newline at end of file
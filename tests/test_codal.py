@@ -0,0 +1,413 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+import pandas as pd
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from finops.codal import Codal
+from finops.utils.codal_statement import extract_statement_rows
+from finops.utils.html_table import rows_to_frame
+from finops.utils.driver_pool import DriverPool
+from finops.config import (
+    BALANCE_SHEET_ID,
+    PNL_SHEET_ID,
+    CASH_FLOW_SHEET_ID,
+    BALANCE_SHEET_DATASET,
+    PNL_SHEET_DATASET,
+    CASH_FLOW_SHEET_DATASET,
+    BALANCE_SHEET_LAYOUTS,
+    PNL_SHEET_LAYOUTS,
+)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data", "codal")
+
+
+def read_page(name):
+    with open(os.path.join(DATA_DIR, name), encoding="utf8") as f:
+        return f.read()
+
+
+def make_static_page(rows):
+    return '<div class="table_wrapper"><table>{}</table></div>'.format(
+        "".join(
+            "<tr>{}</tr>".format("".join(f"<td>{cell}</td>" for cell in row))
+            for row in rows
+        )
+    )
+
+
+def make_dynamic_page(rows):
+    cells = [
+        {"rowSequence": i + 1, "columnSequence": j + 1, "value": cell}
+        for i, row in enumerate(rows)
+        for j, cell in enumerate(row)
+    ]
+    datasource = {"sheets": [{"tables": [{"cells": cells}]}]}
+    return f"<script>var datasource = {json.dumps(datasource)};</script>"
+
+
+class CodalTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.codal = Codal(self.directory)
+        self.url = "https://www.codal.ir/Reports/Decision.aspx?LetterSerial=abc"
+        self.sheets = [
+            (
+                BALANCE_SHEET_ID,
+                self.codal._preprocess_balance_sheet_df,
+                BALANCE_SHEET_DATASET,
+            ),
+            (PNL_SHEET_ID, self.codal._preprocess_pnl_df, PNL_SHEET_DATASET),
+            (
+                CASH_FLOW_SHEET_ID,
+                self.codal._preprocess_cash_flow_df,
+                CASH_FLOW_SHEET_DATASET,
+            ),
+        ]
+        self.pages = {
+            f"{self.url}&sheetId={BALANCE_SHEET_ID}": read_page(
+                "static_statement.html"
+            ),
+            f"{self.url}&sheetId={PNL_SHEET_ID}": read_page("dynamic_statement.html"),
+            f"{self.url}&sheetId={CASH_FLOW_SHEET_ID}": read_page(
+                "cash_flow_statement.html"
+            ),
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_get_letter_sheets_over_http(self):
+        with patch.object(
+            Codal,
+            "_download",
+            side_effect=lambda url, **kwargs: Mock(text=self.pages[url]),
+        ) as mock_download, patch.object(Codal, "_scrap_letter") as mock_scrap_letter:
+            letter_sheets = self.codal._get_letter_sheets(
+                None, self.url, 123, self.sheets
+            )
+        mock_scrap_letter.assert_not_called()
+        self.assertEqual(mock_download.call_count, 3)
+        self.assertListEqual(
+            list(letter_sheets),
+            [BALANCE_SHEET_DATASET, PNL_SHEET_DATASET, CASH_FLOW_SHEET_DATASET],
+        )
+        balance_sheet = letter_sheets[BALANCE_SHEET_DATASET]
+        self.assertEqual(balance_sheet["total_assets"].iloc[0], 20000.0)
+        self.assertEqual(balance_sheet["total_equity"].iloc[0], 13000.0)
+        pnl = letter_sheets[PNL_SHEET_DATASET]
+        self.assertEqual(pnl["net_profit"].iloc[0], -150000.0)
+        self.assertEqual(pnl["tracing_id"].iloc[0], 123)
+        cash_flow = letter_sheets[CASH_FLOW_SHEET_DATASET]
+        self.assertEqual(cash_flow["net_cash_flow_operational"].iloc[0], 4200000.0)
+        self.assertEqual(cash_flow["cash_balance_end_year"].iloc[0], 3245000.0)
+
+    def test_get_letter_sheets_from_letter_pages(self):
+        pages = {
+            f"{self.url}&sheetId={BALANCE_SHEET_ID}": read_page(
+                "balance_sheet_letter.html"
+            ),
+            f"{self.url}&sheetId={PNL_SHEET_ID}": read_page("pnl_letter.html"),
+        }
+        with patch.object(
+            Codal,
+            "_download",
+            side_effect=lambda url, **kwargs: Mock(text=pages[url]),
+        ), patch.object(Codal, "_scrap_letter") as mock_scrap_letter:
+            letter_sheets = self.codal._get_letter_sheets(
+                None, self.url, 123, self.sheets[:2]
+            )
+        mock_scrap_letter.assert_not_called()
+        self.assertDictEqual(
+            letter_sheets[BALANCE_SHEET_DATASET].iloc[0].to_dict(),
+            {
+                "total_current_assets": 8520440.0,
+                "total_noncurrent_assets": 11479560.0,
+                "total_assets": 20000000.0,
+                "total_current_liabilities": 5102775.0,
+                "total_noncurrent_liabilities": 1897225.0,
+                "total_liabilities": 7000000.0,
+                "total_equity": 13000000.0,
+                "total_liabilities_and_equity": 20000000.0,
+                "tracing_id": 123,
+            },
+        )
+        pnl = letter_sheets[PNL_SHEET_DATASET]
+        self.assertDictEqual(
+            pnl.drop(columns="net_earnings_per_share").iloc[0].to_dict(),
+            {
+                "gross_profit": 3203210.0,
+                "operating_profit": 2753010.0,
+                "pre_tax_profit": 2601500.0,
+                "net_profit": -150250.0,
+                "basic_earnings_per_share": -13.0,
+                "capital": 12000000.0,
+                "tracing_id": 123,
+            },
+        )
+        self.assertTrue(pd.isna(pnl["net_earnings_per_share"].iloc[0]))
+
+    def test_get_letter_sheets_scrapes_empty_sheets(self):
+        cash_flow_url = f"{self.url}&sheetId={CASH_FLOW_SHEET_ID}"
+        self.pages[cash_flow_url] = read_page("dynamic_statement.html")
+        scraped = pd.DataFrame([["موجودی نقد در پایان دوره", "100"]])
+        with patch.object(
+            Codal,
+            "_download",
+            side_effect=lambda url, **kwargs: Mock(text=self.pages[url]),
+        ), patch.object(
+            Codal, "_scrap_letter_sheets", return_value={cash_flow_url: scraped}
+        ) as mock_scrap_letter_sheets:
+            letter_sheets = self.codal._get_letter_sheets(
+                DriverPool(Mock, 1), self.url, 123, self.sheets
+            )
+        self.assertListEqual(
+            mock_scrap_letter_sheets.call_args.args[1], [cash_flow_url]
+        )
+        self.assertListEqual(
+            list(letter_sheets),
+            [BALANCE_SHEET_DATASET, PNL_SHEET_DATASET, CASH_FLOW_SHEET_DATASET],
+        )
+        self.assertEqual(
+            letter_sheets[CASH_FLOW_SHEET_DATASET]["cash_balance_end_year"].iloc[0],
+            100.0,
+        )
+
+    def test_statement_layout_widths(self):
+        for layouts, title, column, preprocess_func in [
+            (
+                BALANCE_SHEET_LAYOUTS,
+                "جمع دارایی‌ها",
+                "total_assets",
+                self.codal._preprocess_balance_sheet_df,
+            ),
+            (
+                PNL_SHEET_LAYOUTS,
+                "سود (زیان) خالص",
+                "net_profit",
+                self.codal._preprocess_pnl_df,
+            ),
+        ]:
+            for width, sections in layouts.items():
+                if width == "default":
+                    continue
+                title_column, value_column = sections[-1]
+                cells = [""] * width
+                cells[title_column], cells[value_column] = title, "(1,500)"
+                pages = [make_static_page([cells]), make_dynamic_page([cells])]
+                for page in pages:
+                    with self.subTest(column=column, width=width, page=page[:12]):
+                        letter = rows_to_frame(extract_statement_rows(page))
+                        self.assertEqual(letter.shape[1], width)
+                        self.assertEqual(
+                            preprocess_func(letter)[column].iloc[0], -1500.0
+                        )
+
+    def test_scrap_letter_sheets_keeps_scraped_sheets(self):
+        driver = Mock()
+        driver.execute_async_script.side_effect = WebDriverException("script timeout")
+        sheet_urls = [
+            f"{self.url}&sheetId={sheet_id}" for sheet_id, _, _ in self.sheets
+        ]
+        scraped = pd.DataFrame([["سرمایه", "100"]])
+        drivers = DriverPool(lambda: driver, 1)
+        with patch.object(
+            Codal,
+            "_scrap_letter",
+            side_effect=[scraped, scraped, WebDriverException("failed")],
+        ) as mock_scrap_letter:
+            letters = self.codal._scrap_letter_sheets(drivers, sheet_urls)
+        self.assertListEqual(
+            [call.args[1] for call in mock_scrap_letter.call_args_list], sheet_urls
+        )
+        self.assertListEqual(list(letters), sheet_urls[:2])
+        self.assertIs(letters[sheet_urls[1]], scraped)
+        stats = drivers.stats()
+        self.assertEqual((stats["pages"], stats["idle"]), (5, 1))
+
+    def test_get_letter_sheets_loads_letter_once(self):
+        driver = Mock()
+        driver.execute_async_script.side_effect = [
+            self.pages[self.url + "&sheetId=1"],
+            None,
+        ]
+        scraped = pd.DataFrame([["سرمایه", "100"]])
+        drivers = DriverPool(lambda: driver, 1)
+        with patch.object(
+            Codal, "_download", return_value=Mock(text="<html></html>")
+        ), patch.object(
+            Codal, "_scrap_letter", return_value=scraped
+        ) as mock_scrap_letter:
+            letter_sheets = self.codal._get_letter_sheets(
+                drivers, self.url, 123, self.sheets
+            )
+        self.assertListEqual(
+            [call.args for call in mock_scrap_letter.call_args_list],
+            [
+                (driver, f"{self.url}&sheetId={BALANCE_SHEET_ID}"),
+                (driver, f"{self.url}&sheetId={CASH_FLOW_SHEET_ID}"),
+            ],
+        )
+        self.assertEqual(driver.execute_async_script.call_count, 2)
+        self.assertEqual(
+            letter_sheets[PNL_SHEET_DATASET]["gross_profit"].iloc[0], 3200000.0
+        )
+        self.assertEqual(len(letter_sheets), 3)
+        stats = drivers.stats()
+        self.assertEqual((stats["pages"], stats["idle"]), (4, 1))
+
+    def test_get_letter_sheets_falls_back_on_errors(self):
+        drivers = DriverPool(Mock, 1)
+        with patch.object(
+            Codal, "_download", side_effect=ConnectionError
+        ), patch.object(
+            Codal, "_scrap_letter_sheets", return_value={}
+        ) as mock_scrap_letter_sheets:
+            letter_sheets = self.codal._get_letter_sheets(
+                drivers, self.url, 123, self.sheets[1:]
+            )
+        mock_scrap_letter_sheets.assert_called_once_with(
+            drivers,
+            [
+                f"{self.url}&sheetId={PNL_SHEET_ID}",
+                f"{self.url}&sheetId={CASH_FLOW_SHEET_ID}",
+            ],
+        )
+        self.assertDictEqual(letter_sheets, {})
+
+    def test_get_letter_sheets_without_http(self):
+        codal = Codal(self.directory, use_http=False)
+        with patch.object(Codal, "_download") as mock_download, patch.object(
+            Codal, "_scrap_letter_sheets", return_value={}
+        ):
+            codal._get_letter_sheets(DriverPool(Mock, 1), self.url, 123, self.sheets)
+        mock_download.assert_not_called()
+
+    def test_get_letter_sheets_releases_driver_on_errors(self):
+        drivers = DriverPool(Mock, 1)
+        with patch.object(
+            Codal, "_download", side_effect=ConnectionError
+        ), patch.object(
+            Codal, "_scrap_letter", side_effect=TimeoutError
+        ), self.assertLogs(
+            "finops.logger", "ERROR"
+        ) as logs:
+            letter_sheets = self.codal._get_letter_sheets(
+                drivers, self.url, 123, self.sheets
+            )
+        self.assertDictEqual(letter_sheets, {})
+        self.assertIn(f"failed to scrape ['{self.url}&sheetId=0'", logs.output[0])
+        stats = drivers.stats()
+        self.assertEqual((stats["in_use"], stats["idle"], stats["pages"]), (0, 1, 1))
+
+    def test_scrap_letter_does_not_retry_missing_tables(self):
+        driver = Mock()
+        with patch("finops.codal.WebDriverWait") as mock_wait:
+            mock_wait.return_value.until.side_effect = TimeoutException
+            self.assertIsNone(self.codal._scrap_letter(driver, self.url))
+        driver.get.assert_called_once_with(self.url)
+
+    def test_scrap_letter_retries_failed_page_loads(self):
+        driver = Mock()
+        driver.get.side_effect = WebDriverException("net::ERR_CONNECTION_RESET")
+        with patch("finops.utils.retry_policy.time.sleep"), self.assertRaises(
+            WebDriverException
+        ):
+            self.codal._scrap_letter(driver, self.url)
+        self.assertEqual(driver.get.call_count, 3)
+
+    def test_get_letter_sheets_over_http_starts_no_driver(self):
+        create_driver = Mock()
+        drivers = DriverPool(create_driver, 1)
+        with patch.object(
+            Codal,
+            "_download",
+            side_effect=lambda url, **kwargs: Mock(text=self.pages[url]),
+        ):
+            self.codal._get_letter_sheets(drivers, self.url, 123, self.sheets)
+        create_driver.assert_not_called()
+
+    def get_letters_list(self):
+        return pd.DataFrame(
+            {
+                "tracing_id": [1, 2, 3, 4, 5, 2],
+                "is_audited": [False, True, False, False, True, True],
+                "is_correction": [False, False, True, False, False, False],
+                "period_end_date": [
+                    "2023-03-20",
+                    "2023-03-20",
+                    "2023-03-20",
+                    None,
+                    "2022-03-20",
+                    "2023-03-20",
+                ],
+                "url": [f"{self.url}{i}" for i in [1, 2, 3, 4, 5, 2]],
+            }
+        )
+
+    def test_plan_letters(self):
+        sheets = [
+            (BALANCE_SHEET_ID, "balance", BALANCE_SHEET_DATASET, {1, 2, 3, 4}),
+            (PNL_SHEET_ID, "pnl", PNL_SHEET_DATASET, {1, 2, 3, 4, 5}),
+            (CASH_FLOW_SHEET_ID, "cash flow", CASH_FLOW_SHEET_DATASET, {2, 3}),
+        ]
+        plan = list(self.codal._plan_letters(self.get_letters_list(), sheets))
+        self.assertListEqual(
+            [(url, tracing_id) for url, tracing_id, _ in plan],
+            [(f"{self.url}1", 1), (f"{self.url}5", 5), (f"{self.url}4", 4)],
+        )
+        self.assertListEqual(
+            [[sheet[0] for sheet in letter_sheets] for _, _, letter_sheets in plan],
+            [
+                [CASH_FLOW_SHEET_ID],
+                [BALANCE_SHEET_ID, CASH_FLOW_SHEET_ID],
+                [CASH_FLOW_SHEET_ID],
+            ],
+        )
+        self.assertEqual(
+            plan[0][2][0], (CASH_FLOW_SHEET_ID, "cash flow", CASH_FLOW_SHEET_DATASET)
+        )
+        sheets = [(PNL_SHEET_ID, "pnl", PNL_SHEET_DATASET, set())]
+        plan = list(self.codal._plan_letters(self.get_letters_list(), sheets))
+        self.assertListEqual([tracing_id for _, tracing_id, _ in plan], [2, 1, 3, 5, 4])
+        self.assertListEqual(
+            list(self.codal._plan_letters(self.get_letters_list(), [])), []
+        )
+
+    def test_scrap_letter_wrapper(self):
+        drivers = DriverPool(Mock, 1)
+        writer = Mock()
+        pnl = pd.DataFrame({"net_profit": [1.0]})
+        sheets = self.sheets[1:2]
+        with patch.object(
+            Codal, "_get_letter_sheets", return_value={PNL_SHEET_DATASET: pnl}
+        ) as mock_get_letter_sheets:
+            self.codal._scrap_letter_wrapper(drivers, self.url, 123, sheets, writer)
+        mock_get_letter_sheets.assert_called_once_with(drivers, self.url, 123, sheets)
+        writer.write.assert_called_once_with(pnl, self.codal.store, PNL_SHEET_DATASET)
+
+    def test_scrap_letters(self):
+        with patch.object(
+            Codal,
+            "_plan_letters",
+            return_value=iter([(self.url, i, []) for i in range(20)]),
+        ), patch.object(
+            Codal, "_scrap_letter_wrapper", side_effect=[ValueError] + [None] * 19
+        ) as mock_scrap_letter_wrapper, patch.object(
+            Codal, "_create_driver"
+        ) as mock_create_driver, patch(
+            "finops.codal.CODAL_WORK_QUEUE_SIZE", 2
+        ):
+            self.codal.scrap_letters(n_threads=3)
+        self.assertEqual(mock_scrap_letter_wrapper.call_count, 20)
+        self.assertSetEqual(
+            {call.args[2] for call in mock_scrap_letter_wrapper.call_args_list},
+            set(range(20)),
+        )
+        mock_create_driver.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
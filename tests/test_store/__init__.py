@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+import unittest
+import pandas as pd
+from finops.config import PRICE_HISTORY_DATA_COLUMNS
+from finops.store import CsvStore, ParquetStore, SqliteStore
+
+STORE_BACKENDS = {
+    "Csv": lambda directory: CsvStore(directory),
+    "Parquet": lambda directory: ParquetStore(os.path.join(directory, "store")),
+    "Sqlite": lambda directory: SqliteStore(os.path.join(directory, "finops.db")),
+}
+
+
+def make_price_history(ticker_index, dates):
+    data = pd.DataFrame(
+        {column: 1 for column in PRICE_HISTORY_DATA_COLUMNS}, index=range(len(dates))
+    )
+    data["en_ticker"] = f"TICK{ticker_index}"
+    data["date"] = pd.to_datetime(dates)
+    data["close"] = range(len(dates))
+    data["ticker_index"] = ticker_index
+    return data.astype({"close": "float64"})
+
+
+def make_shareholder_data(ticker_index, date, holders, names=None):
+    names = names or {}
+    return pd.DataFrame(
+        {
+            "shareholder_id": list(holders),
+            "shareholder_name": [
+                names.get(holder_id, f"holder {holder_id}") for holder_id in holders
+            ],
+            "isin": f"IRO1TICK{ticker_index}",
+            "date": pd.Timestamp(date),
+            "n_shares": list(holders.values()),
+            "per_shares": [n_shares / 100 for n_shares in holders.values()],
+            "change": 0.0,
+            "change_amount": 0.0,
+            "ticker_index": ticker_index,
+            "req_date": pd.Timestamp(date),
+        }
+    )
+
+
+class BackendTests:
+    """
+    Tests run against every store backend, see :func:`add_backend_tests`.
+    """
+
+    backend = None
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.stores = []
+
+    def tearDown(self):
+        for store in self.stores:
+            if hasattr(store, "close"):
+                store.close()
+        shutil.rmtree(self.directory)
+
+    def create_store(self):
+        store = STORE_BACKENDS[self.backend](self.directory)
+        self.stores.append(store)
+        return store
+
+
+def add_backend_tests(tests, namespace):
+    """
+    Adds one ``unittest.TestCase`` per store backend running ``tests`` to a
+    test module.
+    """
+    for backend in STORE_BACKENDS:
+        name = f"Test{backend}{tests.__name__}"
+        namespace[name] = type(name, (tests, unittest.TestCase), {"backend": backend})
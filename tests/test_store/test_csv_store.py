@@ -0,0 +1,33 @@
+import os
+import shutil
+import tempfile
+import unittest
+import pandas as pd
+from finops.config import PNL_SHEET_COLUMNS
+from finops.store import CsvStore
+
+
+class TestCsvStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store = CsvStore(self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_append_creates_csv_with_header(self):
+        data = pd.DataFrame([dict.fromkeys(PNL_SHEET_COLUMNS, 1)])
+        self.store.append("pnl", data[PNL_SHEET_COLUMNS[::-1]])
+        self.store.append("pnl", data)
+        stored = pd.read_csv(os.path.join(self.directory, "pnl.csv"))
+        self.assertListEqual(stored.columns.tolist(), PNL_SHEET_COLUMNS)
+        self.assertEqual(len(stored), 2)
+
+    def test_read_with_filters(self):
+        data = pd.DataFrame([dict.fromkeys(PNL_SHEET_COLUMNS, 1) for _ in range(3)])
+        data["tracing_id"] = [1, 2, 3]
+        self.store.append("pnl", data)
+        result = self.store.read(
+            "pnl", filters=[("tracing_id", "in", [1, 3])], columns=["tracing_id"]
+        )
+        self.assertListEqual(result.tracing_id.tolist(), [1, 3])
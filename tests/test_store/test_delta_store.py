@@ -0,0 +1,151 @@
+import unittest
+import pandas as pd
+from finops.config import SHAREHOLDER_DATA_COLUMNS
+from finops.codal import Codal
+from finops.store import DeltaStore, Store
+from tests.test_store import BackendTests, add_backend_tests, make_shareholder_data
+
+
+class DeltaStoreTests(BackendTests):
+    def setUp(self):
+        super().setUp()
+        self.store = DeltaStore(self.create_store(), snapshot_interval=5)
+        self.days = {
+            "2023-01-01": {1: 1000, 2: 2000, 3: 3000},
+            "2023-01-02": {1: 1000, 2: 2000, 3: 3000},
+            "2023-01-03": {1: 1500, 2: 2000, 3: 3000, 4: 10},
+            "2023-01-04": {1: 1500, 3: 3000, 4: 10},
+            "2023-01-08": {1: 1500, 3: 3000, 4: 20},
+        }
+        for date, holders in self.days.items():
+            self.store.append("shareholder", make_shareholder_data("1", date, holders))
+        self.store.append(
+            "shareholder", make_shareholder_data("2", "2023-01-02", {1: 700})
+        )
+
+    def assertHoldings(self, holdings, expected):
+        self.assertDictEqual(
+            dict(zip(holdings.shareholder_id.tolist(), holdings.n_shares.tolist())),
+            expected,
+        )
+
+    def test_encoding(self):
+        snapshots = self.store.store.read("shareholder_snapshot")
+        deltas = self.store.store.read("shareholder_delta")
+        self.assertListEqual(
+            sorted(map(str, snapshots.date.dt.date.unique())),
+            ["2023-01-01", "2023-01-02", "2023-01-08"],
+        )
+        self.assertDictEqual(
+            deltas.groupby(deltas.action.astype(str)).size().to_dict(),
+            {"change": 1, "entry": 1, "exit": 1},
+        )
+
+    def test_get_holdings(self):
+        for date, holders in self.days.items():
+            holdings = self.store.get_holdings(date, ["1"])
+            self.assertHoldings(holdings, holders)
+            self.assertTrue((holdings.date == pd.Timestamp(date)).all())
+        self.assertHoldings(
+            self.store.get_holdings("2023-01-06", ["1"]), self.days["2023-01-04"]
+        )
+        self.assertTrue(self.store.get_holdings("2022-12-31").empty)
+
+    def test_get_holdings_across_tickers(self):
+        holdings = self.store.get_holdings("2023-01-03")
+        self.assertDictEqual(
+            holdings.groupby(holdings.ticker_index.astype(str)).size().to_dict(),
+            {"1": 4, "2": 1},
+        )
+        self.assertListEqual(
+            holdings[holdings.shareholder_id == 4]
+            .shareholder_name.astype(str)
+            .tolist(),
+            ["holder 4"],
+        )
+
+    def test_get_holdings_history(self):
+        history = self.store.get_holdings_history("2023-01-02", "2023-01-08", ["1"])
+        self.assertListEqual(
+            sorted(map(str, history.date.dt.date.unique())),
+            ["2023-01-02", "2023-01-03", "2023-01-04", "2023-01-08"],
+        )
+        for date, holdings in history.groupby("date"):
+            self.assertHoldings(holdings, self.days[str(date.date())])
+
+    def test_read(self):
+        data = self.store.read("shareholder", [("ticker_index", "=", "2")])
+        self.assertEqual(len(data), 1)
+        self.assertListEqual(data.columns.tolist(), SHAREHOLDER_DATA_COLUMNS)
+        data = self.store.read(
+            "shareholder",
+            [("ticker_index", "in", ["1", "2"]), ("date", "<", "2023-01-04")],
+            ["ticker_index", "date", "shareholder_id", "change_amount"],
+        )
+        self.assertEqual(data.change_amount.dtype, "float64")
+        self.assertListEqual(
+            sorted(map(str, data.date.dt.date.unique())),
+            ["2023-01-01", "2023-01-02", "2023-01-03"],
+        )
+        self.assertEqual(len(data), 3 + 1 + 4)
+
+    def test_contains(self):
+        self.assertTrue(
+            self.store.contains("shareholder", [("shareholder_id", "=", 4)])
+        )
+        self.assertFalse(
+            self.store.contains("shareholder", [("shareholder_id", "=", 5)])
+        )
+        unchanged = [("shareholder_id", "=", 3), ("date", "=", "2023-01-04")]
+        self.assertTrue(self.store.contains("shareholder", unchanged))
+        exited = [("shareholder_id", "=", 2), ("date", "=", "2023-01-04")]
+        self.assertFalse(self.store.contains("shareholder", exited))
+        not_changed = [("ticker_index", "=", "1"), ("date", "=", "2023-01-06")]
+        self.assertFalse(self.store.contains("shareholder", not_changed))
+
+    def test_resume(self):
+        store = DeltaStore(self.store.store, snapshot_interval=5)
+        store.append(
+            "shareholder",
+            make_shareholder_data("1", "2023-01-09", {1: 1500, 3: 3000, 4: 30}),
+        )
+        self.assertEqual(len(store.store.read("shareholder_delta")), 4)
+        self.assertHoldings(
+            store.get_holdings("2023-01-09", ["1"]), {1: 1500, 3: 3000, 4: 30}
+        )
+
+    def test_repeated_day_is_skipped(self):
+        self.store.append(
+            "shareholder",
+            make_shareholder_data("1", "2023-01-02", self.days["2023-01-02"]),
+        )
+        self.assertEqual(len(self.store.store.read("shareholder_delta")), 3)
+
+    def test_out_of_order_day(self):
+        self.store.append(
+            "shareholder", make_shareholder_data("1", "2023-01-06", {1: 1500, 4: 10})
+        )
+        self.assertHoldings(
+            self.store.get_holdings("2023-01-06", ["1"]), {1: 1500, 4: 10}
+        )
+        for date, holders in self.days.items():
+            self.assertHoldings(self.store.get_holdings(date, ["1"]), holders)
+        self.assertHoldings(self.store.get_holdings("2023-01-02", ["2"]), {1: 700})
+
+    def test_pass_through(self):
+        log = pd.DataFrame({"id": ["1"], "date": [pd.Timestamp("2023-01-01")]})
+        self.store.append("log", log)
+        self.assertEqual(len(self.store.read("log")), 1)
+        with self.assertRaises(ValueError):
+            self.store.overwrite("shareholder", log, [])
+
+    def test_is_a_store(self):
+        self.assertIsInstance(self.store, Store)
+        codal = Codal(self.store)
+        self.assertIs(codal.store, self.store)
+
+
+add_backend_tests(DeltaStoreTests, globals())
+
+if __name__ == "__main__":
+    unittest.main()
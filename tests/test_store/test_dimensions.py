@@ -0,0 +1,83 @@
+import unittest
+from finops.config import SHAREHOLDER_DATA_COLUMNS
+from tests.test_store import BackendTests, add_backend_tests, make_shareholder_data
+
+NAMES = {99: "سازمان تامین اجتماعی", 7: "holder", 8: "new"}
+
+
+class DimensionTests(BackendTests):
+    def setUp(self):
+        super().setUp()
+        self.store = self.create_store()
+        self.store.append(
+            "shareholder",
+            make_shareholder_data("1", "2023-01-01", {99: 1000, 7: 2000}, NAMES),
+        )
+        self.store.append(
+            "shareholder", make_shareholder_data("1", "2023-01-02", {99: 1000}, NAMES)
+        )
+        self.store.append(
+            "shareholder", make_shareholder_data("2", "2023-01-01", {99: 1000}, NAMES)
+        )
+
+    def test_dimension_table(self):
+        dimension = self.store.read("shareholders").sort_values("shareholder_key")
+        self.assertListEqual(dimension.shareholder_key.tolist(), [0, 1, 2])
+        self.assertListEqual(dimension.shareholder_id.tolist(), [99, 7, 99])
+        self.assertListEqual(
+            dimension["isin"].astype(str).tolist(),
+            ["IRO1TICK1", "IRO1TICK1", "IRO1TICK2"],
+        )
+
+    def test_fact_table_keeps_keys(self):
+        columns = self.store._get_columns("shareholder")
+        self.assertIn("shareholder_key", columns)
+        self.assertNotIn("shareholder_name", columns)
+        self.assertNotIn("isin", columns)
+
+    def test_read_joins_attributes(self):
+        data = self.store.read("shareholder").sort_values(
+            ["ticker_index", "date", "shareholder_id"], ignore_index=True
+        )
+        self.assertListEqual(data.columns.tolist(), SHAREHOLDER_DATA_COLUMNS)
+        self.assertListEqual(
+            data.shareholder_name.astype(str).tolist(),
+            ["holder"] + ["سازمان تامین اجتماعی"] * 3,
+        )
+        self.assertListEqual(
+            data["isin"].astype(str).tolist(),
+            ["IRO1TICK1", "IRO1TICK1", "IRO1TICK1", "IRO1TICK2"],
+        )
+
+    def test_read_is_lazy(self):
+        store = self.create_store()
+        data = store.read("shareholder", columns=["shareholder_id", "n_shares"])
+        self.assertEqual(len(data), 4)
+        self.assertDictEqual(store._dimension_tables, {})
+
+    def test_filter_on_attribute(self):
+        data = self.store.read(
+            "shareholder",
+            filters=[("shareholder_name", "=", "holder")],
+            columns=["ticker_index", "shareholder_id"],
+        )
+        self.assertListEqual(data.shareholder_id.tolist(), [7])
+
+    def test_incremental_update(self):
+        store = self.create_store()
+        store.append(
+            "shareholder",
+            make_shareholder_data("2", "2023-01-02", {99: 1000, 8: 2000}, NAMES),
+        )
+        dimension = store.read("shareholders")
+        self.assertEqual(len(dimension), 4)
+        self.assertListEqual(
+            dimension[dimension.shareholder_id == 8].shareholder_key.tolist(), [3]
+        )
+
+
+add_backend_tests(DimensionTests, globals())
+
+
+if __name__ == "__main__":
+    unittest.main()
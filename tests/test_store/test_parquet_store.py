@@ -0,0 +1,85 @@
+import os
+import shutil
+import tempfile
+import unittest
+import pandas as pd
+from finops.store import ParquetStore
+from tests.test_store import make_price_history
+
+
+class TestParquetStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store = ParquetStore(self.directory)
+        self.store.append(
+            "price_history", make_price_history("1", ["2021-12-30", "2022-01-02"])
+        )
+        self.store.append("price_history", make_price_history("2", ["2022-01-03"]))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_partitions(self):
+        path = os.path.join(self.directory, "price_history")
+        self.assertTrue(os.path.isdir(os.path.join(path, "ticker_index=1", "year=2021")))
+        self.assertTrue(os.path.isdir(os.path.join(path, "ticker_index=1", "year=2022")))
+        self.assertTrue(os.path.isdir(os.path.join(path, "ticker_index=2", "year=2022")))
+
+    def test_read_all(self):
+        data = self.store.read("price_history")
+        self.assertEqual(len(data), 3)
+        self.assertEqual(data["date"].dtype.kind, "M")
+        self.assertEqual(data["value"].dtype, "int64")
+        self.assertListEqual(sorted(data["ticker_index"]), ["1", "1", "2"])
+
+    def test_read_with_filters_and_columns(self):
+        data = self.store.read(
+            "price_history",
+            filters=[
+                ("ticker_index", "=", "1"),
+                ("date", ">=", pd.Timestamp(2022, 1, 1)),
+            ],
+            columns=["date", "close"],
+        )
+        expected = pd.DataFrame({"date": pd.to_datetime(["2022-01-02"]), "close": [1.0]})
+        pd.testing.assert_frame_equal(data, expected, check_dtype=False)
+
+    def test_compact(self):
+        self.store.append("price_history", make_price_history("2", ["2022-01-04"]))
+        self.store.compact("price_history")
+        directory = os.path.join(self.directory, "price_history", "ticker_index=2", "year=2022")
+        self.assertEqual(len(os.listdir(directory)), 1)
+        self.assertEqual(len(self.store.read("price_history")), 4)
+
+    def test_overwrite_partition(self):
+        self.store.overwrite(
+            "price_history",
+            make_price_history("1", ["2022-01-05"]),
+            [("ticker_index", "=", "1")],
+        )
+        path = os.path.join(self.directory, "price_history")
+        self.assertListEqual(
+            sorted(os.listdir(path)), ["_common_metadata", "ticker_index=1", "ticker_index=2"]
+        )
+        data = self.store.read("price_history", filters=[("ticker_index", "=", "1")])
+        self.assertListEqual(data.date.tolist(), [pd.Timestamp(2022, 1, 5)])
+        self.assertEqual(len(self.store.read("price_history")), 2)
+        with self.assertRaises(ValueError):
+            self.store.overwrite(
+                "price_history",
+                make_price_history("2", ["2022-01-05"]),
+                [("ticker_index", "=", "1")],
+            )
+        with self.assertRaises(ValueError):
+            self.store.overwrite(
+                "price_history",
+                make_price_history("1", ["2022-01-05"]),
+                [("date", ">", pd.Timestamp(2022, 1, 1))],
+            )
+
+    def test_missing_columns(self):
+        with self.assertRaises(ValueError):
+            self.store.append("price_history", pd.DataFrame({"date": []}))
+
+    def test_read_missing_dataset(self):
+        self.assertTrue(self.store.read("pnl").empty)
@@ -0,0 +1,134 @@
+import os
+import shutil
+import tempfile
+import unittest
+import pandas as pd
+from finops.config import PNL_SHEET_COLUMNS
+from finops.store import (
+    CsvStore,
+    ParquetStore,
+    SqliteStore,
+    iter_dataset,
+    read_codal_sheet,
+    read_letters_list,
+    read_price_history,
+    read_shareholder_data,
+)
+from tests.test_store import make_price_history, make_shareholder_data
+
+
+class TestQuery(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "price_history.csv")
+        self.dates = pd.date_range("2021-12-25", periods=20).strftime("%Y-%m-%d")
+        self.price_history = pd.concat(
+            [make_price_history(ticker_index, self.dates) for ticker_index in "123"],
+            ignore_index=True,
+        )
+        self.price_history.to_csv(self.path, index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_read_price_history_from_csv(self):
+        data = read_price_history(
+            self.path,
+            tickers_index_list=[2],
+            start_date="2022-01-01",
+            end_date="2022-01-03",
+            columns=["date", "close", "ticker_index"],
+            chunksize=7,
+        )
+        self.assertListEqual(data.columns.tolist(), ["date", "close", "ticker_index"])
+        self.assertListEqual(data.close.tolist(), [7, 8, 9])
+        self.assertListEqual(data.ticker_index.astype(str).unique().tolist(), ["2"])
+        self.assertEqual(data.ticker_index.dtype, "category")
+
+    def test_iter_dataset_streams_chunks(self):
+        chunks = list(
+            iter_dataset(
+                self.path,
+                "price_history",
+                [("ticker_index", "in", ["1", "3"])],
+                ["close"],
+                chunksize=10,
+            )
+        )
+        self.assertEqual(len(chunks), 6)
+        self.assertEqual(sum(len(chunk) for chunk in chunks), 40)
+
+    def test_iter_dataset_streams_store_chunks(self):
+        stores = [
+            ParquetStore(os.path.join(self.directory, "store")),
+            SqliteStore(os.path.join(self.directory, "finops.db")),
+        ]
+        for store in stores:
+            store.append("price_history", self.price_history)
+            chunks = list(
+                iter_dataset(
+                    store,
+                    "price_history",
+                    [
+                        ("ticker_index", "in", ["1", "3"]),
+                        ("date", ">=", pd.Timestamp(2022, 1, 1)),
+                    ],
+                    ["close"],
+                    chunksize=5,
+                )
+            )
+            self.assertGreater(len(chunks), 1)
+            self.assertTrue(all(len(chunk) <= 5 for chunk in chunks))
+            self.assertEqual(sum(len(chunk) for chunk in chunks), 26)
+        stores[1].close()
+
+    def test_read_price_history_from_store(self):
+        store = ParquetStore(os.path.join(self.directory, "store"))
+        store.append("price_history", self.price_history)
+        data = read_price_history(
+            store, ["3"], start_date="2022-01-10", columns=["date", "close"]
+        )
+        self.assertListEqual(data.close.tolist(), [16, 17, 18, 19])
+
+    def test_read_shareholder_data(self):
+        path = os.path.join(self.directory, "shareholders.csv")
+        pd.concat(
+            [
+                make_shareholder_data("1", "2022-01-01", {1: 10, 2: 20}),
+                make_shareholder_data("1", "2022-01-02", {1: 30}),
+            ]
+        ).drop(columns=["change", "change_amount"]).to_csv(path, index=False)
+        data = read_shareholder_data(path, ["1"], shareholder_ids=[1])
+        self.assertListEqual(data.n_shares.tolist(), [10, 30])
+
+    def test_read_codal(self):
+        store = CsvStore(self.directory)
+        store.append(
+            "letters_list",
+            pd.DataFrame(
+                {
+                    "tracing_id": [1, 2],
+                    "symbol": ["فولاد", "خودرو"],
+                    "letter_title": "",
+                    "is_audited": True,
+                    "is_correction": False,
+                    "is_consolidated": False,
+                    "period_type": "year",
+                    "period_length": 12,
+                    "period_end_date": "1401/12/29",
+                    "url": "",
+                }
+            ),
+        )
+        pnl = pd.DataFrame([dict.fromkeys(PNL_SHEET_COLUMNS, 1.0) for _ in range(2)])
+        pnl["tracing_id"] = [1, 2]
+        store.append("pnl", pnl)
+        letters = read_letters_list(store, symbols=["فولاد"])
+        data = read_codal_sheet(store, "pnl", letters.tracing_id, ["tracing_id"])
+        self.assertListEqual(data.tracing_id.tolist(), [1])
+        with self.assertRaises(ValueError):
+            read_codal_sheet(store, "letters_list")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import pandas as pd
+from finops.config import PNL_SHEET_COLUMNS
+from finops.store import SqliteStore
+from finops.utils.scraper import Scraper
+from tests.test_store import make_price_history
+
+
+class TestSqliteStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store = SqliteStore(os.path.join(self.directory, "finops.db"))
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.directory)
+
+    def test_wal_mode(self):
+        mode = self.store._get_connection().execute("PRAGMA journal_mode").fetchone()
+        self.assertEqual(mode[0], "wal")
+
+    def test_upsert_is_idempotent(self):
+        data = make_price_history("1", ["2022-01-01", "2022-01-02"])
+        self.store.append("price_history", data)
+        self.store.append("price_history", data.assign(close=9.0))
+        result = self.store.read("price_history")
+        self.assertEqual(len(result), 2)
+        self.assertListEqual(result.close.tolist(), [9.0, 9.0])
+        self.assertListEqual(
+            result.date.tolist(), list(pd.to_datetime(["2022-01-01", "2022-01-02"]))
+        )
+        self.assertListEqual(result.ticker_index.tolist(), ["1", "1"])
+
+    def test_read_with_filters(self):
+        self.store.append(
+            "price_history", make_price_history("1", ["2021-12-30", "2022-01-02"])
+        )
+        self.store.append("price_history", make_price_history("2", ["2022-01-03"]))
+        result = self.store.read(
+            "price_history",
+            filters=[
+                ("ticker_index", "in", ["1", "2"]),
+                ("date", ">=", pd.Timestamp("2022-01-01")),
+            ],
+            columns=["ticker_index", "date"],
+        )
+        self.assertListEqual(result.ticker_index.tolist(), ["1", "2"])
+        self.assertTrue(self.store.contains("price_history", [("ticker_index", "=", "2")]))
+        self.assertFalse(self.store.contains("price_history", [("ticker_index", "=", "3")]))
+        with self.assertRaises(ValueError):
+            self.store.read("price_history", filters=[("date", "~", 1)])
+
+    def test_read_missing_dataset(self):
+        result = self.store.read("pnl")
+        self.assertTrue(result.empty)
+        self.assertListEqual(result.columns.tolist(), PNL_SHEET_COLUMNS)
+        self.assertFalse(self.store.contains("pnl", [("tracing_id", "=", "1")]))
+
+    def test_concurrent_appends(self):
+        def append(ticker_index):
+            self.store.append(
+                "price_history", make_price_history(ticker_index, ["2022-01-01"])
+            )
+            self.store.close()
+
+        threads = [threading.Thread(target=append, args=(str(i),)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self.store.read("price_history")), 8)
+
+    def test_scrape_log(self):
+        date = pd.Timestamp("2022-01-01")
+        Scraper._save_log(log_path=self.store, id="1", date=date)
+        Scraper._save_log(log_path=self.store, id="1", date=date)
+        Scraper._save_log(log_path=self.store, id="2", date=date)
+        self.assertListEqual(Scraper()._load_scraped_dates(self.store, "1"), [date])
+        self.assertListEqual(Scraper()._load_scraped_dates(self.store, "3"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,16 @@
+import os
+import json
+import shutil
+import asyncio
+import tempfile
 import unittest
+from unittest.mock import Mock, patch
 import pandas as pd
-from finops.tehran_stock_exchange import TehranStockExchange
+from finops.tehran_stock_exchange import TehranStockExchange, AsyncTehranStockExchange
+from finops.utils.downloader import Downloader
+from finops.store import ParquetStore, CsvStore, SqliteStore
+from finops.ticker import Ticker
+from finops.config import PRICE_HISTORY_DATA_COLUMNS, SHAREHOLDER_DATA_COLUMNS
 
 
 class TehranStockExchangeTests(unittest.TestCase):
@@ -96,3 +106,247 @@ class TehranStockExchangeTests(unittest.TestCase):
         result = self.scraper.get_stock_tickers_index_list()
         expected_result = ["ticker_url_1", "ticker_url_3"]
         self.assertEqual(result, expected_result)
+
+
+PRICE_HISTORY_CSV = (
+    "<TICKER>,<DTYYYYMMDD>,<FIRST>,<HIGH>,<LOW>,<CLOSE>,<VALUE>,<VOL>,<OPENINT>,<PER>,<OPEN>,<LAST>\n"
+    "TICK,20230522,10.0,12.0,9.0,11.0,1000,100,5,D,10.0,11.0\n"
+    "TICK,20230521,9.0,10.0,8.0,10.0,900,90,4,D,9.0,10.0\n"
+)
+
+
+def fake_download(url, user_agent=None, timeout=None, cache_ttl=None):
+    response = Mock()
+    if "Export-txt" in url:
+        response.content = PRICE_HISTORY_CSV.encode("utf8")
+    else:
+        date = url.rsplit("/", 1)[-1]
+        response.content = json.dumps(
+            {
+                "shareShareholder": [
+                    {
+                        "shareHolderID": 99,
+                        "shareHolderName": "holder",
+                        "cIsin": "IRO1TICK0001",
+                        "dEven": int(date),
+                        "numberOfShares": 1000.0,
+                        "perOfShares": 10.5,
+                        "change": 0,
+                        "changeAmount": 0.0,
+                    }
+                ]
+            }
+        ).encode("utf8")
+    return response
+
+
+class AsyncTehranStockExchangeTests(unittest.TestCase):
+    def setUp(self):
+        Ticker.price_history_memo.clear()
+        self.directory = tempfile.mkdtemp()
+        self.tickers_index_list = ["1", "2", "3"]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    @patch.object(Downloader, "_download", side_effect=fake_download)
+    def test_aget_price_histories_matches_sync(self, _):
+        TehranStockExchange().get_price_histories(
+            self._path("sync.csv"), self.tickers_index_list
+        )
+        asyncio.run(
+            AsyncTehranStockExchange(max_concurrency=2).aget_price_histories(
+                self._path("async.csv"), self.tickers_index_list
+            )
+        )
+        sync_df = pd.read_csv(self._path("sync.csv"), dtype={"ticker_index": str})
+        async_df = pd.read_csv(self._path("async.csv"), dtype={"ticker_index": str})
+        pd.testing.assert_frame_equal(
+            sync_df.sort_values(["ticker_index", "date"], ignore_index=True),
+            async_df.sort_values(["ticker_index", "date"], ignore_index=True),
+        )
+
+    @patch.object(Downloader, "_download", side_effect=fake_download)
+    def test_aget_shareholders_data(self, _):
+        asyncio.run(
+            AsyncTehranStockExchange(max_concurrency=2).aget_shareholders_data(
+                pd.Timestamp(2023, 1, 1),
+                pd.Timestamp(2024, 1, 1),
+                self._path("shareholders.csv"),
+                self._path("log.csv"),
+                self.tickers_index_list,
+            )
+        )
+        data = pd.read_csv(self._path("shareholders.csv"), dtype={"ticker_index": str})
+        log = pd.read_csv(self._path("log.csv"), dtype={"id": str})
+        self.assertEqual(len(data), 6)
+        self.assertEqual(len(log), 6)
+        self.assertListEqual(sorted(log.id.unique()), self.tickers_index_list)
+
+    @patch.object(Downloader, "_download", side_effect=fake_download)
+    def test_async_downloads_share_price_history_memo(self, mock_download):
+        exchange = AsyncTehranStockExchange(max_concurrency=2)
+        asyncio.run(
+            exchange.aget_price_histories(
+                self._path("price_history.csv"), self.tickers_index_list
+            )
+        )
+        asyncio.run(
+            exchange.aget_shareholders_data(
+                pd.Timestamp(2023, 1, 1),
+                pd.Timestamp(2024, 1, 1),
+                self._path("shareholders.csv"),
+                self._path("log.csv"),
+                self.tickers_index_list,
+            )
+        )
+        urls = [call.args[0] for call in mock_download.call_args_list]
+        self.assertEqual(len([url for url in urls if "Export-txt" in url]), 3)
+        self.assertEqual(len(urls), 9)
+
+    @patch.object(Downloader, "_download", side_effect=fake_download)
+    def test_aget_shareholders_data_raises_ticker_errors(self, _):
+        with patch.object(
+            Ticker, "aget_traded_dates", side_effect=ConnectionError("refused")
+        ), self.assertLogs("finops.logger", "ERROR") as logs, self.assertRaises(
+            ConnectionError
+        ):
+            asyncio.run(
+                AsyncTehranStockExchange(max_concurrency=2).aget_shareholders_data(
+                    pd.Timestamp(2023, 1, 1),
+                    pd.Timestamp(2024, 1, 1),
+                    self._path("shareholders.csv"),
+                    self._path("log.csv"),
+                    self.tickers_index_list,
+                )
+            )
+        self.assertEqual(len(logs.output), 3)
+        self.assertIn("failed to get 2 shareholder data: refused", logs.output[1])
+
+    @patch.object(Downloader, "_download", side_effect=fake_download)
+    def test_get_shareholders_data(self, _):
+        TehranStockExchange().get_shareholders_data(
+            pd.Timestamp(2023, 1, 1),
+            pd.Timestamp(2024, 1, 1),
+            self._path("shareholders.csv"),
+            self._path("log.csv"),
+            self.tickers_index_list,
+            n_threads=3,
+        )
+        data = pd.read_csv(self._path("shareholders.csv"), dtype={"ticker_index": str})
+        log = pd.read_csv(self._path("log.csv"), dtype={"id": str})
+        self.assertEqual(len(data), 6)
+        self.assertEqual(len(log), 6)
+        self.assertListEqual(sorted(data.ticker_index.unique()), self.tickers_index_list)
+
+    @patch.object(Downloader, "_download", side_effect=fake_download)
+    def test_get_shareholders_data_existing_csv(self, _):
+        pd.DataFrame(columns=SHAREHOLDER_DATA_COLUMNS).to_csv(
+            self._path("shareholders.csv"), index=False
+        )
+        TehranStockExchange().get_shareholders_data(
+            pd.Timestamp(2023, 1, 1),
+            pd.Timestamp(2024, 1, 1),
+            self._path("shareholders.csv"),
+            self._path("log.csv"),
+            self.tickers_index_list,
+        )
+        data = pd.read_csv(self._path("shareholders.csv"))
+        self.assertListEqual(data.columns.tolist(), SHAREHOLDER_DATA_COLUMNS)
+        self.assertEqual(len(data), 6)
+
+    @patch.object(Downloader, "_download", side_effect=fake_download)
+    def test_get_shareholders_data_resumes(self, download):
+        args = (
+            pd.Timestamp(2023, 1, 1),
+            pd.Timestamp(2024, 1, 1),
+            self._path("shareholders.csv"),
+            self._path("log.csv"),
+            self.tickers_index_list,
+        )
+        TehranStockExchange().get_shareholders_data(*args)
+        n_calls = download.call_count
+        TehranStockExchange().get_shareholders_data(*args)
+        shareholder_calls = [
+            call
+            for call in download.call_args_list[n_calls:]
+            if "Export-txt" not in call[0][0]
+        ]
+        self.assertListEqual(shareholder_calls, [])
+        self.assertEqual(len(pd.read_csv(self._path("log.csv"))), 6)
+
+    @patch.object(Downloader, "_download", side_effect=fake_download)
+    def test_get_price_histories_parquet_store(self, _):
+        store = ParquetStore(self._path("store"))
+        TehranStockExchange().get_price_histories(store, self.tickers_index_list)
+        price_history = store.read(
+            "price_history", filters=[("ticker_index", "=", "2")]
+        )
+        self.assertEqual(len(price_history), 2)
+        self.assertListEqual(
+            price_history.columns.tolist(), PRICE_HISTORY_DATA_COLUMNS
+        )
+
+
+class IncrementalPriceHistoryTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.tickers_index_list = ["1", "2"]
+        Ticker.price_history_memo.clear()
+
+    def tearDown(self):
+        Ticker.price_history_memo.clear()
+        shutil.rmtree(self.directory)
+
+    def _sync(self, store, price_history_csv):
+        def download(url, user_agent=None, timeout=None, cache_ttl=None):
+            response = Mock()
+            response.content = price_history_csv.encode("utf8")
+            return response
+
+        Ticker.price_history_memo.clear()
+        with patch.object(Downloader, "_download", side_effect=download):
+            return TehranStockExchange().get_price_histories(
+                store, self.tickers_index_list, incremental=True
+            )
+
+    def _test_incremental_sync(self, store):
+        self.assertDictEqual(self._sync(store, PRICE_HISTORY_CSV), {"1": 2, "2": 2})
+        self.assertDictEqual(self._sync(store, PRICE_HISTORY_CSV), {"1": 0, "2": 0})
+        new_bar = "TICK,20230523,11.0,12.0,10.0,12.0,800,80,3,D,11.0,12.0\n"
+        self.assertDictEqual(
+            self._sync(store, PRICE_HISTORY_CSV + new_bar), {"1": 1, "2": 1}
+        )
+        self.assertEqual(len(store.read("price_history")), 6)
+        revised_csv = (PRICE_HISTORY_CSV + new_bar).replace(
+            "20230521,9.0,10.0,8.0,10.0", "20230521,9.0,10.0,8.0,5.0"
+        )
+        with patch.object(store, "read", wraps=store.read) as read, patch.object(
+            store, "overwrite", wraps=store.overwrite
+        ) as overwrite:
+            self.assertDictEqual(self._sync(store, revised_csv), {"1": 3, "2": 3})
+        self.assertEqual(read.call_count, 2)
+        overwrite.assert_called_once()
+        price_history = store.read(
+            "price_history", filters=[("ticker_index", "=", "1")]
+        ).sort_values("date", ignore_index=True)
+        self.assertListEqual(price_history.close.tolist(), [5.0, 11.0, 12.0])
+        self.assertEqual(len(store.read("price_history")), 6)
+
+    def test_incremental_sync_parquet_store(self):
+        self._test_incremental_sync(ParquetStore(os.path.join(self.directory, "store")))
+
+    def test_incremental_sync_csv_store(self):
+        self._test_incremental_sync(CsvStore(self.directory))
+
+    def test_incremental_sync_sqlite_store(self):
+        store = SqliteStore(os.path.join(self.directory, "finops.db"))
+        self._test_incremental_sync(store)
+        store.close()
+
+    def test_incremental_sync_needs_store(self):
+        with self.assertRaises(ValueError):
+            self._sync(os.path.join(self.directory, "prices.csv"), PRICE_HISTORY_CSV)
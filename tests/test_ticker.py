@@ -10,6 +10,7 @@ from finops.config import (
     SHAREHOLDER_DATA_COLUMNS,
     PRICE_HISTORY_FIELD_MAP,
     SHAREHOLDER_FIELD_MAP,
+    SHAREHOLDER_DATA_DTYPES,
 )
 
 
@@ -55,6 +56,8 @@ class TestTicker(unittest.TestCase):
                 "per_shares": [10.5, 15.25],
                 "ticker_index": self.ticker_index,
                 "req_date": datetime(2021, 6, 1),
+                "change": [0.05, 0.1],
+                "change_amount": [50, 100],
             }
         )
 
@@ -128,8 +131,9 @@ class TestTicker(unittest.TestCase):
                 },
             ]
         )
+        expected_result = Ticker._apply_dtypes(expected_result, SHAREHOLDER_DATA_DTYPES)
         self.assertIsInstance(result, pd.DataFrame)
-        pd.testing.assert_frame_equal(result, expected_result)
+        pd.testing.assert_frame_equal(result[SHAREHOLDER_DATA_COLUMNS], expected_result)
 
     def test_get_traded_dates(self):
         traded_dates = self.ticker.get_traded_dates()
@@ -0,0 +1,115 @@
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+import requests
+from finops.config import CACHE_FOREVER, TICKERS_URL, SHAREHOLDER_URL
+from finops.utils.cache import ResponseCache
+from finops.utils.downloader import Downloader
+
+
+def make_response(content, status_code=200, headers=None):
+    response = requests.Response()
+    response._content = content
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response.encoding = "utf8"
+    return response
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = ResponseCache(self.directory, max_size=10)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_put_and_load(self):
+        self.cache.put("http://a", make_response(b"abc"))
+        entry = self.cache.get("http://a")
+        self.assertTrue(self.cache.is_fresh(entry))
+        self.assertEqual(self.cache.load("http://a", entry).content, b"abc")
+
+    def test_identical_bodies_are_stored_once(self):
+        self.cache.put("http://a", make_response(b"abc"))
+        self.cache.put("http://b", make_response(b"abc"))
+        self.assertEqual(self.cache.size, 3)
+        self.assertEqual(self.cache.stats()["entries"], 2)
+
+    def test_lru_eviction(self):
+        self.cache.put("http://a", make_response(b"aaaa"))
+        self.cache.put("http://b", make_response(b"bbbb"))
+        self.cache.get("http://a")
+        self.cache.put("http://c", make_response(b"cccc"))
+        self.assertIsNotNone(self.cache.get("http://a"))
+        self.assertIsNone(self.cache.get("http://b"))
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+    def test_persistence(self):
+        self.cache.put("http://a", make_response(b"abc", headers={"ETag": '"1"'}))
+        cache = ResponseCache(self.directory, max_size=10)
+        entry = cache.get("http://a")
+        self.assertEqual(cache.load("http://a", entry).content, b"abc")
+        self.assertDictEqual(cache.get_validators(entry), {"If-None-Match": '"1"'})
+
+    def test_ttl(self):
+        self.cache.put("http://a", make_response(b"abc"), ttl=0)
+        self.assertFalse(self.cache.is_fresh(self.cache.get("http://a")))
+        self.cache.put("http://b", make_response(b"abc"), ttl=CACHE_FOREVER)
+        self.assertTrue(self.cache.is_fresh(self.cache.get("http://b")))
+
+    def test_get_ttl(self):
+        self.assertEqual(self.cache.get_ttl(TICKERS_URL), 24 * 60 * 60)
+        self.assertEqual(
+            self.cache.get_ttl(SHAREHOLDER_URL.format(ticker_index=1, date=20230522)),
+            CACHE_FOREVER,
+        )
+        self.assertIsNone(self.cache.get_ttl("https://www.codal.ir/Reports/"))
+
+
+class TestDownloaderCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = Downloader.enable_cache(self.directory)
+
+    def tearDown(self):
+        Downloader.disable_cache()
+        shutil.rmtree(self.directory)
+
+    def test_download_hit(self):
+        with patch.object(
+            Downloader, "_request", return_value=make_response(b"page")
+        ) as mock_request:
+            Downloader._download(TICKERS_URL)
+            response = Downloader._download(TICKERS_URL)
+        self.assertEqual(response.content, b"page")
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    def test_download_revalidation(self):
+        with patch.object(
+            Downloader,
+            "_request",
+            side_effect=[
+                make_response(b"page", headers={"ETag": '"v1"'}),
+                make_response(b"", status_code=304),
+            ],
+        ) as mock_request:
+            Downloader._download(TICKERS_URL, cache_ttl=0)
+            response = Downloader._download(TICKERS_URL, cache_ttl=0)
+        self.assertEqual(response.content, b"page")
+        self.assertDictEqual(
+            mock_request.call_args.kwargs["headers"], {"If-None-Match": '"v1"'}
+        )
+        self.assertEqual(self.cache.stats()["revalidations"], 1)
+
+    def test_download_not_cacheable(self):
+        with patch.object(
+            Downloader, "_request", return_value=make_response(b"letter")
+        ) as mock_request:
+            Downloader._download("https://www.codal.ir/Reports/Decision.aspx")
+            Downloader._download("https://www.codal.ir/Reports/Decision.aspx")
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertEqual(self.cache.stats()["entries"], 0)
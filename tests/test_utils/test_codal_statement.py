@@ -0,0 +1,59 @@
+import os
+import json
+import unittest
+from finops.utils.codal_statement import (
+    extract_datasource,
+    get_datasource_rows,
+    extract_statement_rows,
+)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "codal")
+
+
+def read_page(name):
+    with open(os.path.join(DATA_DIR, name), encoding="utf8") as f:
+        return f.read()
+
+
+class TestCodalStatement(unittest.TestCase):
+    def test_extract_datasource(self):
+        datasource = extract_datasource(read_page("dynamic_statement.html"))
+        self.assertEqual(datasource["sheets"][0]["title_Fa"], "صورت سود و زیان")
+        self.assertIsNone(extract_datasource(read_page("static_statement.html")))
+        self.assertIsNone(extract_datasource("<script>var datasource = {</script>"))
+
+    def test_datasource_rows(self):
+        rows = extract_statement_rows(read_page("dynamic_statement.html"))
+        self.assertEqual(len(rows), 7)
+        self.assertListEqual(rows[0], ["درآمدهای عملیاتی", "12,500,000", "9,800,000"])
+        self.assertListEqual(rows[4], ["سود (زیان) خالص", "(150,000)", "1,450,000"])
+
+    def test_datasource_rows_values(self):
+        datasource = json.loads(
+            '{"sheets": [{"tables": ['
+            '{"cells": [{"rowSequence": 1, "columnSequence": 2, "value": 12},'
+            '{"rowSequence": 1, "columnSequence": 1, "value": "a"},'
+            '{"rowSequence": 2, "columnSequence": 1, "value": null}]},'
+            '{"cells": [{"rowSequence": 1, "columnSequence": 1, "value": "b"}]}'
+            "]}]}"
+        )
+        self.assertListEqual(
+            get_datasource_rows(datasource), [["a", "12"], [None], ["b"]]
+        )
+        self.assertIsNone(get_datasource_rows({"sheets": []}))
+
+    def test_static_rows(self):
+        rows = extract_statement_rows(read_page("static_statement.html"))
+        self.assertListEqual(rows[0], [])
+        self.assertListEqual(rows[2][:2], ["جمع دارایی‌های جاری", "8,500"])
+        self.assertEqual(len(rows), 7)
+
+    def test_no_statement(self):
+        self.assertIsNone(extract_statement_rows("<html><body></body></html>"))
+        self.assertIsNone(
+            extract_statement_rows('<div class="table_wrapper"><p>-</p></div>')
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,6 +5,7 @@ import unittest
 from unittest.mock import patch, Mock
 from io import StringIO
 from finops.utils.downloader import Downloader
+from finops.utils.preprocessor import Preprocessor
 
 
 class TestDownloader(unittest.TestCase):
@@ -33,7 +34,7 @@ class TestDownloader(unittest.TestCase):
         df = pd.read_csv(self.path)
         self.assertListEqual(df.columns.tolist(), self.columns)
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_download(self, mock_get):
         mock_response = Mock()
         mock_response.raise_for_status.return_value = None
@@ -58,6 +59,25 @@ class TestDownloader(unittest.TestCase):
         expected_df = pd.DataFrame({"col1": [1, 4], "col2": [2, 5], "col3": [3, 6]})
         pd.testing.assert_frame_equal(parsed_response, expected_df)
 
+    def test_parse_price_history_response(self):
+        response = Mock()
+        response.content = (
+            b"<TICKER>,<DTYYYYMMDD>,<FIRST>,<HIGH>,<LOW>,<CLOSE>,<VALUE>,<VOL>,<OPENINT>,<PER>,<OPEN>,<LAST>\n"
+            b"TICK,20230522,10.00,12.00,9.00,11.00,1000,100,5,D,10.00,11.00\n"
+        )
+        parsed_response = Downloader._parse_price_history_response(response)
+        self.assertEqual(parsed_response["<DTYYYYMMDD>"].dtype, "int32")
+        self.assertNotIn("<PER>", parsed_response.columns)
+        generic_response = pd.read_csv(StringIO(response.content.decode("utf8")))
+        pd.testing.assert_frame_equal(
+            Preprocessor._preprocess_price_history_data(parsed_response, "1"),
+            Preprocessor._preprocess_price_history_data(generic_response, "1"),
+            check_dtype=False,
+        )
+        with patch("finops.utils.downloader.pyarrow", None):
+            fallback_response = Downloader._parse_price_history_response(response)
+        pd.testing.assert_frame_equal(fallback_response, parsed_response)
+
     def test_store_existing_file(self):
         existing_df = pd.DataFrame({"col1": [1, 2], "col2": [3, 4], "col3": [5, 6]})
         existing_df.to_csv(self.path, index=False, mode="w", header=True)
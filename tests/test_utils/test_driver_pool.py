@@ -0,0 +1,111 @@
+import threading
+import unittest
+from unittest.mock import Mock, PropertyMock, patch
+from finops.utils.driver_pool import DriverPool
+
+
+class TestDriverPool(unittest.TestCase):
+    def test_drivers_are_started_lazily(self):
+        create_driver = Mock(side_effect=lambda: Mock())
+        with DriverPool(create_driver, 3) as drivers:
+            create_driver.assert_not_called()
+            with drivers.lease() as first:
+                pass
+            with drivers.lease() as second:
+                self.assertIs(first, second)
+            self.assertEqual(create_driver.call_count, 1)
+            stats = drivers.stats()
+        self.assertEqual(stats["started"], 1)
+        self.assertEqual(stats["leases"], 2)
+        self.assertEqual((stats["running"], stats["in_use"], stats["idle"]), (1, 0, 1))
+        first.quit.assert_called_once()
+
+    def test_driver_is_released_on_errors(self):
+        drivers = DriverPool(Mock, 1)
+        with self.assertRaises(TimeoutError):
+            with drivers.lease():
+                raise TimeoutError
+        with drivers.lease(timeout=0):
+            self.assertEqual(drivers.stats()["in_use"], 1)
+        self.assertEqual(drivers.stats()["idle"], 1)
+
+    def test_acquire_waits_for_a_driver(self):
+        drivers = DriverPool(Mock, 1)
+        driver = drivers.acquire()
+        with self.assertRaises(TimeoutError):
+            drivers.acquire(timeout=0.01)
+        threading.Timer(0.05, drivers.release, args=(driver,)).start()
+        self.assertIs(drivers.acquire(timeout=5), driver)
+        self.assertGreater(drivers.stats()["wait_time"], 0)
+
+    def test_unhealthy_driver_is_replaced(self):
+        broken = Mock()
+        create_driver = Mock(side_effect=[broken, Mock()])
+        drivers = DriverPool(create_driver, 1)
+        with drivers.lease():
+            pass
+        type(broken).current_url = PropertyMock(side_effect=ConnectionError)
+        with drivers.lease() as driver:
+            self.assertIsNot(driver, broken)
+        broken.quit.assert_called_once()
+        stats = drivers.stats()
+        self.assertEqual(
+            (stats["unhealthy"], stats["started"], stats["running"]), (1, 2, 1)
+        )
+
+    def test_driver_is_recycled_after_max_pages(self):
+        created = []
+        drivers = DriverPool(
+            lambda: created.append(Mock()) or created[-1], 2, max_pages=2
+        )
+        for _ in range(5):
+            with drivers.lease():
+                pass
+        self.assertEqual(len(created), 3)
+        self.assertEqual(drivers.stats()["recycled"], 2)
+        created[0].quit.assert_called_once()
+        created[2].quit.assert_not_called()
+
+    def test_driver_is_recycled_after_pages_loaded_in_one_lease(self):
+        created = []
+        drivers = DriverPool(
+            lambda: created.append(Mock()) or created[-1], 1, max_pages=3
+        )
+        drivers.release(drivers.acquire(), n_pages=3)
+        drivers.release(drivers.acquire(), n_pages=2)
+        self.assertEqual(len(created), 2)
+        created[0].quit.assert_called_once()
+        created[1].quit.assert_not_called()
+        self.assertEqual(drivers.stats()["pages"], 5)
+
+    def test_driver_is_recycled_on_memory_growth(self):
+        memory = iter([100, 150, 400])
+        drivers = DriverPool(Mock, 1, max_memory_growth=200)
+        with patch.object(
+            DriverPool, "_get_memory", side_effect=lambda driver: next(memory)
+        ):
+            with drivers.lease() as first:
+                pass
+            with drivers.lease() as second:
+                pass
+        self.assertIs(first, second)
+        first.quit.assert_called_once()
+        self.assertEqual(drivers.stats()["recycled"], 1)
+
+    def test_close(self):
+        drivers = DriverPool(Mock, 2)
+        idle = drivers.acquire()
+        leased = drivers.acquire()
+        drivers.release(idle)
+        drivers.close()
+        idle.quit.assert_called_once()
+        leased.quit.assert_not_called()
+        drivers.release(leased)
+        leased.quit.assert_called_once()
+        self.assertEqual(drivers.stats()["running"], 0)
+        with self.assertRaises(ValueError):
+            drivers.acquire()
+
+
+if __name__ == "__main__":
+    unittest.main()
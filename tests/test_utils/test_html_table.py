@@ -0,0 +1,87 @@
+import unittest
+from unittest.mock import patch
+import pandas as pd
+from finops.utils.html_table import extract_table_rows, rows_to_frame
+from finops.utils.preprocessor import Preprocessor
+
+TICKERS_PAGE = """
+<html><body>
+<table class="menu"><tr><td>منو</td></tr></table>
+<table class="table1">
+<tr><th>نماد</th><th>ISIN</th></tr>
+<tr>
+<td><a href="/instInfo/35425587644337450">فولاد مباركه (فولاد)</a></td>
+<td>IRO1FOLD0001</td><td>Foolad</td><td>FOLD1</td><td>IRO1FOLD0000</td>
+<td>بازار اول</td><td>فلزات اساسي</td>
+</tr>
+<tr>
+<td><a href="/instInfo/2400322364771558">ح . توسعه (ح.توسعه)</a></td>
+<td>IRR1TOSE0101</td><td>Tose R</td><td>TOSE1</td><td>IRO1TOSE0000</td>
+<td>بازار دوم</td><td>&nbsp;محصولات</td>
+</tr>
+</table>
+</body></html>
+"""
+
+LETTER_FRAGMENT = """
+<div class="table_wrapper"><table>
+<tr><td>شرح</td><td>1,234</td><td><span>(56)</span></td></tr>
+<tr></tr>
+<tr><td>جمع</td></tr>
+</table></div>
+"""
+
+
+class TestHtmlTable(unittest.TestCase):
+    def extract_with_both_parsers(self, html, **kwargs):
+        rows = extract_table_rows(html, **kwargs)
+        with patch("finops.utils.html_table.lxml", None):
+            fallback_rows = extract_table_rows(html, **kwargs)
+        self.assertListEqual(rows, fallback_rows)
+        return rows
+
+    def test_extract_table_rows(self):
+        rows = self.extract_with_both_parsers(LETTER_FRAGMENT)
+        self.assertListEqual(rows, [["شرح", "1,234", "(56)"], [], ["جمع"]])
+
+    def test_extract_table_rows_by_class(self):
+        rows = self.extract_with_both_parsers(
+            TICKERS_PAGE, table_class="table1", links=True
+        )
+        self.assertEqual(len(rows), 3)
+        self.assertListEqual(rows[0], [])
+        self.assertEqual(rows[1][-1], "/instInfo/35425587644337450")
+        self.assertEqual(rows[2][6], "\xa0محصولات")
+
+    def test_extract_table_rows_missing_table(self):
+        with self.assertRaises(ValueError):
+            extract_table_rows(LETTER_FRAGMENT, table_class="table1")
+        with patch("finops.utils.html_table.lxml", None):
+            with self.assertRaises(ValueError):
+                extract_table_rows(LETTER_FRAGMENT, table_class="table1")
+
+    def test_rows_to_frame(self):
+        rows = [["a", "b", "c"], [], ["d"]]
+        pd.testing.assert_frame_equal(rows_to_frame(rows), pd.DataFrame(rows))
+        pd.testing.assert_frame_equal(rows_to_frame([[], []]), pd.DataFrame([[], []]))
+        self.assertListEqual(
+            rows_to_frame(rows, columns=["x", "y", "z"]).columns.tolist(),
+            ["x", "y", "z"],
+        )
+
+    def test_preprocess_tickers_page(self):
+        rows = extract_table_rows(TICKERS_PAGE, table_class="table1", links=True)
+        tickers = Preprocessor()._preprocess_tickers_page(rows)
+        self.assertListEqual(tickers.name.tolist(), ["فولاد", "ح.توسعه"])
+        self.assertListEqual(
+            tickers.full_name.tolist(), ["فولاد مباركه ", "ح . توسعه "]
+        )
+        self.assertListEqual(
+            tickers.ticker_index.tolist(), ["35425587644337450", "2400322364771558"]
+        )
+        self.assertListEqual(tickers.section.tolist(), ["فلزات اساسي", "محصولات"])
+        self.assertListEqual(tickers.type.tolist(), ["stock", "undefined"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import re
+import random
+import unittest
+import pandas as pd
+from finops.config import NORMALIZER_CACHE_MAX_LENGTH
+from finops.utils.normalizer import (
+    normalize_codal_text,
+    normalize_codal_texts,
+    normalize_persian_text,
+    normalize_series,
+    normalize_ticker_name,
+    normalize_title_key,
+)
+
+
+def persian_text_reference(text):
+    if text is None:
+        return None
+    text = text.replace("ي", "ی")
+    text = text.replace("ك", "ک")
+    text = text.replace("أ", "ا")
+    for digit, replacement in zip("۰۱۲۳۴۵۶۷۸۹", "0123456789"):
+        text = text.replace(digit, replacement)
+    return text
+
+
+def codal_text_reference(text):
+    text = persian_text_reference(text)
+    if text is None:
+        return None
+    text = text.replace(",", "")
+    text = text.replace("--", "")
+    text = re.sub("\u200c+", "\u200c", text)
+    text = re.sub("[\n\t\r]", "", text)
+    text = re.sub(r"\((\d+)\)", r"-\1", text)
+    text = re.sub(" +", " ", text)
+    text = text.strip()
+    if text == "":
+        return None
+    return text
+
+
+class TestNormalizer(unittest.TestCase):
+    def setUp(self):
+        alphabet = ["a", "ي", "ك", "أ", "ی", "۵", "٣", "1", ",", "-", "(", ")", " "]
+        alphabet += ["\u200c", "\n", "\t", "\r"]
+        rng = random.Random(0)
+        self.texts = [
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 10)))
+            for _ in range(5000)
+        ]
+
+    def test_persian_text(self):
+        self.assertEqual(normalize_persian_text("علي ۱۴۰۲"), "علی 1402")
+        self.assertIsNone(normalize_persian_text(None))
+        for text in self.texts:
+            self.assertEqual(normalize_persian_text(text), persian_text_reference(text))
+
+    def test_ticker_name(self):
+        self.assertEqual(normalize_ticker_name("مي\u200cدكو"), "میدکو")
+
+    def test_codal_text(self):
+        for text in self.texts + [None]:
+            self.assertEqual(normalize_codal_text(text), codal_text_reference(text))
+        self.assertListEqual(
+            normalize_codal_texts(self.texts + [None, float("nan")]),
+            [codal_text_reference(text) for text in self.texts] + [None, None],
+        )
+
+    def test_title_key(self):
+        self.assertEqual(
+            normalize_title_key("جمع  دارایي‌ هاي غير-جاري"),
+            normalize_title_key("جمع دارایی‌های غیرجاری"),
+        )
+        self.assertEqual(normalize_title_key("تآثیر ـ نرخ\xa0ارز"), "تاثیرنرخارز")
+        self.assertNotEqual(
+            normalize_title_key("سود (زیان) خالص"), normalize_title_key("سود خالص")
+        )
+
+    def test_cache(self):
+        normalize_persian_text.cache_clear()
+        normalize_persian_text("علي")
+        normalize_persian_text("علي")
+        normalize_persian_text("ي" * (NORMALIZER_CACHE_MAX_LENGTH + 1))
+        info = normalize_persian_text.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 1, 1))
+
+    def test_series(self):
+        series = pd.Series(["علي", None, "علي", "۱"], index=[3, 2, 1, 0], name="name")
+        result = normalize_series(series)
+        self.assertListEqual(result.tolist(), ["علی", None, "علی", "1"])
+        self.assertListEqual(result.index.tolist(), [3, 2, 1, 0])
+        self.assertEqual(result.name, "name")
+        self.assertTrue(normalize_series(pd.Series([], dtype=object)).empty)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+import random
+import datetime
+import unittest
+import numpy as np
+import pandas as pd
+from finops.config import (
+    PNL_SHEET_COLUMNS,
+    SHAREHOLDER_DATA_DTYPES,
+    CODAL_LETTERS_LIST_COLUMNS,
+)
+from finops.utils.preprocessor import Preprocessor
+
+
+class TestPreprocessor(unittest.TestCase):
+    def test_apply_dtypes(self):
+        df = pd.DataFrame(
+            {
+                "shareholder_id": [1, 2],
+                "shareholder_name": ["holder", "holder"],
+                "n_shares": [1000.0, 2000.0],
+                "per_shares": [10.5, 15.25],
+                "ticker_index": ["1", "1"],
+                "other": ["a", "b"],
+            }
+        )
+        result = Preprocessor._apply_dtypes(df, SHAREHOLDER_DATA_DTYPES)
+        self.assertEqual(result["shareholder_id"].dtype, "int32")
+        self.assertEqual(result["shareholder_name"].dtype, "category")
+        self.assertEqual(result["n_shares"].dtype, "int64")
+        self.assertEqual(result["per_shares"].dtype, "float32")
+        self.assertEqual(result["ticker_index"].dtype, "category")
+        self.assertIs(result["other"].dtype, df["other"].dtype)
+        self.assertEqual(df["shareholder_id"].dtype, "int64")
+
+    def test_apply_dtypes_coerces_numbers(self):
+        df = pd.DataFrame({"value": ["-12", "3.5", None], "count": ["1", None, "x"]})
+        result = Preprocessor._apply_dtypes(df, {"value": "float64", "count": "int32"})
+        self.assertListEqual(result["value"].tolist()[:2], [-12.0, 3.5])
+        self.assertTrue(pd.isna(result["value"].iloc[2]))
+        self.assertEqual(result["count"].dtype, "Int32")
+        self.assertEqual(result["count"].iloc[0], 1)
+
+    def test_apply_dtypes_accepts_numpy_dtypes(self):
+        df = pd.DataFrame({"count": [1.0, None], "size": [1.0, None], "id": [1, 2]})
+        result = Preprocessor._apply_dtypes(
+            df,
+            {"count": np.dtype("int16"), "size": np.uint32, "id": np.dtype("int32")},
+        )
+        self.assertEqual(result["count"].dtype, "Int16")
+        self.assertEqual(result["size"].dtype, "UInt32")
+        self.assertEqual(result["id"].dtype, "int32")
+
+    def test_preprocess_codal_texts_matches_scalar(self):
+        preprocessor = Preprocessor()
+        alphabet = [
+            "a",
+            "ي",
+            "ك",
+            "۵",
+            "٣",
+            "1",
+            ",",
+            "-",
+            "(",
+            ")",
+            " ",
+            "\u200c",
+            "\n",
+            "\t",
+            "\r",
+        ]
+        rng = random.Random(0)
+        values = [
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 8)))
+            for _ in range(5000)
+        ] + [None, "(1,234)", "--", " (12) "]
+        self.assertListEqual(
+            preprocessor._preprocess_codal_texts(values),
+            [preprocessor._preprocess_codal_text(value) for value in values],
+        )
+        values.append("a\x00(1)")
+        self.assertListEqual(
+            preprocessor._preprocess_codal_texts(values),
+            [preprocessor._preprocess_codal_text(value) for value in values],
+        )
+
+    def test_preprocess_pnl_df(self):
+        df = pd.DataFrame([["سود (زیان) خالص", "(1,234)"], ["سرمایه", "۵۰۰"]])
+        result = Preprocessor()._preprocess_pnl_df(df)
+        self.assertListEqual(result.columns.tolist(), PNL_SHEET_COLUMNS)
+        for column in PNL_SHEET_COLUMNS[:-1]:
+            self.assertEqual(result[column].dtype, "float64")
+        self.assertEqual(result["net_profit"].iloc[0], -1234.0)
+        self.assertEqual(result["capital"].iloc[0], 500.0)
+        self.assertTrue(result["gross_profit"].isna().all())
+
+    def test_preprocess_letters_list(self):
+        titles = [
+            "صورت‌های مالی سال مالی منتهی به 1401/12/29 (حسابرسی شده)",
+            "اطلاعات و صورت‌های مالی میاندوره‌ای دوره ۶ ماهه منتهی به 1402/06/31 (تلفیقی)",
+            "اصلاحیه صورت‌های مالی میاندوره ای 3 ماهه منتهی به 1402/03/31",
+            "گزارش فعالیت ماهانه",
+        ]
+        parsed_response = {
+            "Letters": [
+                {
+                    "TracingNo": 1000 + i,
+                    "Symbol": "فولاد",
+                    "Title": title,
+                    "Url": f"/Reports/Decision.aspx?LetterSerial={i}",
+                    "PublishDateTime": "1402/07/01 10:00:00",
+                }
+                for i, title in enumerate(titles)
+            ]
+        }
+        result = Preprocessor()._preprocess_letters_list(parsed_response)
+        self.assertListEqual(result.columns.tolist(), CODAL_LETTERS_LIST_COLUMNS)
+        self.assertEqual(result["tracing_id"].dtype, "int64")
+        self.assertEqual(result["period_length"].dtype, "Int16")
+        self.assertListEqual(result["is_audited"].tolist(), [True, False, False, False])
+        self.assertListEqual(
+            result["is_correction"].tolist(), [False, False, True, False]
+        )
+        self.assertListEqual(
+            result["is_consolidated"].tolist(), [False, True, False, False]
+        )
+        self.assertListEqual(
+            result["period_type"].tolist()[:3], ["annual", "interim", "interim"]
+        )
+        self.assertTrue(pd.isna(result["period_type"].iloc[3]))
+        self.assertListEqual(result["period_length"].tolist()[1:3], [6, 3])
+        self.assertTrue(pd.isna(result["period_length"].iloc[0]))
+        self.assertListEqual(
+            result["period_end_date"].tolist(),
+            [
+                datetime.date(2023, 3, 20),
+                datetime.date(2023, 9, 22),
+                datetime.date(2023, 6, 21),
+                None,
+            ],
+        )
+        self.assertEqual(
+            result["url"].iloc[0],
+            "https://www.codal.ir/Reports/Decision.aspx?LetterSerial=0",
+        )
+        empty = Preprocessor()._preprocess_letters_list({"Letters": []})
+        self.assertListEqual(empty.columns.tolist(), CODAL_LETTERS_LIST_COLUMNS)
+        self.assertTrue(empty.empty)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from finops.utils.rate_limiter import TokenBucket, RateLimiter
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_is_not_throttled(self):
+        bucket = TokenBucket(rate=1, burst=5)
+        start = time.monotonic()
+        for _ in range(5):
+            bucket.acquire()
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    def test_rate_is_shared_between_threads(self):
+        bucket = TokenBucket(rate=50, burst=1)
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda _: bucket.acquire(), range(11)))
+        self.assertGreaterEqual(time.monotonic() - start, 0.19)
+
+    def test_invalid_rate(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_unconfigured_host_is_not_throttled(self):
+        limiter = RateLimiter({"cdn.tsetmc.com": (1, 1)})
+        start = time.monotonic()
+        for _ in range(5):
+            limiter.acquire("http://old.tsetmc.com/Loader.aspx")
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    def test_configured_host_is_throttled(self):
+        limiter = RateLimiter({"cdn.tsetmc.com": (20, 1)})
+        start = time.monotonic()
+        for _ in range(3):
+            limiter.acquire("http://cdn.tsetmc.com/api/Shareholder/1/20230522")
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
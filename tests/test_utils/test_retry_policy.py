@@ -0,0 +1,120 @@
+import unittest
+from unittest.mock import Mock, patch
+import requests
+from finops.utils.retry_policy import RetryPolicy, CircuitBreaker, parse_retry_after
+from finops.utils.wrappers import retry
+
+
+def http_error(status_code, headers=None):
+    response = Mock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    return requests.HTTPError(response=response)
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def setUp(self):
+        self.policy = RetryPolicy(max_retries=2, backoff_base=0, jitter=False)
+
+    def test_get_wait_time_exponential(self):
+        policy = RetryPolicy(backoff_base=1, backoff_factor=2, max_wait=5, jitter=False)
+        self.assertListEqual(
+            [policy.get_wait_time(attempt) for attempt in range(4)], [1, 2, 4, 5]
+        )
+
+    def test_get_wait_time_jitter(self):
+        policy = RetryPolicy(backoff_base=1, backoff_factor=2, jitter=True)
+        for _ in range(20):
+            self.assertTrue(0 <= policy.get_wait_time(2) <= 4)
+
+    def test_get_wait_time_retry_after(self):
+        policy = RetryPolicy(max_wait=10)
+        self.assertEqual(policy.get_wait_time(0, retry_after=7), 7)
+        self.assertEqual(policy.get_wait_time(0, retry_after=70), 10)
+
+    def test_call_retries_then_succeeds(self):
+        func = Mock(side_effect=[requests.ConnectionError(), "ok"])
+        self.assertEqual(self.policy.call(func), "ok")
+        self.assertEqual(func.call_count, 2)
+
+    def test_call_raises_after_exhaustion(self):
+        func = Mock(side_effect=requests.Timeout())
+        with self.assertRaises(requests.Timeout):
+            self.policy.call(func)
+        self.assertEqual(func.call_count, 3)
+
+    def test_call_does_not_retry_client_errors(self):
+        func = Mock(side_effect=http_error(404))
+        with self.assertRaises(requests.HTTPError):
+            self.policy.call(func)
+        self.assertEqual(func.call_count, 1)
+
+    @patch("finops.utils.retry_policy.time.sleep")
+    def test_call_honors_retry_after(self, mock_sleep):
+        policy = RetryPolicy(max_retries=1, jitter=False)
+        func = Mock(side_effect=[http_error(429, {"Retry-After": "3"}), "ok"])
+        self.assertEqual(policy.call(func), "ok")
+        mock_sleep.assert_called_once_with(3)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("5"), 5)
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0)
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertIsNone(parse_retry_after(None))
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.breaker = CircuitBreaker(
+            failure_rate=0.5, window_size=4, min_requests=4, cooldown=60
+        )
+        self.url = "http://cdn.tsetmc.com/api/Shareholder/1/20230522"
+
+    def test_opens_on_failure_rate(self):
+        self.breaker.record_success(self.url)
+        self.breaker.record_success(self.url)
+        self.breaker.record_failure(self.url)
+        self.assertFalse(self.breaker.is_open(self.url))
+        self.breaker.record_failure(self.url)
+        self.assertTrue(self.breaker.is_open("cdn.tsetmc.com"))
+        self.assertFalse(self.breaker.is_open("http://old.tsetmc.com/Loader.aspx"))
+
+    def test_pause(self):
+        self.breaker.pause(self.url, 60)
+        self.assertTrue(self.breaker.is_open(self.url))
+
+
+def failing_func(*side_effect):
+    func = Mock(side_effect=side_effect)
+    func.__name__ = "func"
+    return func
+
+
+class TestRetryWrapper(unittest.TestCase):
+    def test_retry_raises_after_exhaustion(self):
+        func = failing_func(ConnectionError("failed"), ConnectionError("failed"))
+        wrapped = retry(max_retries=2, wait_time=0)(func)
+        with self.assertRaises(ConnectionError):
+            wrapped()
+        self.assertEqual(func.call_count, 2)
+
+    def test_retry_only_on_retry_on(self):
+        func = failing_func(ValueError("failed"))
+        wrapped = retry(max_retries=3, wait_time=0, retry_on=(ConnectionError,))(func)
+        with self.assertRaises(ValueError):
+            wrapped()
+        self.assertEqual(func.call_count, 1)
+        func = failing_func(ConnectionError("failed"), "result")
+        wrapped = retry(max_retries=3, wait_time=0, retry_on=(ConnectionError,))(func)
+        self.assertEqual(wrapped(), "result")
+
+    def test_retry_skips_circuit_breaker(self):
+        func = failing_func(ConnectionError("failed"), ConnectionError("failed"))
+        wrapped = retry(max_retries=2, wait_time=0, key=lambda: "https://codal.ir")(
+            func
+        )
+        with patch.object(
+            CircuitBreaker, "record_failure"
+        ) as record_failure, self.assertRaises(ConnectionError):
+            wrapped()
+        record_failure.assert_not_called()
@@ -0,0 +1,36 @@
+import unittest
+import pandas as pd
+from finops.utils.scrape_state import ScrapeState
+
+
+class TestScrapeState(unittest.TestCase):
+    def setUp(self):
+        self.log = pd.DataFrame(
+            {
+                "id": ["1", "1", "2"],
+                "date": pd.to_datetime(["2022-01-01", "2022-01-02", "2022-01-01"]),
+            }
+        )
+        self.state = ScrapeState.from_log(self.log)
+
+    def test_from_log(self):
+        self.assertSetEqual(
+            self.state.get_scraped_dates("1"),
+            {pd.Timestamp("2022-01-01"), pd.Timestamp("2022-01-02")},
+        )
+        self.assertSetEqual(self.state.get_scraped_dates("3"), set())
+        self.assertEqual(len(self.state), 3)
+
+    def test_add(self):
+        self.assertFalse(self.state.is_scraped("3", pd.Timestamp("2022-01-01")))
+        self.state.add("3", pd.Timestamp("2022-01-01"))
+        self.assertTrue(self.state.is_scraped("3", pd.Timestamp("2022-01-01")))
+        self.assertEqual(len(self.state), 4)
+
+    def test_get_scraped_dates_returns_copy(self):
+        self.state.get_scraped_dates("1").clear()
+        self.assertEqual(len(self.state.get_scraped_dates("1")), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
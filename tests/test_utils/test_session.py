@@ -0,0 +1,35 @@
+import unittest
+from finops.utils.session import SessionPool
+
+
+class TestSessionPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = SessionPool(pool_size=2)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_get_session_same_host(self):
+        first = self.pool.get_session("http://old.tsetmc.com/Loader.aspx?ParTree=151114")
+        second = self.pool.get_session("http://old.tsetmc.com/tsev2/data/Export-txt.aspx")
+        self.assertIs(first, second)
+
+    def test_get_session_different_hosts(self):
+        first = self.pool.get_session("http://old.tsetmc.com/Loader.aspx")
+        second = self.pool.get_session("http://cdn.tsetmc.com/api/Shareholder/1/20230522")
+        self.assertIsNot(first, second)
+
+    def test_ensure_pool_size(self):
+        session = self.pool.get_session("http://cdn.tsetmc.com/api")
+        self.pool.ensure_pool_size(1)
+        self.assertEqual(self.pool.pool_size, 2)
+        self.pool.ensure_pool_size(8)
+        self.assertEqual(self.pool.pool_size, 8)
+        adapter = session.get_adapter("http://cdn.tsetmc.com")
+        self.assertEqual(adapter._pool_maxsize, 8)
+
+    def test_stats_empty(self):
+        self.pool.get_session("http://cdn.tsetmc.com/api")
+        self.assertDictEqual(
+            self.pool.stats(), {"requests": 0, "opened": 0, "reused": 0}
+        )
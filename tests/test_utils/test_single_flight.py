@@ -0,0 +1,74 @@
+import time
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from finops.utils.single_flight import SingleFlight, Memo
+
+
+class TestSingleFlight(unittest.TestCase):
+    def setUp(self):
+        self.single_flight = SingleFlight()
+        self.n_calls = 0
+        self.lock = threading.Lock()
+
+    def slow_call(self, value):
+        with self.lock:
+            self.n_calls += 1
+        time.sleep(0.2)
+        return value
+
+    def test_concurrent_calls_are_coalesced(self):
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            results = list(
+                executor.map(
+                    lambda _: self.single_flight.do("key", self.slow_call, "value"),
+                    range(5),
+                )
+            )
+        self.assertListEqual(results, ["value"] * 5)
+        self.assertEqual(self.n_calls, 1)
+        self.assertEqual(self.single_flight.n_coalesced, 4)
+
+    def test_sequential_calls_are_not_coalesced(self):
+        self.single_flight.do("key", self.slow_call, 1)
+        self.single_flight.do("key", self.slow_call, 2)
+        self.assertEqual(self.n_calls, 2)
+
+    def test_exception_is_shared(self):
+        def fail():
+            time.sleep(0.2)
+            raise ValueError("failed")
+
+        def call(_):
+            try:
+                self.single_flight.do("key", fail)
+            except ValueError as e:
+                return str(e)
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            results = list(executor.map(call, range(3)))
+        self.assertListEqual(results, ["failed"] * 3)
+
+
+class TestMemo(unittest.TestCase):
+    def test_value_is_memoized(self):
+        memo = Memo(ttl=60, maxsize=2)
+        calls = []
+        memo.get("a", calls.append, 1)
+        memo.get("a", calls.append, 2)
+        self.assertListEqual(calls, [1])
+
+    def test_ttl(self):
+        memo = Memo(ttl=0, maxsize=2)
+        calls = []
+        memo.get("a", calls.append, 1)
+        memo.get("a", calls.append, 2)
+        self.assertListEqual(calls, [1, 2])
+
+    def test_maxsize(self):
+        memo = Memo(ttl=60, maxsize=1)
+        calls = []
+        memo.get("a", calls.append, 1)
+        memo.get("b", calls.append, 2)
+        memo.get("a", calls.append, 3)
+        self.assertListEqual(calls, [1, 2, 3])
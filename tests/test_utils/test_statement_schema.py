@@ -0,0 +1,99 @@
+import unittest
+import numpy as np
+from finops.config import BALANCE_SHEET_COLUMNS, PNL_SHEET_LAYOUTS
+from finops.utils.statement_schema import (
+    EXACT_MATCH,
+    KEY_MATCH,
+    FUZZY_MATCH,
+    StatementSchema,
+    BALANCE_SHEET_SCHEMA,
+    PNL_SHEET_SCHEMA,
+)
+
+
+class TestStatementSchema(unittest.TestCase):
+    def test_match_title(self):
+        self.assertEqual(
+            BALANCE_SHEET_SCHEMA.match_title("جمع دارایی‌های جاری"),
+            ("total_current_assets", EXACT_MATCH),
+        )
+        self.assertEqual(
+            BALANCE_SHEET_SCHEMA.match_title("total_assets"),
+            ("total_assets", EXACT_MATCH),
+        )
+        self.assertEqual(
+            BALANCE_SHEET_SCHEMA.match_title("جمع  دارایي‌ هاي غير جاري"),
+            ("total_noncurrent_assets", KEY_MATCH),
+        )
+        self.assertEqual(
+            PNL_SHEET_SCHEMA.match_title("سود (زیان) خالص هر سهم — ریال"),
+            ("net_earnings_per_share", KEY_MATCH),
+        )
+        self.assertEqual(
+            BALANCE_SHEET_SCHEMA.match_title("جمع بدهی‌هاي و حقوق صاحبان سهم"),
+            ("total_liabilities_and_equity", FUZZY_MATCH),
+        )
+        self.assertEqual(
+            BALANCE_SHEET_SCHEMA.match_title("جمع دارایی‌های ثابت"), (None, FUZZY_MATCH)
+        )
+        self.assertIsNone(BALANCE_SHEET_SCHEMA.match_title("tracing_id")[0])
+
+    def test_fuzzy_match_keeps_negations_apart(self):
+        self.assertEqual(
+            BALANCE_SHEET_SCHEMA.match_title("جمع دارایی‌های جاریی"),
+            ("total_current_assets", FUZZY_MATCH),
+        )
+        self.assertEqual(
+            BALANCE_SHEET_SCHEMA.match_title("جمع دارایی‌های غیرجاریی"),
+            ("total_noncurrent_assets", FUZZY_MATCH),
+        )
+        self.assertEqual(
+            PNL_SHEET_SCHEMA.match_title("سود (زیان) ناخالص‌ص"),
+            ("gross_profit", FUZZY_MATCH),
+        )
+
+    def test_ambiguous_keys_are_dropped(self):
+        schema = StatementSchema(
+            ["a", "b"], {"جمع كل": "a", "جمع کل": "b"}, {"default": ((0, 1),)}
+        )
+        self.assertEqual(schema.match_title("جمع کل"), ("b", EXACT_MATCH))
+        self.assertIsNone(schema.match_title("جمع  کل")[0])
+
+    def test_get_sections(self):
+        title_columns, value_columns = PNL_SHEET_SCHEMA.get_sections(24)
+        self.assertListEqual(title_columns.tolist(), [3])
+        self.assertListEqual(value_columns.tolist(), [4])
+        self.assertIs(
+            PNL_SHEET_SCHEMA.get_sections(24), PNL_SHEET_SCHEMA.get_sections(24)
+        )
+        title_columns, value_columns = BALANCE_SHEET_SCHEMA.get_sections(5)
+        self.assertListEqual(title_columns.tolist(), [0])
+        self.assertListEqual(value_columns.tolist(), [1])
+        self.assertEqual(len(PNL_SHEET_SCHEMA.get_sections(1)[0]), 0)
+        self.assertIn("default", PNL_SHEET_LAYOUTS)
+
+    def test_match_rows(self):
+        values = np.array(
+            [
+                ["جمع داراییها", "100", None, None, "جمع بدهی ها", "40"],
+                ["جمع دارایي ها", "999", None, None, "جمع حقوق مالکانه", "60"],
+                ["جمع دارایی‌های جاری", None, None, None, None, None],
+                ["جمع دارایی های جاری", "30", None, None, None, "1"],
+            ],
+            dtype=object,
+        )
+        row = BALANCE_SHEET_SCHEMA.match_rows(values)
+        self.assertDictEqual(
+            row,
+            {
+                "total_assets": "100",
+                "total_current_assets": "30",
+                "total_liabilities": "40",
+                "total_equity": "60",
+            },
+        )
+        self.assertTrue(set(row) <= set(BALANCE_SHEET_COLUMNS))
+
+
+if __name__ == "__main__":
+    unittest.main()
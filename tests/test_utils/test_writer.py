@@ -0,0 +1,85 @@
+import os
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import Mock
+import pandas as pd
+from finops.utils.writer import BatchWriter
+
+
+class TestBatchWriter(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.data_path = os.path.join(self.directory, "data.csv")
+        self.log_path = os.path.join(self.directory, "log.csv")
+        pd.DataFrame(columns=["id", "value"]).to_csv(self.data_path, index=False)
+        pd.DataFrame(columns=["id", "date"]).to_csv(self.log_path, index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_concurrent_writes_are_batched(self):
+        with BatchWriter(max_batch_rows=100, flush_interval=60) as writer:
+
+            def produce(i):
+                for j in range(10):
+                    writer.write(
+                        pd.DataFrame({"id": [i], "value": [j]}),
+                        self.data_path,
+                        "data",
+                        log_path=self.log_path,
+                        id=i,
+                        date=j,
+                    )
+
+            threads = [threading.Thread(target=produce, args=(i,)) for i in range(10)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        data = pd.read_csv(self.data_path)
+        log = pd.read_csv(self.log_path)
+        self.assertEqual(len(data), 100)
+        self.assertEqual(len(log), 100)
+        self.assertEqual(len(data.drop_duplicates()), 100)
+        self.assertEqual(writer.stats()["batches"], 1)
+
+    def test_flush_interval(self):
+        writer = BatchWriter(flush_interval=0.05)
+        writer.write(pd.DataFrame({"id": [1], "value": [1]}), self.data_path, "data")
+        time.sleep(0.5)
+        self.assertEqual(len(pd.read_csv(self.data_path)), 1)
+        writer.close()
+
+    def test_flush(self):
+        writer = BatchWriter(flush_interval=60)
+        writer.write(pd.DataFrame({"id": [1], "value": [1]}), self.data_path, "data")
+        writer.flush()
+        self.assertEqual(len(pd.read_csv(self.data_path)), 1)
+        writer.close()
+
+    def test_store_target(self):
+        store = Mock()
+        with BatchWriter() as writer:
+            writer.write(pd.DataFrame({"id": [1]}), store, "data")
+            writer.write(pd.DataFrame({"id": [2]}), store, "data")
+        store.append.assert_called_once()
+        dataset, data = store.append.call_args[0]
+        self.assertEqual(dataset, "data")
+        self.assertListEqual(data.id.tolist(), [1, 2])
+
+    def test_failed_batch_is_not_logged(self):
+        store = Mock()
+        store.append.side_effect = OSError("disk full")
+        with BatchWriter() as writer:
+            writer.write(
+                pd.DataFrame({"id": [1]}), store, "data", log_path=self.log_path, id=1, date=1
+            )
+        self.assertTrue(pd.read_csv(self.log_path).empty)
+        self.assertEqual(writer.stats()["failed_batches"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()